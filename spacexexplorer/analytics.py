@@ -0,0 +1,86 @@
+"""
+Derived launch analytics: cadence, turnaround, booster reuse and landings.
+"""
+from collections import deque
+from typing import Iterable
+
+from spacexexplorer.columnar import SECONDS_PER_DAY, parse_timestamp
+
+ROLLING_WINDOW = 20
+
+
+def interval_stats(intervals: list) -> dict:
+    """
+    Returns the mean and shortest interval in days
+    """
+    if not intervals:
+        return {"mean_days": None, "min_days": None}
+    return {"mean_days": sum(intervals) / len(intervals) / SECONDS_PER_DAY,
+            "min_days": min(intervals) / SECONDS_PER_DAY}
+
+
+def launch_analytics(launches: Iterable[dict], window: int = ROLLING_WINDOW) -> dict:
+    """
+    Computes every derived statistic from one pass over the launches.
+    Only launches that took place are considered, intervals are measured
+    between consecutive launches in chronological order.
+    """
+    events = []
+    for launch in launches:
+        if launch.get("upcoming") or not launch.get("date_utc"):
+            continue
+        cores = tuple((core.get("core"), core.get("landpad"),
+                       core.get("landing_attempt"), core.get("landing_success"))
+                      for core in launch.get("cores") or ())
+        events.append((parse_timestamp(launch), launch.get("rocket"),
+                       launch.get("launchpad"), int(launch["date_utc"][:4]),
+                       launch.get("success"), cores))
+    events.sort(key=lambda event: event[0])
+
+    pad_last: dict = {}
+    pad_intervals: dict = {}
+    cadence: dict = {}
+    core_last: dict = {}
+    core_flights: dict = {}
+    core_intervals: list = []
+    landings: dict = {}
+    outcomes: deque = deque(maxlen=window)
+    rolling = []
+    for timestamp, rocket, launchpad, year, success, cores in events:
+        intervals = pad_intervals.setdefault(launchpad, [])
+        if launchpad in pad_last:
+            intervals.append(timestamp - pad_last[launchpad])
+        pad_last[launchpad] = timestamp
+        years = cadence.setdefault(rocket, {})
+        years[year] = years.get(year, 0) + 1
+        for core, landpad, attempt, landed in cores:
+            if core is not None:
+                core_flights[core] = core_flights.get(core, 0) + 1
+                if core in core_last:
+                    core_intervals.append(timestamp - core_last[core])
+                core_last[core] = timestamp
+            if attempt and landed is not None:
+                counts = landings.setdefault(landpad, [0, 0])
+                counts[0] += 1
+                counts[1] += 1 if landed else 0
+        if success is not None:
+            outcomes.append(1 if success else 0)
+            rolling.append((timestamp, sum(outcomes) / len(outcomes) * 100))
+
+    turnaround = {}
+    for launchpad, intervals in pad_intervals.items():
+        turnaround[launchpad] = dict(interval_stats(intervals), launches=len(intervals) + 1)
+    reuse = dict(interval_stats(core_intervals),
+                 cores=len(core_flights),
+                 reused_cores=sum(1 for flights in core_flights.values() if flights > 1),
+                 max_flights=max(core_flights.values(), default=0),
+                 flights=core_flights)
+    landpads = {landpad: {"attempts": attempts, "successes": successes,
+                          "success_rate": successes / attempts * 100}
+                for landpad, (attempts, successes) in landings.items()}
+    return {"pad_turnaround": turnaround,
+            "rocket_cadence": cadence,
+            "core_reuse": reuse,
+            "landpad_landings": landpads,
+            "rolling_window": window,
+            "rolling_success": rolling}
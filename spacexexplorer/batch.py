@@ -0,0 +1,131 @@
+"""
+Non-interactive commands writing query results to a stream.
+"""
+import csv
+import json
+from typing import Any, Iterable, Optional, TextIO
+
+from spacexexplorer.info_manager import InfoManager
+
+OUTPUT_FORMATS = ("jsonl", "csv")
+LAUNCH_FIELDS = ["flight_number", "name", "date_utc", "rocket", "launchpad",
+                 "success", "upcoming", "id"]
+INFO_FIELDS = ["id", "name", "total_launches", "successful_launches", "success_rate"]
+STATS_FIELDS = ["period", "value", "launches"]
+CHANGE_FIELDS = ["seq", "at", "kind", "event", "id", "name"]
+
+
+def write_records(records: Iterable[dict], fields: list, fmt: str, out: TextIO) -> int:
+    """
+    Writes records one per line as JSON Lines or CSV with `fields` as
+    header, returns the number of records written
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+        return count
+    for record in records:
+        out.write(json.dumps(record, separators=(',', ':')) + '\n')
+        count += 1
+    return count
+
+
+def resolve(info: dict, value: Optional[str]) -> Optional[str]:
+    """
+    Returns the id of a rocket or launchpad given by id or by name
+    """
+    if value is None or value in info:
+        return value
+    for item_id, item in info.items():
+        if (item["name"] or "").lower() == value.lower():
+            return item_id
+    raise SystemExit(f"Unknown rocket or launchpad: {value}")
+
+
+def launch_filters(args: Any, info_manager: InfoManager) -> dict:
+    """
+    Returns the filter_launches arguments of the launches command
+    """
+    filters: dict = {}
+    rocket = resolve(info_manager.rocket_info, args.rocket)
+    if rocket is not None:
+        filters["rocket"] = rocket
+    launchpad = resolve(info_manager.launchpad_info, args.launchpad)
+    if launchpad is not None:
+        filters["launchpad"] = launchpad
+    if args.success is not None:
+        filters["success"] = args.success
+    if args.upcoming:
+        filters["upcoming"] = True
+    if args.year is not None:
+        filters["year"] = args.year
+    for key in ("since", "until", "sort_by", "limit", "text"):
+        if getattr(args, key, None) is not None:
+            filters[key] = getattr(args, key)
+    if args.reverse:
+        filters["reverse"] = True
+    if args.offset:
+        filters["offset"] = args.offset
+    return filters
+
+
+def info_records(info: dict) -> Iterable[dict]:
+    for item_id, item in info.items():
+        total = item["total_launches"]
+        rate = item["successful_launches"] / total * 100 if total else None
+        yield dict(item, id=item_id, success_rate=rate)
+
+
+def command_launches(args: Any, info_manager: InfoManager, out: TextIO) -> int:
+    launches = info_manager.iter_launches(**launch_filters(args, info_manager))
+    if args.format == "csv":
+        rockets = info_manager.rocket_info
+        launchpads = info_manager.launchpad_info
+        launches = (dict(launch,
+                         rocket=rockets.get(launch.get("rocket"), {}).get("name"),
+                         launchpad=launchpads.get(launch.get("launchpad"), {}).get("name"))
+                    for launch in launches)
+    return write_records(launches, LAUNCH_FIELDS, args.format, out)
+
+
+def command_stats(args: Any, info_manager: InfoManager, out: TextIO) -> int:
+    records = ({"period": period[:-1], "value": value, "launches": launches}
+               for period in ("years", "months")
+               for value, launches in sorted(info_manager.launch_stats[period].items()))
+    return write_records(records, STATS_FIELDS, args.format, out)
+
+
+def command_rockets(args: Any, info_manager: InfoManager, out: TextIO) -> int:
+    return write_records(info_records(info_manager.rocket_info), INFO_FIELDS, args.format, out)
+
+
+def command_launchpads(args: Any, info_manager: InfoManager, out: TextIO) -> int:
+    return write_records(info_records(info_manager.launchpad_info), INFO_FIELDS, args.format, out)
+
+
+def command_changes(args: Any, info_manager: InfoManager, out: TextIO) -> int:
+    if info_manager.changes is None:
+        raise SystemExit("Changes are only tracked with a cache directory")
+    events, _ = info_manager.changes.read()
+    since = getattr(args, "since", None) or 0
+    return write_records((event for event in events if event["seq"] > since),
+                         CHANGE_FIELDS, args.format, out)
+
+
+COMMANDS = {"launches": command_launches,
+            "stats": command_stats,
+            "rockets": command_rockets,
+            "launchpads": command_launchpads,
+            "changes": command_changes}
+
+
+def run_command(args: Any, info_manager: InfoManager, out: TextIO) -> int:
+    """
+    Runs the batch command named by `args.command`,
+    returns the number of records written
+    """
+    return COMMANDS[args.command](args, info_manager, out)
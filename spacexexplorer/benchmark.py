@@ -0,0 +1,249 @@
+"""
+Benchmarks of the load, filter, statistics and rendering hot paths
+against synthetic datasets, without network access:
+
+    python -m spacexexplorer.benchmark --sizes 200,20000 --output bench.json
+    python -m spacexexplorer.benchmark --baseline bench.json
+
+Results are saved as JSON; with a baseline every operation that got
+slower than the tolerance is reported and the exit code is 1.
+"""
+import io
+import sys
+import json
+import time
+import pathlib
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+import tracemalloc
+from typing import Callable, Optional
+from unittest import mock
+
+from spacexexplorer.columnar import LaunchTable
+from spacexexplorer.fetcher import AsyncFetcher
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.testing import StubSpaceXServer, SyntheticSpaceX, make_dataset
+from spacexexplorer.textui_manager import SequenceView, TextUIManager
+
+DEFAULT_SIZES = (200, 2000, 20000, 200000)
+# the concurrent fetch serializes the whole dataset in the stub server
+MAX_SERVED_SIZE = 200000
+
+
+def measure(function: Callable[[], int], repeat: int = 3) -> dict:
+    """
+    Runs `function` once under tracemalloc for the peak memory and then
+    `repeat` times for the best time; `function` returns the number
+    of processed items
+    """
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    best = None
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {"seconds": best, "items": items,
+            "items_per_second": items / best if best else None,
+            "peak_bytes": peak}
+
+
+def bench_size(size: int, repeat: int = 3) -> dict:
+    """
+    Returns the measurements of every hot path for a dataset of `size` launches
+    """
+    dataset = make_dataset(size)
+    spacex = SyntheticSpaceX(dataset)
+    results = {}
+    with tempfile.TemporaryDirectory() as location:
+
+        def fetch_static() -> int:
+            InfoManager(location=location, spacex=spacex).fetch_static()
+            return size
+        results["fetch_static"] = measure(fetch_static, repeat)
+
+        if size <= MAX_SERVED_SIZE:
+            with StubSpaceXServer.for_dataset(dataset) as server:
+                fetcher = AsyncFetcher(base_url=server.url)
+
+                def fetch_static_concurrent() -> int:
+                    InfoManager(location=location, spacex=spacex,
+                                fetcher=fetcher).fetch_static(concurrent=True)
+                    return size
+                results["fetch_static_concurrent"] = measure(fetch_static_concurrent, repeat)
+
+        def get_cold() -> int:
+            return len(InfoManager(location=location, spacex=spacex).get("launches"))
+        results["get_cold"] = measure(get_cold, repeat)
+
+        info_manager = InfoManager(location=location, spacex=spacex)
+        info_manager.fetch_static()
+        launches = info_manager.get("launches")
+
+        def get_warm() -> int:
+            for _ in range(1000):
+                info_manager.get("launches")
+            return 1000
+        results["get_warm"] = measure(get_warm, repeat)
+
+        rocket = dataset["rockets"][1]["id"]
+        launchpad = dataset["launchpads"][1]["id"]
+        filters = [{}, {"success": True}, {"rocket": rocket},
+                   {"rocket": rocket, "launchpad": launchpad, "success": False},
+                   {"since": "2010", "until": "2011", "limit": 20}]
+
+        def filter_launches() -> int:
+            return sum(len(info_manager.filter_launches(**f)) for f in filters)
+        results["filter_launches"] = measure(filter_launches, repeat)
+
+        def launch_table() -> int:
+            info_manager.launch_table = LaunchTable.from_launches(launches)
+            info_manager.apply_launch_table()
+            return size
+        results["launch_table"] = measure(launch_table, repeat)
+
+        def record_launch() -> int:
+            info_manager.ingest_static("rockets", dataset["rockets"])
+            info_manager.ingest_static("launchpads", dataset["launchpads"])
+            info_manager.launch_stats = {"years": {}, "months": {}}
+            for launch in launches:
+                info_manager.record_launch(launch)
+            return size
+        results["record_launch"] = measure(record_launch, repeat)
+
+        ui_manager = TextUIManager()
+        keystrokes = ["n", "n", "g 0", "0"]
+        output = io.StringIO()
+
+        def ask_user_choice() -> int:
+            answers = iter(keystrokes)
+            output.seek(0)
+            output.truncate()
+            with mock.patch("builtins.input", lambda: next(answers)), \
+                    contextlib.redirect_stdout(output):
+                ui_manager.ask_user_choice(
+                    "Choose:", SequenceView(launches, lambda launch: launch["date_local"][:10]))
+            return len(keystrokes)
+        results["ask_user_choice"] = measure(ask_user_choice, repeat)
+        results["ask_user_choice"]["bytes_per_keystroke"] = len(output.getvalue()) / len(keystrokes)
+    return results
+
+
+def import_times(module: str = "spacexexplorer.cli") -> dict:
+    """
+    Imports `module` in a fresh interpreter with `-X importtime`,
+    returns the cumulative import time in seconds of every module
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                             capture_output=True, text=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def startup(repeat: int = 3) -> dict:
+    """
+    Returns the best import time of the command line interface
+    and the slowest modules imported by it
+    """
+    runs = [import_times() for _ in range(repeat)]
+    best = min(runs, key=lambda times: times["spacexexplorer.cli"])
+    slowest = sorted(best.items(), key=lambda item: -item[1])[:10]
+    return {"seconds": best["spacexexplorer.cli"], "modules": dict(slowest)}
+
+
+def package_version() -> Optional[str]:
+    try:
+        with open(pathlib.Path(__file__).with_name("VERSION")) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def run(sizes=DEFAULT_SIZES, repeat: int = 3) -> dict:
+    """
+    Runs the benchmarks for every size, returns the report
+    """
+    return {"version": package_version(),
+            "python": platform.python_version(),
+            "created": time.time(),
+            "startup": startup(repeat),
+            "results": {str(size): bench_size(size, repeat) for size in sizes}}
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 1.5) -> list:
+    """
+    Returns (size, operation, ratio) for every operation that is slower
+    than `tolerance` times its baseline, size is None for the startup
+    """
+    regressions = []
+    for size, operations in report["results"].items():
+        for name, result in operations.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if not previous or not previous["seconds"]:
+                continue
+            ratio = result["seconds"] / previous["seconds"]
+            if ratio > tolerance:
+                regressions.append((size, name, ratio))
+    previous = baseline.get("startup")
+    if previous and report["startup"]["seconds"] > tolerance * previous["seconds"]:
+        regressions.append((None, "startup", report["startup"]["seconds"] / previous["seconds"]))
+    return regressions
+
+
+def format_report(report: dict) -> str:
+    lines = [f"Import of spacexexplorer.cli: {report['startup']['seconds']:.4f} s"]
+    lines.extend(f"    {name:<40} {seconds:.4f} s"
+                 for name, seconds in report["startup"]["modules"].items())
+    lines.append(f"{'launches':>9} {'operation':<24} {'seconds':>10} {'items/s':>12} {'peak MiB':>9}")
+    for size, operations in report["results"].items():
+        for name, result in operations.items():
+            lines.append(f"{size:>9} {name:<24} {result['seconds']:>10.5f} "
+                         f"{result['items_per_second'] or 0:>12.0f} "
+                         f"{result['peak_bytes'] / 2 ** 20:>9.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:  # pragma: no cover
+    parser = argparse.ArgumentParser(prog="spacexexplorer.benchmark",
+                                     description="Benchmarks of the spacexexplorer hot paths")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated numbers of synthetic launches, up to 1000000")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of timed runs, the best one is kept")
+    parser.add_argument("--output", default="benchmark.json",
+                        help="file the results are saved to")
+    parser.add_argument("--baseline", default=None,
+                        help="results of a previous version to compare with")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+    report = run([int(size) for size in args.sizes.split(",")], args.repeat)
+    print(format_report(report))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent='    ')
+    regressions: Optional[list] = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for size, name, ratio in regressions:
+            where = f" with {size} launches" if size is not None else ""
+            print(f"Regression: {name}{where} is {ratio:.2f}x slower")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
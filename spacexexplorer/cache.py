@@ -0,0 +1,117 @@
+"""
+Persistent on-disk cache of SpaceX API endpoints.
+"""
+import os
+import json
+import time
+import pathlib
+from typing import Any, Optional
+
+from spacexexplorer.storage import data_path, load_data, write_atomic, write_data
+
+# seconds before a cached endpoint has to be revalidated
+DEFAULT_TTLS = {"company": 24 * 3600,
+                "landpads": 24 * 3600,
+                "launchpads": 24 * 3600,
+                "rockets": 24 * 3600,
+                "launches": 3600}
+DEFAULT_TTL = 3600
+
+
+def default_cache_dir() -> pathlib.Path:
+    """
+    Returns the user cache directory for spacexexplorer
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache")
+    return pathlib.Path(base) / "spacexexplorer"
+
+
+class StaticCache(object):
+    """
+    Stores every endpoint as `<name>.json` next to a `<name>.meta.json`
+    file holding fetch time, content hash and HTTP validators
+    """
+
+    def __init__(self, location: str, ttls: Optional[dict] = None,
+                 default_ttl: float = DEFAULT_TTL, formats: Optional[dict] = None):
+        self.location = pathlib.Path(location)
+        # storage format by name, see spacexexplorer.storage
+        self.formats = formats if formats is not None else {}
+        self.location.mkdir(parents=True, exist_ok=True)
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+
+    def data_path(self, name: str) -> pathlib.Path:
+        return data_path(self.location, name, self.formats.get(name, "json"))
+
+    def meta_path(self, name: str) -> pathlib.Path:
+        return self.location / f'{name}.meta.json'
+
+    def metadata(self, name: str) -> Optional[dict]:
+        """
+        Returns the metadata of a cached endpoint, None if not cached
+        """
+        if not self.data_path(name).exists():
+            return None
+        try:
+            with open(self.meta_path(name), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def has(self, name: str) -> bool:
+        return self.metadata(name) is not None
+
+    def is_fresh(self, name: str, now: Optional[float] = None) -> bool:
+        """
+        Returns True if the endpoint is cached and its TTL has not expired
+        """
+        meta = self.metadata(name)
+        if meta is None:
+            return False
+        now = time.time() if now is None else now
+        return now - meta["fetched_at"] < self.ttls.get(name, self.default_ttl)
+
+    def validators(self, name: str) -> dict:
+        """
+        Returns the ETag/Last-Modified values for a conditional request
+        """
+        meta = self.metadata(name) or {}
+        return {"etag": meta.get("etag"),
+                "last_modified": meta.get("last_modified")}
+
+    def load(self, name: str) -> Any:
+        return load_data(self.data_path(name), self.formats.get(name, "json"))
+
+    def store(self, name: str, data: Any, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> str:
+        """
+        Writes endpoint data together with its metadata,
+        returns the SHA-256 of the data file
+        """
+        sha256 = write_data(self.data_path(name), data, self.formats.get(name, "json"))
+        self.record(name, sha256, etag, last_modified)
+        return sha256
+
+    def record(self, name: str, sha256: str, etag: Optional[str] = None,
+               last_modified: Optional[str] = None) -> None:
+        """
+        Writes the metadata of endpoint data stored by other means
+        """
+        self.write_metadata(name, {"fetched_at": time.time(),
+                                   "sha256": sha256,
+                                   "etag": etag,
+                                   "last_modified": last_modified})
+
+    def touch(self, name: str) -> None:
+        """
+        Marks a cached endpoint as revalidated now
+        """
+        meta = self.metadata(name)
+        meta["fetched_at"] = time.time()
+        self.write_metadata(name, meta)
+
+    def write_metadata(self, name: str, meta: dict) -> None:
+        write_atomic(self.meta_path(name), json.dumps(meta, indent='    '))
@@ -0,0 +1,189 @@
+"""
+Change feed of the static data: every fetch is compared with the
+previous version and the added, removed and modified records are
+appended to a log as events, modified ones with the fields that changed.
+
+Records are compared by a hash of each of their fields kept from the
+previous version, so unchanged records cost one hash comparison and the
+previous files are never read back.
+"""
+import json
+import time
+import hashlib
+import pathlib
+from typing import Any, Iterable, Optional
+
+from spacexexplorer.storage import write_atomic
+
+# directory of the change log in the cache, the data files stay alone
+CHANGES_DIR = "changes"
+LOG_NAME = "changes.jsonl"
+STATE_NAME = "changes.state.json"
+SEEN_NAME = "changes.seen.json"
+
+
+def digest(value: Any) -> str:
+    content = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+
+def record_state(record: dict) -> list:
+    """
+    Returns [record hash, name, field hashes] of a record
+    """
+    fields = {field: digest(value) for field, value in record.items()}
+    return [digest(sorted(fields.items())), record.get("name"), fields]
+
+
+def record_delta(record: dict, previous: dict, fields: dict) -> dict:
+    """
+    Returns the new values of the fields whose hash is not in `previous`
+    and the names of the fields the record no longer has
+    """
+    delta: dict = {}
+    changed = {field: record[field] for field, field_hash in fields.items()
+               if previous.get(field) != field_hash}
+    if changed:
+        delta["set"] = changed
+    removed = sorted(field for field in previous if field not in fields)
+    if removed:
+        delta["unset"] = removed
+    return delta
+
+
+class ChangeLog(object):
+    """
+    Append-only log of the changes between versions of the static data,
+    stored in its own `location`
+    """
+
+    def __init__(self, location: str):
+        self.location = pathlib.Path(location)
+        self.log_path = self.location / LOG_NAME
+        self.state_path = self.location / STATE_NAME
+        self.seen_path = self.location / SEEN_NAME
+        # kind -> id -> [record hash, name, field hashes], read on first use
+        self._state: Optional[dict] = None
+
+    @property
+    def state(self) -> dict:
+        if self._state is None:
+            try:
+                with open(self.state_path) as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError):
+                self._state = {"seq": 0, "records": {}}
+        return self._state
+
+    def diff(self, kind: str, records: Iterable[dict], complete: bool = True) -> list:
+        """
+        Returns the events turning the previous version of `kind` into
+        `records` and keeps their hashes as the new version.
+        Without `complete` the records are only the changed part of the
+        data and nothing is removed. The first version of a kind has no
+        events, there is nothing to compare it with.
+        """
+        known = self.state["records"].get(kind)
+        if known is None and not complete:
+            # a part of the data cannot be the first version
+            return []
+        current = {} if known is None or complete else known
+        events = []
+        for record in records:
+            # the company is a single record without an id
+            record_id = record.get("id", kind)
+            new = record_state(record)
+            old = known.get(record_id) if known is not None else None
+            current[record_id] = new
+            if known is None:
+                continue
+            if old is None:
+                events.append({"kind": kind, "event": "added", "id": record_id,
+                               "name": new[1]})
+            elif old[0] != new[0]:
+                event = {"kind": kind, "event": "modified", "id": record_id, "name": new[1]}
+                event.update(record_delta(record, old[2] if len(old) > 2 else {}, new[2]))
+                events.append(event)
+        if known is not None and complete:
+            events.extend({"kind": kind, "event": "removed", "id": record_id, "name": old[1]}
+                          for record_id, old in known.items() if record_id not in current)
+        self.state["records"][kind] = current
+        return events
+
+    def append(self, events: list) -> None:
+        """
+        Numbers the events, appends them to the log and saves
+        the hashes of the current version
+        """
+        state = self.state
+        self.location.mkdir(parents=True, exist_ok=True)
+        if events:
+            now = time.time()
+            lines = []
+            for event in events:
+                state["seq"] += 1
+                lines.append(json.dumps(dict(event, seq=state["seq"], at=now)) + "\n")
+            with open(self.log_path, 'a') as f:
+                f.write("".join(lines))
+        write_atomic(self.state_path, json.dumps(state, separators=(',', ':')))
+
+    def seen(self) -> dict:
+        """
+        Returns the sequence number and log offset of the last event shown
+        """
+        try:
+            with open(self.seen_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"seq": 0, "offset": 0}
+
+    def read(self, offset: int = 0) -> tuple:
+        """
+        Returns the complete events logged from the byte offset on
+        and the offset after them
+        """
+        events = []
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    events.append(json.loads(line))
+                    offset += len(line)
+        except OSError:
+            pass
+        return events, offset
+
+    def unseen(self) -> tuple:
+        """
+        Returns the events logged since they were last marked as seen
+        and the position to pass to mark_seen once they are shown
+        """
+        seen = self.seen()
+        try:
+            size = self.log_path.stat().st_size
+        except OSError:
+            size = 0
+        events: list = []
+        offset = seen["offset"]
+        replaced = size < offset
+        if not replaced:
+            try:
+                events, offset = self.read(offset)
+                replaced = bool(events) and events[0]["seq"] != seen["seq"] + 1
+            except ValueError:
+                replaced = True
+        if replaced:
+            # the log was replaced, it is read again from the start
+            events, offset = self.read()
+            events = [event for event in events if event["seq"] > seen["seq"]]
+        seq = events[-1]["seq"] if events else seen["seq"]
+        return events, {"seq": seq, "offset": offset}
+
+    def mark_seen(self, position: dict) -> None:
+        """
+        Remembers that the events up to a position returned by unseen were shown
+        """
+        self.location.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.seen_path, json.dumps(position))
@@ -1,24 +1,185 @@
 """
 CLI interface for spacexexplorer project.
 """
-import tempfile
+import os
+import sys
+import argparse
+from typing import Optional
 
-from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.batch import COMMANDS, OUTPUT_FORMATS, run_command
+from spacexexplorer.cache import DEFAULT_TTLS, StaticCache, default_cache_dir
+from spacexexplorer.fetcher import AsyncFetcher, FetchError
+from spacexexplorer.info_manager import BACKENDS, InfoManager
 from spacexexplorer.main_manager import MainManager
+from spacexexplorer.profiling import profiler
+from spacexexplorer.refresher import BackgroundRefresher
+from spacexexplorer.storage import FORMATS
 from spacexexplorer.textui_manager import TextUIManager
 
 
-def main():  # pragma: no cover
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parses command line arguments
+    """
+    parser = argparse.ArgumentParser(prog="spacexexplorer",
+                                     description="SpaceX info app")
+    parser.add_argument("--concurrency", type=int, default=5,
+                        help="maximum number of simultaneous API requests")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="timeout in seconds for each API request")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="number of retries for a failed API request")
+    parser.add_argument("--deadline", type=float, default=60.0,
+                        help="seconds after which pending API requests are abandoned "
+                             "and the stored data is used, 0 waits for the retries")
+    parser.add_argument("--cache-dir", default=str(default_cache_dir()),
+                        help="directory where fetched data is kept between runs")
+    parser.add_argument("--max-age", type=float, default=None,
+                        help="seconds before cached data is revalidated")
+    parser.add_argument("--offline", action="store_true",
+                        help="use cached data only, without network access")
+    parser.add_argument("--storage-format", choices=FORMATS, default="jsonl",
+                        help="file format of the stored launches, json is indented for debugging")
+    parser.add_argument("--backend", choices=BACKENDS, default="files",
+                        help="sqlite also keeps the data in an SQLite database that answers "
+                             "the launch queries and computes the statistics")
+    parser.add_argument("--lazy", action="store_true",
+                        help="memory-map the stored launches and decode them on access")
+    parser.add_argument("--refresh-interval", type=float, default=0,
+                        help="seconds between background data refreshes, 0 disables them")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="download all launches again instead of only new ones")
+    parser.add_argument("--profile", action="store_true",
+                        help="print timings of the internal operations on exit")
+    parser.add_argument("--profile-output", default=None,
+                        help="file the timings are written to on exit, "
+                             "in the Prometheus text format for a .prom file, JSON otherwise")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND",
+                                     help="print data and exit instead of starting the menu ("
+                                          + ", ".join(COMMANDS) + ") or serve it over HTTP")
+    launches = commands.add_parser("launches", help="launches matching the filters")
+    launches.add_argument("--rocket", help="rocket id or name")
+    launches.add_argument("--launchpad", help="launchpad id or full name")
+    outcome = launches.add_mutually_exclusive_group()
+    outcome.add_argument("--success", dest="success", action="store_const", const=True,
+                         help="successful launches only")
+    outcome.add_argument("--failed", dest="success", action="store_const", const=False,
+                         help="failed launches only")
+    launches.add_argument("--upcoming", action="store_true", help="upcoming launches only")
+    launches.add_argument("--year", type=int, help="launches of a year")
+    launches.add_argument("--since", help="launches on or after this UTC date")
+    launches.add_argument("--until", help="launches before this UTC date")
+    launches.add_argument("--search", dest="text",
+                          help="launches whose name or details contain these words")
+    launches.add_argument("--sort-by", help="launch field to sort by")
+    launches.add_argument("--reverse", action="store_true", help="reverse the order")
+    launches.add_argument("--limit", type=int, help="maximum number of launches")
+    launches.add_argument("--offset", type=int, default=0, help="number of launches to skip")
+    commands.add_parser("stats", help="number of launches by year and month")
+    commands.add_parser("rockets", help="rockets with their launch success rate")
+    commands.add_parser("launchpads", help="launchpads with their launch success rate")
+    changes = commands.add_parser("changes", help="added, removed and modified records "
+                                                  "of the downloaded data versions")
+    changes.add_argument("--since", type=int, default=0,
+                         help="only the changes numbered after this one")
+    for command in commands.choices.values():
+        command.add_argument("--format", choices=OUTPUT_FORMATS, default="jsonl",
+                             help="output format")
+    export = commands.add_parser("export", help="copy the data and write reports per rocket, "
+                                                "launchpad and period as CSV, JSON and Markdown")
+    export.add_argument("destination", help="directory the data and reports are written to")
+    export.add_argument("--workers", type=int, default=None,
+                        help="number of processes rendering the reports, all cores by default")
+    serve = commands.add_parser("serve", help="answer queries over HTTP as JSON")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    serve.add_argument("--port", type=int, default=8080, help="port to listen on")
+    serve.add_argument("--cache-size", type=int, default=256,
+                       help="number of responses kept in memory")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):  # pragma: no cover
     """
     The main function executes on commands:
     `python -m spacexexplorer` and `$ spacexexplorer `.
 
     This is spacexexplorer entry point.
     """
+    args = parse_args(argv)
+    if args.profile or args.profile_output:
+        profiler.enable()
+    try:
+        run(args)
+    except FetchError as error:
+        sys.exit(str(error))
+    finally:
+        if args.profile:
+            print(profiler.summary())
+        if args.profile_output:
+            profiler.dump(args.profile_output)
+
 
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        info_manager = InfoManager(location=tmpdirname)
-        info_manager.fetch_static()
-        ui_manager = TextUIManager()
-        main = MainManager(info_manager, ui_manager)
-        main.main_loop()
+def start_refresher(args: argparse.Namespace, info_manager: InfoManager, fetch_args: dict,
+                    listener) -> Optional[BackgroundRefresher]:  # pragma: no cover
+    """
+    Refreshes the data in the background if requested,
+    returns the running refresher
+    """
+    if args.refresh_interval > 0 and not args.offline:
+        refresher = BackgroundRefresher(info_manager, args.refresh_interval, **fetch_args)
+        refresher.add_listener(listener)
+        refresher.start()
+        return refresher
+    return None
+
+
+def run(args: argparse.Namespace) -> None:  # pragma: no cover
+    """
+    Fetches the data, then runs a batch command,
+    the HTTP server or the menu
+    """
+    fetcher = AsyncFetcher(concurrency=args.concurrency,
+                           timeout=args.timeout,
+                           retries=args.retries,
+                           deadline=args.deadline or None)
+    ttls = None
+    if args.max_age is not None:
+        ttls = dict.fromkeys(DEFAULT_TTLS, args.max_age)
+    cache = StaticCache(args.cache_dir, ttls=ttls)
+    # batch commands decode the stored launches one at a time
+    info_manager = InfoManager(fetcher=fetcher, cache=cache,
+                               lazy=args.lazy or args.command in COMMANDS,
+                               storage_format=args.storage_format,
+                               backend=args.backend)
+    info_manager.enricher.offline = args.offline
+    fetch_args = dict(concurrent=True, offline=args.offline,
+                      incremental=not args.full_refresh)
+    info_manager.fetch_static(**fetch_args)
+    for filename, error in info_manager.fetch_errors.items():
+        print(f"Could not update {filename}, using the stored copy: {error!r}",
+              file=sys.stderr)
+    if args.command == "serve":
+        # aiohttp.web is only needed by the HTTP service
+        from spacexexplorer.server import QueryServer
+        server = QueryServer(info_manager, cache_size=args.cache_size)
+        start_refresher(args, info_manager, fetch_args, server.on_refresh)
+        server.run(args.host, args.port)
+        return
+    if args.command == "export":
+        result = info_manager.save_static(args.destination, workers=args.workers)
+        if result is not None:
+            print(f"{result['written']} reports written, {result['skipped']} unchanged")
+        return
+    if args.command is not None:
+        try:
+            run_command(args, info_manager, sys.stdout)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # the reader, e.g. `head`, does not want more output
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+        return
+    ui_manager = TextUIManager()
+    main = MainManager(info_manager, ui_manager)
+    main.refresher = start_refresher(args, info_manager, fetch_args, main.on_refresh)
+    main.main_loop()
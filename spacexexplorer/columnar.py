@@ -0,0 +1,210 @@
+"""
+Columnar launch table for statistics and aggregation.
+"""
+import bisect
+import datetime
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Any, Iterable, Optional
+
+SECONDS_PER_DAY = 86400
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def parse_timestamp(launch: dict) -> float:
+    """
+    Returns the launch time in seconds since the epoch
+    """
+    if launch.get("date_unix") is not None:
+        return float(launch["date_unix"])
+    date = launch.get("date_utc")
+    if not date:
+        return 0.0
+    days = datetime.date(int(date[:4]), int(date[5:7]), int(date[8:10])).toordinal() - EPOCH_ORDINAL
+    return float(days * SECONDS_PER_DAY + int(date[11:13]) * 3600
+                 + int(date[14:16]) * 60 + int(date[17:19]))
+
+
+def landing_outcome(launch: dict) -> int:
+    """
+    Returns 1 if every attempted core landing succeeded, 0 if one failed
+    and -1 if no landing was attempted or its outcome is unknown
+    """
+    outcome = -1
+    for core in launch.get("cores") or ():
+        if not core.get("landing_attempt") or core.get("landing_success") is None:
+            continue
+        if not core["landing_success"]:
+            return 0
+        outcome = 1
+    return outcome
+
+
+class CodeColumn(object):
+    """Column of small integer codes standing for arbitrary ids"""
+
+    def __init__(self):
+        self.codes = array('I')
+        self.labels: list = []
+        self.lookup: dict = {}
+
+    def code(self, value: Any) -> int:
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.labels)
+            self.labels.append(value)
+        return code
+
+    def append(self, value: Any) -> None:
+        self.codes.append(self.code(value))
+
+    def decode(self, counts: Counter) -> dict:
+        return {self.labels[code]: count for code, count in counts.items()}
+
+
+class LaunchTable(object):
+    """
+    Launches stored column by column in typed arrays:
+    timestamps, calendar fields, rocket and launchpad codes
+    and success/landing flags
+    """
+
+    group_keys = ("rocket", "launchpad", "year", "month", "weekday")
+
+    def __init__(self):
+        self.timestamps = array('d')
+        self.years = array('H')
+        self.months = array('B')
+        self.weekdays = array('B')
+        self.rockets = CodeColumn()
+        self.launchpads = CodeColumn()
+        # 1 if the launch succeeded, 0 otherwise
+        self.successful = array('B')
+        # 1 if the outcome of the launch is known
+        self.finished = array('B')
+        # see landing_outcome
+        self.landings = array('b')
+
+    @classmethod
+    def from_launches(cls, launches: Iterable[dict]) -> "LaunchTable":
+        table = cls()
+        for launch in launches:
+            table.append(launch)
+        return table
+
+    def row(self, launch: dict) -> tuple:
+        """
+        Returns the column values of a launch
+        """
+        timestamp = parse_timestamp(launch)
+        date = launch.get("date_utc")
+        year = int(date[:4]) if date else 0
+        month = int(date[5:7]) if date else 0
+        return (timestamp, year, month,
+                (int(timestamp // SECONDS_PER_DAY) + 3) % 7,
+                self.rockets.code(launch.get("rocket")),
+                self.launchpads.code(launch.get("launchpad")),
+                1 if launch.get("success") else 0,
+                0 if launch.get("success") is None else 1,
+                landing_outcome(launch))
+
+    def columns(self) -> tuple:
+        return (self.timestamps, self.years, self.months, self.weekdays,
+                self.rockets.codes, self.launchpads.codes,
+                self.successful, self.finished, self.landings)
+
+    def append(self, launch: dict) -> None:
+        """
+        Adds a single launch to every column
+        """
+        for column, value in zip(self.columns(), self.row(launch)):
+            column.append(value)
+
+    def replace(self, position: int, launch: dict) -> None:
+        """
+        Overwrites the launch stored at `position`
+        """
+        for column, value in zip(self.columns(), self.row(launch)):
+            column[position] = value
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def nbytes(self) -> int:
+        """
+        Returns the memory used by the column buffers
+        """
+        return sum(column.itemsize * len(column) for column in self.columns())
+
+    def column(self, key: str) -> array:
+        """
+        Returns the array used to group launches by `key`
+        """
+        columns = {"rocket": self.rockets.codes,
+                   "launchpad": self.launchpads.codes,
+                   "year": self.years,
+                   "month": self.months,
+                   "weekday": self.weekdays}
+        if key not in columns:
+            raise KeyError(f'Cannot group launches by {key}, use one of {self.group_keys}')
+        return columns[key]
+
+    def decode(self, key: str, counts: Counter) -> dict:
+        if key == "rocket":
+            return self.rockets.decode(counts)
+        if key == "launchpad":
+            return self.launchpads.decode(counts)
+        if key in ("year", "month"):
+            counts.pop(0, None)
+        return dict(counts)
+
+    def count_by(self, key: str, mask: Optional[array] = None) -> dict:
+        """
+        Counts launches per value of `key`, only where `mask` is set if given
+        """
+        column = self.column(key)
+        if mask is not None:
+            return self.decode(key, Counter(compress(column, mask)))
+        return self.decode(key, Counter(column))
+
+    def success_by(self, key: str) -> dict:
+        return self.count_by(key, self.successful)
+
+    def group_by(self, key: str) -> dict:
+        """
+        Returns total, successful and finished launches with the success
+        rate in percent per value of `key`
+        """
+        totals = self.count_by(key)
+        successes = self.count_by(key, self.successful)
+        finished = self.count_by(key, self.finished)
+        groups = {}
+        for value, total in totals.items():
+            done = finished.get(value, 0)
+            groups[value] = {"total_launches": total,
+                             "successful_launches": successes.get(value, 0),
+                             "finished_launches": done,
+                             "success_rate": successes.get(value, 0) / done * 100 if done else None}
+        return groups
+
+    def landing_rate(self) -> Optional[float]:
+        """
+        Returns the percentage of successful landings among attempted ones
+        """
+        counts = Counter(self.landings)
+        attempts = counts[0] + counts[1]
+        return counts[1] / attempts * 100 if attempts else None
+
+    def rolling_cadence(self, window_days: float = 30) -> list:
+        """
+        Returns (timestamp, launches in the trailing window) for every launch
+        in chronological order
+        """
+        timestamps = sorted(self.timestamps)
+        window = window_days * SECONDS_PER_DAY
+        cadence = []
+        for position, timestamp in enumerate(timestamps):
+            start = bisect.bisect_left(timestamps, timestamp - window, 0, position)
+            cadence.append((timestamp, position - start + 1))
+        return cadence
@@ -0,0 +1,138 @@
+"""
+In-memory layer over the static JSON files.
+"""
+import os
+import re
+import json
+import mmap
+import pathlib
+from array import array
+from typing import Any, Iterable, Optional, Sequence
+
+from spacexexplorer.profiling import profiler
+from spacexexplorer.storage import data_path, load_data
+
+# top level records of an array written with json.dump(..., indent='    ')
+RECORD_START = re.compile(rb"^    \{$", re.M)
+RECORD_END = re.compile(rb"^    \},?$", re.M)
+LINE_END = re.compile(rb"\n")
+
+
+class LazyJSONList(Sequence):
+    """
+    Read-only view over a memory-mapped indented JSON array of objects
+    or JSON Lines file, each record is decoded only when it is accessed
+    """
+
+    def __init__(self, path: pathlib.Path, fmt: str = "json"):
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                self.buffer = b""
+            else:
+                self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if fmt == "jsonl":
+            self.ends = array('Q', (m.start() for m in LINE_END.finditer(self.buffer)))
+            self.starts = array('Q', [0] if self.ends else [])
+            self.starts.extend(end + 1 for end in self.ends[:-1])
+        else:
+            self.starts = array('Q', (m.start() for m in RECORD_START.finditer(self.buffer)))
+            self.ends = array('Q', (m.start() + 5 for m in RECORD_END.finditer(self.buffer)))
+        if len(self.starts) != len(self.ends):
+            raise ValueError(f'File {path} is not an indented JSON array of objects')
+
+    @classmethod
+    def is_supported(cls, path: pathlib.Path, fmt: str = "json") -> bool:
+        """
+        Returns True if the file layout allows lazy decoding
+        """
+        if fmt == "jsonl":
+            return True
+        with open(path, 'rb') as f:
+            head = f.read(7)
+        return head in (b"[\n    {", b"[]")
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('LazyJSONList index out of range')
+        return json.loads(self.buffer[self.starts[index]:self.ends[index]])
+
+
+class Dataset(object):
+    """
+    Keeps every static file parsed in memory after its first use
+    and counts how often the disk had to be read
+    """
+
+    def __init__(self, location: str, lazy: Iterable[str] = (),
+                 formats: Optional[dict] = None):
+        self.location = pathlib.Path(location)
+        self.lazy = set(lazy)
+        # storage format by name, see spacexexplorer.storage
+        self.formats = formats if formats is not None else {}
+        self.records: dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.version = 0
+
+    def path(self, name: str) -> pathlib.Path:
+        return data_path(self.location, name, self.formats.get(name, "json"))
+
+    def load(self, name: str) -> Any:
+        """
+        Reads a static file from disk
+        """
+        path = self.path(name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f'File {path} not available, please relaunch the program')
+        fmt = self.formats.get(name, "json")
+        if profiler.enabled:
+            profiler.add("bytes_read", os.path.getsize(path))
+        with profiler.timer(f"load.{name}"):
+            if name in self.lazy and LazyJSONList.is_supported(path, fmt):
+                return LazyJSONList(path, fmt)
+            return load_data(path, fmt)
+
+    def get(self, name: str) -> Any:
+        """
+        Returns the parsed static file, reading it only on the first call
+        """
+        if name in self.records:
+            self.hits += 1
+            profiler.add("dataset.hits")
+            return self.records[name]
+        self.misses += 1
+        profiler.add("dataset.misses")
+        self.records[name] = self.load(name)
+        return self.records[name]
+
+    def put(self, name: str, data: Any) -> None:
+        """
+        Replaces the in-memory copy with freshly fetched data
+        """
+        self.version += 1
+        if name in self.lazy:
+            self.records.pop(name, None)
+            return
+        self.records[name] = data
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Drops one or all in-memory copies, next get reads the disk again
+        """
+        self.version += 1
+        if name is None:
+            self.records.clear()
+        else:
+            self.records.pop(name, None)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses,
+                "loaded": sorted(self.records)}
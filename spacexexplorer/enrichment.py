@@ -0,0 +1,138 @@
+"""
+Payloads, cores, crew and ships referenced by launches, fetched in batches.
+
+Launches only hold the ids of these records. The ids of many launches
+are collected and fetched with one `/<kind>/query` request per kind,
+the records are kept in a bounded cache so detail views never refetch.
+"""
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from spacexexplorer.fetcher import AsyncFetcher, FetchError
+from spacexexplorer.lru import LRUCache
+from spacexexplorer.profiling import profiler
+
+BATCH_SIZE = 500
+# seconds before ids that could not be fetched are requested again
+RETRY_AFTER = 60.0
+
+
+def crew_ids(launch: dict) -> Iterable[Any]:
+    # crew used to be a list of ids, it is now a list of {"crew", "role"}
+    for member in launch.get("crew") or ():
+        yield member.get("crew") if isinstance(member, dict) else member
+
+
+RELATIONS: Dict[str, Callable[[dict], Iterable[Any]]] = {
+    "payloads": lambda launch: launch.get("payloads") or (),
+    "cores": lambda launch: (core.get("core") for core in launch.get("cores") or ()),
+    "crew": crew_ids,
+    "ships": lambda launch: launch.get("ships") or (),
+}
+
+
+def referenced_ids(launches: Iterable[dict], limit: Optional[int] = None,
+                   skip: Callable[[str, Any], bool] = lambda kind, entity_id: False) -> dict:
+    """
+    Returns the distinct ids referenced by the launches by kind, in order
+    of first reference. Ids for which `skip` is true are left out and
+    at most `limit` ids are returned in total.
+    """
+    ids: dict = {kind: {} for kind in RELATIONS}
+    total = 0
+    for launch in launches:
+        for kind, references in RELATIONS.items():
+            for entity_id in references(launch):
+                if entity_id is None or entity_id in ids[kind] or skip(kind, entity_id):
+                    continue
+                if limit is not None and total >= limit:
+                    return {kind: list(found) for kind, found in ids.items()}
+                ids[kind][entity_id] = None
+                total += 1
+    return {kind: list(found) for kind, found in ids.items()}
+
+
+class EntityCache(LRUCache):
+    """
+    Least recently used records by (kind, id). Ids the API does not
+    know are kept as None so that they are not requested again.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        super().__init__(maxsize)
+
+
+class Enricher(object):
+    """
+    Joins launches with the records they refer to by id.
+    With `offline` only the records already cached are returned.
+    Ids whose batch failed are not requested again for `retry_after`
+    seconds, so detail views do not wait for a failing upstream each time.
+    """
+
+    def __init__(self, fetcher: AsyncFetcher, maxsize: int = 4096,
+                 batch_size: int = BATCH_SIZE, offline: bool = False,
+                 retry_after: float = RETRY_AFTER,
+                 clock: Callable[[], float] = time.monotonic):
+        self.fetcher = fetcher
+        self.cache = EntityCache(maxsize)
+        self.batch_size = batch_size
+        self.offline = offline
+        self.retry_after = retry_after
+        self.clock = clock
+        # (kind, id) -> time its batch failed
+        self.failed: dict = {}
+
+    def prefetch(self, launches: Iterable[dict]) -> int:
+        """
+        Fetches the records referenced by the launches that are not cached
+        yet, with one query per kind and `batch_size` ids. No more records
+        than the cache holds are fetched, the first launches come first.
+        Returns the number of ids requested.
+        """
+        if self.offline:
+            return 0
+        now = self.clock()
+        self.failed = {key: failed_at for key, failed_at in self.failed.items()
+                       if now - failed_at < self.retry_after}
+        missing = referenced_ids(launches, limit=self.cache.maxsize,
+                                 skip=lambda kind, entity_id: (kind, entity_id) in self.cache
+                                 or (kind, entity_id) in self.failed)
+        queries = {}
+        for kind, ids in missing.items():
+            for start in range(0, len(ids), self.batch_size):
+                batch = ids[start:start + self.batch_size]
+                queries[(kind, start)] = (f"/{kind}/query",
+                                          {"query": {"_id": {"$in": batch}},
+                                           "options": {"pagination": False}})
+        if not queries:
+            return 0
+        with profiler.timer("enrich.prefetch"):
+            results = self.fetcher.query_many(queries)
+        requested = 0
+        errors = []
+        for (kind, start), documents in results.items():
+            batch = missing[kind][start:start + self.batch_size]
+            if isinstance(documents, Exception):
+                errors.append(documents)
+                self.failed.update(((kind, entity_id), now) for entity_id in batch)
+                continue
+            found = {document.get("id"): document for document in documents}
+            for entity_id in batch:
+                self.cache.put((kind, entity_id), found.get(entity_id))
+            requested += len(batch)
+        profiler.add("enrich.requested", requested)
+        if errors:
+            raise FetchError(f"Could not fetch launch details: {errors[0]!r}") from errors[0]
+        return requested
+
+    def related(self, launch: dict) -> dict:
+        """
+        Returns the cached records referenced by a launch by kind,
+        ids that were not fetched are left out
+        """
+        related: dict = {}
+        for kind, references in RELATIONS.items():
+            records = [self.cache.get((kind, entity_id)) for entity_id in references(launch)]
+            related[kind] = [record for record in records if record is not None]
+        return related
@@ -0,0 +1,320 @@
+"""
+Concurrent fetching of SpaceX API endpoints.
+
+asyncio and aiohttp are imported on the first request only, so that
+runs served from the cache do not pay for loading the network stack.
+"""
+import json
+import time
+import random
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional
+
+from spacexexplorer.profiling import profiler
+from spacexexplorer.storage import JSONArrayStream
+
+API_URL = "https://api.spacexdata.com/v4"
+CHUNK_SIZE = 64 * 1024
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+    import aiohttp
+
+
+class FetchError(Exception):
+    """Raised when SpaceX data can neither be fetched nor read from the cache"""
+
+
+class CircuitOpenError(FetchError):
+    """Raised instead of sending a request while the upstream is failing"""
+
+
+def connection_errors() -> tuple:
+    """
+    Returns the exceptions raised when the API cannot be reached or fails.
+    Meant for `except connection_errors():`, which is only evaluated
+    once an exception is raised.
+    """
+    import asyncio
+    import aiohttp
+    return (aiohttp.ClientError, asyncio.TimeoutError, FetchError)
+
+
+class CircuitBreaker(object):
+    """
+    Opens after `failure_threshold` consecutive failures so that no request
+    is sent for `reset_timeout` seconds, then lets a single trial request
+    through and closes again if it succeeds
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        """
+        Returns True if a request may be sent now
+        """
+        state = self.state
+        if state == "half-open":
+            # one trial request, the next ones wait for its outcome
+            self.opened_at = self.clock()
+            return True
+        return state == "closed"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+
+
+class FetchResult(object):
+    """Response of a single endpoint with its cache validators,
+    or the error that prevented it"""
+
+    def __init__(self, data: Any = None, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None,
+                 not_modified: bool = False, error: Optional[BaseException] = None):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.not_modified = not_modified
+        self.error = error
+
+
+class AsyncFetcher(object):
+    """
+    Fetches several SpaceX API endpoints at once over a shared
+    connection pool, with per-endpoint timeouts, retries with jittered
+    exponential backoff and a circuit breaker shared by all requests.
+    With a `deadline` fetch_all and every query return after at most that
+    many seconds, requests still pending then fail with a timeout.
+    """
+
+    def __init__(self, base_url: str = API_URL, concurrency: int = 5,
+                 timeout: float = 30.0, timeouts: Optional[dict] = None,
+                 retries: int = 2, retry_delay: float = 0.5, jitter: float = 0.5,
+                 deadline: Optional[float] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.retries = retries
+        self.retry_delay = retry_delay
+        # fraction of the backoff delay that is randomized
+        self.jitter = jitter
+        self.deadline = deadline
+        self.breaker = breaker or CircuitBreaker()
+
+    def timeout_for(self, name: str) -> float:
+        """
+        Returns the timeout in seconds for the given endpoint
+        """
+        return self.timeouts.get(name, self.timeout)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns the delay in seconds before retry number `attempt`
+        """
+        delay = self.retry_delay * 2 ** (attempt - 1)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def with_retries(self, request: Callable[[], Awaitable]) -> Any:
+        """
+        Awaits `request()`, retrying on connection errors,
+        timeouts and server-side failures while the circuit is closed
+        """
+        import asyncio
+        import aiohttp
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"{self.base_url} is failing, "
+                                       f"not retried for {self.breaker.reset_timeout} s")
+            try:
+                result = await request()
+                self.breaker.record_success()
+                return result
+            except aiohttp.ClientResponseError as error:
+                if error.status < 500:
+                    raise
+                self.breaker.record_failure()
+                if attempt >= self.retries:
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.breaker.record_failure()
+                if attempt >= self.retries:
+                    raise
+            attempt += 1
+            await asyncio.sleep(self.backoff(attempt))
+
+    async def fetch_endpoint(self, session: "aiohttp.ClientSession",
+                             semaphore: "asyncio.Semaphore",
+                             name: str, endpoint: str,
+                             validators: Optional[dict] = None,
+                             sink: Any = None) -> FetchResult:
+        """
+        Requests a single endpoint with retries.
+        Known `etag`/`last_modified` validators make the request conditional.
+        With a `sink` the response must be a JSON array, its items are passed
+        to `sink.add` while the body is downloaded instead of being returned;
+        `sink.reset` is called before every attempt.
+        """
+        import aiohttp
+        timeout = aiohttp.ClientTimeout(total=self.timeout_for(name))
+        headers = {}
+        if validators and validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators and validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        async def request() -> FetchResult:
+            async with semaphore:
+                with profiler.timer(f"fetch.{name}"):
+                    async with session.get(self.base_url + endpoint,
+                                           headers=headers,
+                                           timeout=timeout) as response:
+                        if response.status == 304:
+                            profiler.add("fetch.not_modified")
+                            return FetchResult(not_modified=True)
+                        response.raise_for_status()
+                        if sink is None:
+                            body = await response.read()
+                            profiler.add("bytes_received", len(body))
+                            data = json.loads(body)
+                        else:
+                            data = None
+                            sink.reset()
+                            stream = JSONArrayStream()
+                            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                                profiler.add("bytes_received", len(chunk))
+                                for item in stream.feed(chunk):
+                                    sink.add(item)
+                            stream.close()
+                        return FetchResult(
+                            data,
+                            etag=response.headers.get("ETag"),
+                            last_modified=response.headers.get("Last-Modified"))
+        return await self.with_retries(request)
+
+    async def fetch_all(self, endpoints: Dict[str, str],
+                        validators: Optional[dict] = None,
+                        sinks: Optional[dict] = None) -> Dict[str, FetchResult]:
+        """
+        Requests all endpoints concurrently, returns results by endpoint name.
+        Endpoints with an entry in `sinks` are streamed into it.
+        A failing endpoint does not stop the others, its result holds the error.
+        """
+        import asyncio
+        import aiohttp
+        validators = validators or {}
+        sinks = sinks or {}
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            outcomes = await asyncio.gather(
+                *[asyncio.wait_for(self.fetch_endpoint(session, semaphore, name, endpoint,
+                                                       validators.get(name), sinks.get(name)),
+                                   self.deadline)
+                  for name, endpoint in endpoints.items()],
+                return_exceptions=True)
+        results = {}
+        for name, outcome in zip(endpoints, outcomes):
+            if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                raise outcome
+            results[name] = FetchResult(error=outcome) if isinstance(outcome, Exception) else outcome
+        return results
+
+    def fetch_results(self, endpoints: Dict[str, str],
+                      validators: Optional[dict] = None,
+                      sinks: Optional[dict] = None) -> Dict[str, FetchResult]:
+        """
+        Synchronous wrapper around fetch_all. Runs on a private event
+        loop so that the current one, used by spacexpy, stays untouched
+        """
+        import asyncio
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.fetch_all(endpoints, validators, sinks))
+        finally:
+            loop.close()
+
+    async def post_query(self, endpoint: str, body: dict) -> list:
+        """
+        Posts a query to a `/<name>/query` endpoint, returns the matching
+        documents. Retries included, it takes at most `deadline` seconds.
+        """
+        import asyncio
+        import aiohttp
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession() as session:
+            async def request() -> list:
+                async with session.post(self.base_url + endpoint, json=body,
+                                        timeout=timeout) as response:
+                    response.raise_for_status()
+                    result = await response.json(content_type=None)
+                    return result.get("docs", [])
+            return await asyncio.wait_for(self.with_retries(request), self.deadline)
+
+    def query(self, endpoint: str, body: dict) -> list:
+        """
+        Synchronous wrapper around post_query
+        """
+        import asyncio
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.post_query(endpoint, body))
+        finally:
+            loop.close()
+
+    async def post_queries(self, queries: Dict[Any, tuple]) -> Dict[Any, Any]:
+        """
+        Posts (endpoint, body) queries concurrently, returns the documents
+        of every query by key, or the error that prevented them
+        """
+        import asyncio
+        outcomes = await asyncio.gather(*[self.post_query(endpoint, body)
+                                          for endpoint, body in queries.values()],
+                                        return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                raise outcome
+        return dict(zip(queries, outcomes))
+
+    def query_many(self, queries: Dict[Any, tuple]) -> Dict[Any, Any]:
+        """
+        Synchronous wrapper around post_queries
+        """
+        import asyncio
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.post_queries(queries))
+        finally:
+            loop.close()
+
+    def fetch(self, endpoints: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Requests all endpoints concurrently, returns data by endpoint name.
+        Raises the error of the first endpoint that failed.
+        """
+        results = self.fetch_results(endpoints)
+        for result in results.values():
+            if result.error is not None:
+                raise result.error
+        return {name: result.data for name, result in results.items()}
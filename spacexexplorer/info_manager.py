@@ -1,116 +1,783 @@
-import os
-import sys
-import json
+import time
+import shutil
 import pathlib
-from typing import Any
-import spacexpy
+import threading
+from itertools import chain, islice
+from typing import Any, Callable, Iterable, Iterator, Optional
 
-from aiohttp.client_exceptions import ClientConnectorError
+from spacexexplorer.analytics import launch_analytics
+from spacexexplorer.cache import StaticCache
+from spacexexplorer.changes import CHANGES_DIR, ChangeLog
+from spacexexplorer.columnar import LaunchTable
+from spacexexplorer.dataset import Dataset
+from spacexexplorer.enrichment import Enricher
+from spacexexplorer.fetcher import (AsyncFetcher, CircuitOpenError, FetchError,
+                                    connection_errors)
+from spacexexplorer.profiling import profiler
+from spacexexplorer.query import LaunchIndex
+from spacexexplorer.registry import EntityRegistry
+from spacexexplorer.reports import REPORTS_DIR, entity_jobs, export_reports, stats_jobs
+from spacexexplorer.search import SearchIndex, entity_documents, launch_documents
+from spacexexplorer.snapshot import (read_snapshot, restore_table, snapshot_path,
+                                     table_state, write_snapshot)
+from spacexexplorer.storage import RecordWriter, write_data
+
+# marks data that is read back from its file instead of kept from the fetch
+ON_DISK = object()
+# "sqlite" also keeps the data in an SQLite database that answers the queries
+BACKENDS = ("files", "sqlite")
+
+
+class LaunchSink(object):
+    """
+    Writes streamed launches to disk one at a time
+    and records them in a launch table
+    """
+
+    def __init__(self, path: pathlib.Path, fmt: str):
+        self.path = path
+        self.fmt = fmt
+        self.writer: Optional[RecordWriter] = None
+        self.table = LaunchTable()
+
+    def reset(self) -> None:
+        self.abort()
+        self.writer = RecordWriter(self.path, self.fmt)
+        self.table = LaunchTable()
+
+    def add(self, launch: dict) -> None:
+        self.writer.write(launch)
+        self.table.append(launch)
+
+    def commit(self) -> str:
+        return self.writer.commit()
+
+    def abort(self) -> None:
+        if self.writer is not None and not self.writer.file.closed:
+            self.writer.abort()
 
 
 class InfoManager(object):
     """InfoManager class that retrieves SpaceX data"""
 
-    def __init__(self, location: str = "./"):
-        self.spacex = spacexpy.SpaceX()
-        self.location = pathlib.Path(location)
-        self.static_file_dict = {"company": self.spacex.request_company,
-                                 "landpads":  self.spacex.request_landpads,
-                                 "launchpads":  self.spacex.request_launchpads,
-                                 "rockets": self.spacex.request_rockets,
-                                 "launches": self.spacex.request_launches  # keep as last one for statistics
+    def __init__(self, location: str = "./", fetcher: Optional[AsyncFetcher] = None,
+                 cache: Optional[StaticCache] = None, lazy: bool = False,
+                 storage_format: str = "json", spacex: Any = None,
+                 backend: str = "files"):
+        # any object with the request_* methods of spacexpy.SpaceX,
+        # the default one is only created for the first request
+        self._spacex = spacex
+        self.fetcher = fetcher or AsyncFetcher()
+        self.cache = cache
+        self.lazy = lazy
+        self.location = cache.location if cache is not None else pathlib.Path(location)
+        # launches may be stored as JSON Lines, see spacexexplorer.storage
+        self.formats = {"launches": storage_format}
+        if cache is not None:
+            cache.formats = self.formats
+        # with `lazy` the launches file is memory-mapped and decoded on access
+        self.dataset = Dataset(self.location, lazy=["launches"] if lazy else [],
+                               formats=self.formats)
+        if backend not in BACKENDS:
+            raise ValueError(f'Unknown backend {backend}, use one of {BACKENDS}')
+        self.backend = backend
+        self.store = None
+        if backend == "sqlite":
+            # sqlite3 is only imported when the backend is used
+            from spacexexplorer.sqlite_store import STORE_NAME, SQLiteStore
+            self.store = SQLiteStore(self.location / STORE_NAME)
+        self._launch_index: Optional[LaunchIndex] = None
+        # name -> (dataset, version, value) of the values derived from the data
+        self._derived: dict = {}
+        self.static_file_dict = {"company": self.requester("company"),
+                                 "landpads":  self.requester("landpads"),
+                                 "launchpads":  self.requester("launchpads"),
+                                 "rockets": self.requester("rockets"),
+                                 "launches": self.requester("launches")
+                                 }
+        self.static_endpoints = {"company": "/company",
+                                 "landpads": "/landpads",
+                                 "launchpads": "/launchpads",
+                                 "rockets": "/rockets",
+                                 "launches": "/launches"
                                  }
+        # launch statistics refer to launchpads and rockets by id
+        self.static_dependencies = {"launches": ("launchpads", "rockets")}
+        # static files whose records are kept by id in the registry
+        self.registered = ("landpads", "launchpads", "rockets")
+        self.registry = EntityRegistry()
+        # payloads, cores, crew and ships of the launches, fetched on demand
+        self.enricher = Enricher(self.fetcher)
+        # added, removed and modified records of every downloaded version,
+        # tracked next to a persistent cache only
+        self.changes: Optional[ChangeLog] = None
+        if cache is not None:
+            self.changes = ChangeLog(cache.location / CHANGES_DIR)
         self.launchpad_info: dict = {}
         self.rocket_info: dict = {}
         self.launch_stats: dict = {"years": {}, "months": {}}
+        self.launch_table = LaunchTable()
+        # time of the oldest fetch the current data comes from
+        self.fetched_at: Optional[float] = None
+        # errors of the endpoints served from disk by the last fetch_static
+        self.fetch_errors: dict = {}
+        # static files whose content changed in the last fetch_static
+        self.updated: set = set()
+        # held while a refreshed snapshot is swapped in, see adopt
+        self.lock = threading.RLock()
+
+    @property
+    def spacex(self) -> Any:
+        """
+        The SpaceX API client, spacexpy and aiohttp are imported on first use
+        """
+        if self._spacex is None:
+            import spacexpy
+            self._spacex = spacexpy.SpaceX()
+        return self._spacex
+
+    def requester(self, name: str) -> Any:
+        """
+        Returns a function requesting a static endpoint through the client
+        """
+        return lambda: getattr(self.spacex, f"request_{name}")()
 
-    def record_launch(self, launch: dict) -> None:
+    def record_launch(self, launch: dict, count: int = 1) -> None:
         """
-        Records launch stats
+        Records launch stats, a negative `count` takes back
+        a previously recorded launch
         """
-        if launch['success']:
-            self.launchpad_info[launch['launchpad']
-                                ]['successful_launches'] += 1
-            self.rocket_info[launch['rocket']
-                                ]['successful_launches'] += 1
-        self.launchpad_info[launch['launchpad']
-                            ]['total_launches'] += 1
-        self.rocket_info[launch['rocket']
-                            ]['total_launches'] += 1
+        # like apply_launch_table, launches of a rocket or launchpad that is
+        # not known yet, e.g. synced before the cached lists expire, are
+        # only counted once the lists are fetched again
+        for info, key in ((self.launchpad_info, 'launchpad'), (self.rocket_info, 'rocket')):
+            item = info.get(launch[key])
+            if item is None:
+                continue
+            if launch['success']:
+                item['successful_launches'] += count
+            item['total_launches'] += count
         year, month, _ = launch["date_utc"].split('T')[0].split('-')
-        year = int(year)
-        month = int(month)
-        if year in self.launch_stats["years"]:
-            self.launch_stats["years"][year] += 1
-        else:
-            self.launch_stats["years"][year] = 1
-        if month in self.launch_stats["months"]:
-            self.launch_stats["months"][month] += 1
-        else:
-            self.launch_stats["months"][month] = 1
+        for key, value in (("years", int(year)), ("months", int(month))):
+            total = self.launch_stats[key].get(value, 0) + count
+            if total:
+                self.launch_stats[key][value] = total
+            else:
+                del self.launch_stats[key][value]
+
+    def static_order(self) -> list:
+        """
+        Returns static file names ordered so that every file comes
+        after the files it depends on
+        """
+        ordered: list = []
+
+        def visit(filename: str) -> None:
+            if filename in ordered or filename not in self.static_file_dict:
+                return
+            for dependency in self.static_dependencies.get(filename, ()):
+                visit(dependency)
+            ordered.append(filename)
+        for filename in self.static_file_dict:
+            visit(filename)
+        return ordered
+
+    def store_static(self, filename: str, data: Any, etag: Optional[str] = None,
+                     last_modified: Optional[str] = None) -> str:
+        """
+        Writes fetched data to its JSON file, through the cache if any,
+        and returns the SHA-256 of the file
+        """
+        if self.cache is not None:
+            return self.cache.store(filename, data, etag, last_modified)
+        return write_data(self.dataset.path(filename), data, self.formats.get(filename, "json"))
+
+    @profiler.timed("ingest_static")
+    def ingest_static(self, filename: str, data: Any) -> None:
+        """
+        Records the information derived from a static file
+        """
+        if filename in self.registered:
+            self.registry.add(filename, data)
+        if filename == "launchpads":
+            for launchpad in data:
+                self.launchpad_info[launchpad["id"]
+                                    ] = {"name": launchpad.get("full_name"),
+                                         "successful_launches": 0,
+                                         "total_launches": 0}
+        if filename == "rockets":
+            for rocket in data:
+                self.rocket_info[rocket["id"]] = {"name": rocket.get("name"),
+                                                  "successful_launches": 0,
+                                                  "total_launches": 0}
+        if filename == "launches":
+            self.launch_table = LaunchTable.from_launches(data)
+            self.apply_launch_table()
+
+    def apply_launch_table(self, source: Any = None) -> None:
+        """
+        Computes rocket, launchpad and calendar statistics from the
+        columnar launch table, or from `source` with the same group_by
+        and count_by methods, e.g. the SQLite store
+        """
+        source = source if source is not None else self.launch_table
+        for info, key in ((self.rocket_info, "rocket"), (self.launchpad_info, "launchpad")):
+            for item in info.values():
+                item["successful_launches"] = 0
+                item["total_launches"] = 0
+            for item_id, group in source.group_by(key).items():
+                if item_id in info:
+                    info[item_id]["successful_launches"] = group["successful_launches"]
+                    info[item_id]["total_launches"] = group["total_launches"]
+        self.launch_stats = {"years": source.count_by("year"),
+                             "months": source.count_by("month")}
 
-    def fetch_static(self) -> None:
+    def update_store(self) -> None:
+        """
+        Copies the static files that changed since they were last stored
+        into the SQLite store, then computes the statistics with it
+        """
+        for filename in self.static_file_dict:
+            path = self.dataset.path(filename)
+            if not path.exists():
+                continue
+            stat = path.stat()
+            with profiler.timer(f"store.{filename}"):
+                self.store.update(filename, f"{stat.st_mtime_ns}:{stat.st_size}",
+                                  lambda: self.get(filename))
+        self.apply_launch_table(self.store)
+
+    @profiler.timed("fetch_static")
+    def fetch_static(self, concurrent: bool = False, offline: bool = False,
+                     incremental: bool = False, revalidate: bool = False) -> None:
         """
         Fetches the requested information from SpaceX API and
-        stores it in JSON files for further use
+        stores it in JSON files for further use.
+        With `concurrent` all endpoints are requested at once and the
+        launches are streamed to disk one by one as they are decoded.
+        With a cache, fresh endpoints are served from disk and expired
+        ones are revalidated; `offline` serves everything from the cache.
+        With `incremental` expired cached launches are updated
+        with sync_launches instead of being downloaded again.
+        With `revalidate` every cached endpoint is treated as expired.
+        The files whose content changed are listed in `updated`.
+        Endpoints that cannot be fetched fall back to their last stored
+        copy and are listed in `fetch_errors`; FetchError is raised
+        if there is none.
         """
-        try:
-            for filename in self.static_file_dict:
-                with open(self.location / f'{filename}.json', 'w') as f:
-                    data = self.static_file_dict[filename]()
-                    json.dump(data, f, indent='    ')
-                    if filename == "launchpads":
-                        for launchpad in data:
-                            self.launchpad_info[launchpad["id"]
-                                                ] = {"name": launchpad.get("full_name"),
-                                                     "successful_launches": 0,
-                                                     "total_launches": 0}
-                    if filename == "rockets":
-                        for rocket in data:
-                            self.rocket_info[rocket["id"]] = {"name": rocket.get("name"),
-                                                              "successful_launches": 0,
-                                                              "total_launches": 0}
+        fetched: dict = {}
+        stale = []
+        # SHA-256 of the files downloaded by this fetch
+        downloaded: dict = {}
+        sync = False
+        self.fetch_errors = {}
+        for filename in self.static_file_dict:
+            fresh = not revalidate and self.cache is not None and self.cache.is_fresh(filename)
+            if self.cache is not None and (offline or fresh
+                                           or (incremental and filename == "launches")):
+                if self.cache.has(filename):
                     if filename == "launches":
-                        for launch in data:
-                            self.record_launch(launch)
-        except ClientConnectorError:
-            sys.exit(
-                "No access to SpaceX API, please check your internet connection!")
+                        sync = incremental and not offline and not fresh
+                    fetched[filename] = ON_DISK
+                    profiler.add("cache.hits")
+                    continue
+                if offline:
+                    raise FetchError(f"No cached {filename} data, please run once without --offline")
+            stale.append(filename)
+            profiler.add("cache.misses")
+        previous = {}
+        if self.cache is not None:
+            previous = {filename: (self.cache.metadata(filename) or {}).get("sha256")
+                        for filename in stale}
+        sinks = {}
+        try:
+            if stale and concurrent:
+                validators = {}
+                if self.cache is not None:
+                    validators = {filename: self.cache.validators(filename)
+                                  for filename in stale}
+                if "launches" in stale:
+                    sinks["launches"] = LaunchSink(self.dataset.path("launches"),
+                                                   self.formats["launches"])
+                results = self.fetcher.fetch_results({filename: self.static_endpoints[filename]
+                                                      for filename in stale}, validators, sinks)
+                for filename, result in results.items():
+                    if result.error is not None:
+                        fetched[filename] = self.fall_back(filename, result.error)
+                    elif result.not_modified and self.cache is not None:
+                        self.cache.touch(filename)
+                        fetched[filename] = ON_DISK
+                    elif filename in sinks:
+                        fetched[filename] = sinks.pop(filename)
+                        downloaded[filename] = fetched[filename].commit()
+                        if self.cache is not None:
+                            self.cache.record(filename, downloaded[filename],
+                                              result.etag, result.last_modified)
+                    else:
+                        downloaded[filename] = self.store_static(filename, result.data,
+                                                                 result.etag, result.last_modified)
+                        fetched[filename] = result.data
+            elif stale:
+                breaker = self.fetcher.breaker
+                for filename in stale:
+                    try:
+                        if not breaker.allow():
+                            raise CircuitOpenError("SpaceX API is failing")
+                        with profiler.timer(f"request.{filename}"):
+                            data = self.static_file_dict[filename]()
+                    except connection_errors() as error:
+                        if not isinstance(error, CircuitOpenError):
+                            breaker.record_failure()
+                        fetched[filename] = self.fall_back(filename, error)
+                        continue
+                    breaker.record_success()
+                    fetched[filename] = data
+                    downloaded[filename] = self.store_static(filename, data)
+        finally:
+            for sink in sinks.values():
+                sink.abort()
+        for filename in self.static_order():
+            if isinstance(fetched[filename], LaunchSink):
+                # the launches were recorded while streaming, the list
+                # itself is only read back when it is needed
+                self.dataset.invalidate(filename)
+                self.launch_table = fetched[filename].table
+                self.apply_launch_table()
+                continue
+            if fetched[filename] is ON_DISK:
+                self.dataset.invalidate(filename)
+                fetched[filename] = self.dataset.get(filename)
+            else:
+                self.dataset.put(filename, fetched[filename])
+            self.ingest_static(filename, fetched[filename])
+        # a download of the same content changes nothing
+        self.updated = {filename for filename, sha256 in downloaded.items()
+                        if sha256 != previous.get(filename)}
+        if self.updated and self.changes is not None:
+            self.record_changes(self.updated)
+        if sync:
+            try:
+                if any(self.sync_launches().values()):
+                    self.updated.add("launches")
+                self.cache.touch("launches")
+            except FetchError as error:
+                # the cached launches stay expired and are synced next time
+                self.fetch_errors["launches"] = error
+        if self.store is not None:
+            self.update_store()
+        self.fetched_at = self.oldest_fetch()
+
+    @profiler.timed("record_changes")
+    def record_changes(self, filenames: Iterable[str]) -> None:
+        """
+        Logs the changes of the static files since their previous version
+        """
+        events = []
+        for filename in filenames:
+            data = self.dataset.get(filename)
+            events.extend(self.changes.diff(filename, [data] if isinstance(data, dict) else data))
+        self.changes.append(events)
+        profiler.add("changes.events", len(events))
+
+    def fall_back(self, filename: str, error: BaseException) -> Any:
+        """
+        Records a failed fetch and returns ON_DISK if the last good copy
+        of the file is stored, raises FetchError otherwise
+        """
+        self.fetch_errors[filename] = error
+        profiler.add("fetch.fallbacks")
+        stored = self.cache.has(filename) if self.cache is not None \
+            else self.dataset.path(filename).exists()
+        if not stored:
+            raise FetchError(f"No access to SpaceX API for {filename} and no stored copy, "
+                             f"please check your internet connection! ({error!r})") from error
+        return ON_DISK
+
+    def oldest_fetch(self) -> float:
+        """
+        Returns when the oldest of the current static files was fetched
+        """
+        if self.cache is None:
+            return time.time()
+        times = [self.cache.metadata(filename)["fetched_at"]
+                 for filename in self.static_file_dict if self.cache.has(filename)]
+        return min(times) if times else time.time()
+
+    def data_age(self) -> Optional[float]:
+        """
+        Returns the age of the current data in seconds
+        """
+        if self.fetched_at is None:
+            return None
+        return time.time() - self.fetched_at
+
+    def refreshed(self, **fetch_args) -> "InfoManager":
+        """
+        Returns a new InfoManager with the same configuration
+        and freshly fetched data, this one is left untouched
+        """
+        clone = InfoManager(location=str(self.location), fetcher=self.fetcher,
+                            cache=self.cache, lazy=self.lazy,
+                            storage_format=self.formats["launches"], spacex=self._spacex,
+                            backend=self.backend)
+        clone.static_file_dict = self.static_file_dict
+        clone.static_endpoints = self.static_endpoints
+        clone.static_dependencies = self.static_dependencies
+        clone.changes = self.changes
+        # stored validators make the requests of unchanged endpoints cheap
+        clone.fetch_static(**dict(fetch_args, revalidate=True))
+        return clone
+
+    def adopt(self, other: "InfoManager") -> None:
+        """
+        Swaps in the data and statistics of another InfoManager at once
+        """
+        state = {key: other.__dict__[key]
+                 for key in ("dataset", "_launch_index", "_derived", "launch_table",
+                             "registry", "rocket_info", "launchpad_info", "launch_stats",
+                             "fetched_at", "fetch_errors", "updated")}
+        with self.lock:
+            self.__dict__.update(state)
+
+    @profiler.timed("sync_launches")
+    def sync_launches(self) -> dict:
+        """
+        Fetches only the launches that are new or still pending since the
+        last fetch and applies them to the stored launches and statistics
+        as deltas. Returns the number of added and updated launches.
+        """
+        index = self.launch_index
+        launches = index.launches
+        if not isinstance(launches, list):
+            launches = list(launches)
+            index = LaunchIndex(launches)
+        since = index.last_finished_date()
+        pending = [launches[position].get("id")
+                   for position in index.hash_indexes["upcoming"].get(True, ())]
+        query: dict = {}
+        if since is not None:
+            query = {"$or": [{"date_utc": {"$gte": since}},
+                             {"_id": {"$in": pending}}]}
+        try:
+            changed = self.fetcher.query("/launches/query",
+                                         {"query": query, "options": {"pagination": False}})
+        except connection_errors() as error:
+            raise FetchError("No access to SpaceX API, "
+                             "please check your internet connection!") from error
+        added = updated = 0
+        applied = []
+        for launch in changed:
+            position = index.ids.get(launch.get("id"))
+            if position is None:
+                index.add(len(launches), launch)
+                launches.append(launch)
+                self.launch_table.append(launch)
+                self.record_launch(launch)
+                applied.append(launch)
+                added += 1
+            elif launches[position] != launch:
+                self.record_launch(launches[position], -1)
+                index.remove(position, launches[position])
+                launches[position] = launch
+                index.add(position, launch)
+                self.launch_table.replace(position, launch)
+                self.record_launch(launch)
+                applied.append(launch)
+                updated += 1
+        if added or updated:
+            self.store_static("launches", launches)
+            self.dataset.put("launches", launches)
+            self._launch_index = index
+            if self.store is not None:
+                self.update_store()
+            if self.changes is not None:
+                self.changes.append(self.changes.diff("launches", applied, complete=False))
+        return {"added": added, "updated": updated}
+
+    def entity(self, kind: str, entity_id: Any) -> Optional[dict]:
+        """
+        Returns a rocket, launchpad or landpad record by id without reading any file
+        """
+        return self.registry.get(kind, entity_id)
+
+    def launch_details(self, launch: dict, neighbours: Iterable[dict] = ()) -> dict:
+        """
+        Returns the payloads, cores, crew and ships of a launch by kind.
+        Those of `neighbours`, e.g. the other launches of a list, are fetched
+        in the same batch; records that cannot be fetched are left out.
+        """
+        try:
+            self.enricher.prefetch(chain([launch], neighbours))
+        except FetchError:
+            profiler.add("enrich.errors")
+        return self.enricher.related(launch)
 
     def get(self, info_type: str, **kw_args) -> Any:
         """
         Returns info from static or dynamic sources
         """
         if info_type in self.static_file_dict:
-            path = self.location / f'{info_type}.json'
-            if not os.path.exists(path):
-                raise FileNotFoundError(
-                    f'File {path} not available, please relaunch the program')
-            with open(path, 'r') as f:
-                return json.load(f)
+            return self.dataset.get(info_type)
         else:
             raise NotImplementedError()
 
-    def filter_launches(self, **filters) -> list:
+    @property
+    def launch_index(self) -> LaunchIndex:
+        """
+        Launch indexes, rebuilt whenever the launch list is reloaded
+        """
+        launches = self.get("launches")
+        if self._launch_index is None or self._launch_index.launches is not launches:
+            self._launch_index = LaunchIndex(launches)
+        return self._launch_index
+
+    def derived(self, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the value computed from the loaded data under `name`,
+        computed again only when the data has changed
+        """
+        with self.lock:
+            value = self.current(name)
+            if value is None:
+                value = compute()
+                self._derived[name] = (self.dataset, self.dataset.version, value)
+            return value
+
+    def current(self, name: str) -> Any:
+        """
+        Returns the derived value `name` if it is up to date, otherwise None
+        """
+        entry = self._derived.get(name)
+        if entry is not None and entry[0] is self.dataset \
+                and entry[1] == self.dataset.version:
+            return entry[2]
+        return None
+
+    def analytics(self) -> dict:
+        """
+        Returns the derived launch analytics, see spacexexplorer.analytics
+        """
+        return self.derived("analytics", lambda: launch_analytics(self.get("launches")))
+
+    def search_index(self) -> SearchIndex:
+        """
+        Returns the full-text index of the launches by position
+        """
+        return self.derived("launch_search",
+                            lambda: SearchIndex(launch_documents(self.launch_index.launches)))
+
+    def entity_index(self) -> SearchIndex:
+        """
+        Returns the full-text index of the registered entities by (kind, id)
+        """
+        return self.derived("entity_search",
+                            lambda: SearchIndex(entity_documents(self.registry, self.registered)))
+
+    def search(self, text: str, limit: Optional[int] = None) -> list:
+        """
+        Returns the launches containing every word of `text`, best match first
+        """
+        launches = self.launch_index.launches
+        with profiler.timer("search"):
+            return [launches[position]
+                    for position, _ in self.search_index().search(text, limit=limit)]
+
+    def search_entities(self, text: str, limit: Optional[int] = None) -> list:
+        """
+        Returns (kind, record) of the rockets, launchpads and landpads
+        containing every word of `text`, best match first
+        """
+        return [(kind, self.entity(kind, entity_id))
+                for (kind, entity_id), _ in self.entity_index().search(text, limit=limit)]
+
+    def filter_launches(self, since: Any = None, until: Any = None,
+                        min_flight: Any = None, max_flight: Any = None,
+                        sort_by: Optional[str] = None, reverse: bool = False,
+                        limit: Optional[int] = None, offset: int = 0,
+                        text: Optional[str] = None, **filters) -> list:
+        """
+        Filters the launch list.
+        Keyword filters are exact matches (`year` and `month` are derived
+        from `date_utc`), `since`/`until` bound `date_utc` and
+        `min_flight`/`max_flight` bound `flight_number`.
+        With `text` only launches containing all its words are kept,
+        best match first unless `sort_by` is given.
+        """
+        if len(filters) < 1 and since is None and until is None \
+                and min_flight is None and max_flight is None and text is None \
+                and sort_by is None and not reverse and limit is None and offset == 0:
+            return self.launch_index.launches
+        if self.store is not None and text is None:
+            with profiler.timer("filter_launches"):
+                result = self.store.query_launches(filters, since=since, until=until,
+                                                   min_flight=min_flight,
+                                                   max_flight=max_flight,
+                                                   sort_by=sort_by, reverse=reverse,
+                                                   limit=limit, offset=offset)
+            profiler.add("filter.matched", len(result))
+            return result
+        index = self.launch_index
+        ranked = None
+        if text is not None:
+            # only the best matches are needed when nothing else filters them
+            best = None
+            if not filters and since is None and until is None and min_flight is None \
+                    and max_flight is None and sort_by is None and not reverse \
+                    and limit is not None:
+                best = offset + limit
+            ranked = [position for position, _ in self.search_index().search(text, limit=best)]
+        with profiler.timer("filter_launches"):
+            result = index.query(filters, since=since, until=until,
+                                 min_flight=min_flight, max_flight=max_flight,
+                                 sort_by=sort_by, reverse=reverse,
+                                 limit=limit, offset=offset, ranked=ranked)
+        if profiler.enabled:
+            # matched / total is the selectivity of the filters
+            profiler.add("filter.total", len(index.launches))
+            profiler.add("filter.matched", len(result))
+        return result
+
+    def iter_launches(self, since: Any = None, until: Any = None,
+                      min_flight: Any = None, max_flight: Any = None,
+                      sort_by: Optional[str] = None, reverse: bool = False,
+                      limit: Optional[int] = None, offset: int = 0,
+                      text: Optional[str] = None, **filters) -> Iterator[dict]:
+        """
+        Yields the launches filter_launches would return one at a time.
+        Unless they have to be sorted or searched, or the SQLite store
+        answers the query, launches are checked in storage order without
+        building the launch indexes.
+        """
+        if sort_by is not None or reverse or text is not None or self.store is not None:
+            yield from self.filter_launches(since=since, until=until,
+                                            min_flight=min_flight, max_flight=max_flight,
+                                            sort_by=sort_by, reverse=reverse,
+                                            limit=limit, offset=offset, text=text,
+                                            **filters)
+            return
+        end = None if limit is None else offset + limit
+        matching = (launch for launch in self.get("launches")
+                    if LaunchIndex.matches(launch, filters, since=since, until=until,
+                                           min_flight=min_flight, max_flight=max_flight))
+        yield from islice(matching, offset, end)
+
+    def static_paths(self, filename: str) -> list:
+        """
+        Returns the files holding a static endpoint
+        """
+        paths = [self.dataset.path(filename)]
+        if self.cache is not None:
+            paths.append(self.cache.meta_path(filename))
+        return paths
+
+    def snapshot_state(self) -> dict:
+        """
+        Returns the loaded data with its indexes and statistics
+        """
+        with self.lock:
+            records = {filename: self.get(filename) for filename in self.static_file_dict}
+            if not isinstance(records.get("launches", []), list):
+                records["launches"] = list(records["launches"])
+            index = self._launch_index
+            if index is not None and index.launches is not records.get("launches"):
+                index = None
+            analytics = self.current("analytics")
+            return {"records": records,
+                    "launch_index": index,
+                    "launch_table": table_state(self.launch_table),
+                    "registry": self.registry,
+                    "rocket_info": self.rocket_info,
+                    "launchpad_info": self.launchpad_info,
+                    "launch_stats": self.launch_stats,
+                    "analytics": analytics,
+                    "fetched_at": self.fetched_at}
+
+    def restore(self, state: dict) -> None:
+        """
+        Replaces the data, indexes and statistics with a snapshot state
+        """
+        with self.lock:
+            for filename, data in state["records"].items():
+                self.dataset.put(filename, data)
+            self._launch_index = None
+            if "launches" not in self.dataset.lazy:
+                self._launch_index = state["launch_index"]
+            self._derived = {}
+            if state["analytics"] is not None:
+                self._derived["analytics"] = (self.dataset, self.dataset.version,
+                                              state["analytics"])
+            self.launch_table = restore_table(state["launch_table"])
+            self.registry = state["registry"]
+            self.rocket_info = state["rocket_info"]
+            self.launchpad_info = state["launchpad_info"]
+            self.launch_stats = state["launch_stats"]
+            self.fetched_at = state["fetched_at"]
+
+    def save_snapshot(self, path: str) -> str:
+        """
+        Writes the loaded data with its indexes and statistics
+        to a single binary file, returns its SHA-256
+        """
+        return write_snapshot(pathlib.Path(path), self.snapshot_state())
+
+    def load_snapshot(self, path: str) -> None:
+        """
+        Restores the data written by save_snapshot without recomputing
+        any statistics, raises SnapshotError for a damaged file
+        """
+        self.restore(read_snapshot(pathlib.Path(path)))
+
+    def save_static(self, destination: str, reports: bool = True,
+                    workers: Optional[int] = None) -> Optional[dict]:
+        """
+        Copies static files to destination together with a snapshot
+        and, with `reports`, the reports of spacexexplorer.reports in
+        its "reports" directory if the data has been loaded.
+        Returns the number of written and skipped reports.
+        """
+        destination = pathlib.Path(destination)
+        destination.mkdir(parents=True, exist_ok=True)
+        for filename in self.static_file_dict:
+            for path in self.static_paths(filename):
+                if path.exists():
+                    shutil.copy2(path, destination / path.name)
+        if self.fetched_at is None:
+            return None
+        self.save_snapshot(snapshot_path(destination))
+        if not reports:
+            return None
+        with profiler.timer("export_reports"):
+            return export_reports(destination / REPORTS_DIR, self.report_jobs(), workers)
+
+    def report_jobs(self) -> list:
         """
-        Filters the launch list
+        Returns the jobs of the rocket, launchpad and statistics reports
         """
-        info = self.get("launches")
-        if len(filters) < 1:
-            return info
-        filtered = []
-        for launch in info:
-            accepted = True
-            for key in filters:
-                if launch[key] != filters[key]:
-                    accepted = False
-                    break
-            if accepted:
-                filtered.append(launch)
-        return filtered
+        # like the process pool of the exports, calendar is not imported by every run
+        import calendar
+        names = {item_id: item["name"]
+                 for info in (self.rocket_info, self.launchpad_info)
+                 for item_id, item in info.items()}
+        launches = self.get("launches")
+        jobs = []
+        for kind, info in (("rockets", self.rocket_info), ("launchpads", self.launchpad_info)):
+            jobs.extend(entity_jobs(kind, self.get(kind), info, launches, names))
+        return jobs + stats_jobs(self.launch_stats, list(calendar.month_abbr)[1:])
 
-    def save_static(self, destination: str):
+    def load_static(self, source: str) -> None:
         """
-        Copies static files to desctination
+        Imports static files previously exported with save_static,
+        statistics come from the snapshot if there is one
         """
-        pass
+        source = pathlib.Path(source)
+        for filename in self.static_file_dict:
+            for path in self.static_paths(filename):
+                if (source / path.name).exists():
+                    shutil.copy2(source / path.name, path)
+        self.dataset.invalidate()
+        if snapshot_path(source).exists():
+            self.load_snapshot(snapshot_path(source))
+            return
+        for filename in self.static_order():
+            self.ingest_static(filename, self.get(filename))
+        self.fetched_at = self.oldest_fetch()
@@ -0,0 +1,47 @@
+"""
+Bounded in-memory cache evicting the least recently used entries.
+"""
+from collections import OrderedDict
+from typing import Any
+
+
+class LRUCache(object):
+    """
+    Keeps at most `maxsize` entries, counting hits and misses
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Any) -> Any:
+        """
+        Returns the entry of a key, None if there is none
+        """
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key: Any, entry: Any) -> None:
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self.entries), "maxsize": self.maxsize,
+                "hits": self.hits, "misses": self.misses}
@@ -1,5 +1,6 @@
 from spacexexplorer.info_manager import InfoManager
-from spacexexplorer.textui_manager import TextUIManager
+from spacexexplorer.refresher import BackgroundRefresher
+from spacexexplorer.textui_manager import SequenceView, TextUIManager
 
 from typing import Callable, Any, Optional
 
@@ -26,6 +27,8 @@ class MainManager(object):
         self.info_manager = info_manager
         self.ui_manager = ui_manager
         self.greeting = "This is a SpaceX info app"
+        # refreshes the data in the background, if started
+        self.refresher: Optional[BackgroundRefresher] = None
         self.define_menus()
 
     def define_menus(self):
@@ -33,10 +36,13 @@ class MainManager(object):
                           MenuItem("Browse launches", self.show_launches_menu),
                           MenuItem("Browse launchpads", self.show_launchpads_menu),
                           MenuItem("Browse rockets", self.show_rockets_menu),
+                          MenuItem("Search", self.show_search),
                           MenuItem("Show launch statistics", self.show_launch_stats)
                           ]
+        if self.info_manager.changes is not None:
+            self.main_menu.append(MenuItem("What's new", self.show_changes))
 
-        self.launches_menu = [
+        launches_menu = [
             MenuItem("All", self.info_manager.filter_launches, {}),
             MenuItem("Successful", self.info_manager.filter_launches,
              {"success": True}),
@@ -48,14 +54,41 @@ class MainManager(object):
             item = MenuItem(f"By {name} rocket",
                     self.info_manager.filter_launches,
                     {"rocket": rocket_id})
-            self.launches_menu.append(item)
+            launches_menu.append(item)
         for launchpad_id in self.info_manager.launchpad_info:
             name = self.info_manager.launchpad_info[launchpad_id]["name"]
             item = MenuItem(f"By {name}",
                     self.info_manager.filter_launches,
                     {"launchpad": launchpad_id})
-            self.launches_menu.append(item)
+            launches_menu.append(item)
+        # menu index -> id, names may repeat but ids do not
+        rocket_ids = list(self.info_manager.rocket_info)
+        launchpad_ids = list(self.info_manager.launchpad_info)
+        # swapped in at once, a refresh may rebuild them from another thread
+        self.launches_menu = launches_menu
+        self.rocket_ids = rocket_ids
+        self.rockets_menu = [self.info_manager.rocket_info[key]['name']
+                             for key in rocket_ids]
+        self.launchpad_ids = launchpad_ids
+        self.launchpads_menu = [self.info_manager.launchpad_info[key]["name"]
+                                for key in launchpad_ids]
 
+    def on_refresh(self) -> None:
+        """
+        Rebuilds the menus that depend on refreshed data
+        """
+        with self.info_manager.lock:
+            self.define_menus()
+
+    def show_status(self) -> None:
+        """
+        Prints the age of the data and the state of the background refresh
+        """
+        refreshing, error = False, None
+        if self.refresher is not None:
+            refreshing = self.refresher.refreshing.is_set()
+            error = self.refresher.last_error
+        self.ui_manager.show_data_age(self.info_manager.data_age(), refreshing, error)
 
     def about_info(self) -> None:
         """
@@ -75,26 +108,75 @@ class MainManager(object):
         """
         yearly = sorted([(k, v) for k, v in self.info_manager.launch_stats["years"].items()])
         monthly = sorted([(k, v) for k, v in self.info_manager.launch_stats["months"].items()])
-        self.ui_manager.show_launch_stats(yearly, monthly)
+        rockets = [(info["name"], info["total_launches"], info["successful_launches"])
+                   for info in self.info_manager.rocket_info.values()]
+        # the statistics screen is written at once
+        with self.ui_manager.frame():
+            self.ui_manager.show_launch_stats(yearly, monthly, rockets)
+            self.show_analytics()
+
+    def show_analytics(self) -> None:
+        """
+        Prints cadence, turnaround, booster reuse and landing statistics
+        """
+        analytics = self.info_manager.analytics()
+        rockets = self.info_manager.rocket_info
+        launchpads = self.info_manager.launchpad_info
+
+        def name(info: dict, key: Any) -> str:
+            return info[key]["name"] if key in info else str(key)
+
+        rows = []
+        for rocket, years in analytics["rocket_cadence"].items():
+            busiest = max(years, key=years.get)
+            rows.append([name(rockets, rocket), sum(years.values()),
+                         min(years), max(years), f"{busiest} ({years[busiest]})"])
+        self.ui_manager.show_table("Launch cadence by rocket:",
+                                   ["Rocket", "Launches", "First", "Last", "Busiest year"],
+                                   rows)
+        rows = [[name(launchpads, launchpad), pad["launches"], pad["mean_days"], pad["min_days"]]
+                for launchpad, pad in analytics["pad_turnaround"].items()]
+        self.ui_manager.show_table("Launchpad turnaround in days:",
+                                   ["Launchpad", "Launches", "Mean", "Shortest"], rows)
+        reuse = analytics["core_reuse"]
+        self.ui_manager.show_table("Booster reuse:",
+                                   ["Cores", "Reused", "Most flights", "Mean days between flights"],
+                                   [[reuse["cores"], reuse["reused_cores"],
+                                     reuse["max_flights"], reuse["mean_days"]]])
+        rows = []
+        for landpad, landings in analytics["landpad_landings"].items():
+            record = self.info_manager.entity("landpads", landpad)
+            rows.append([record["name"] if record else "Other",
+                         landings["attempts"], landings["successes"], landings["success_rate"]])
+        self.ui_manager.show_table("Landings by landpad:",
+                                   ["Landpad", "Attempts", "Landed", "Success %"], rows)
+        rolling = analytics["rolling_success"]
+        if rolling:
+            self.ui_manager.say(f"Success rate of the last {analytics['rolling_window']} "
+                                f"launches: {rolling[-1][1]:.1f}%")
+
+    def show_changes(self) -> None:
+        """
+        Prints the changes of the data since they were last shown
+        """
+        events, position = self.info_manager.changes.unseen()
+        self.ui_manager.show_changes(events)
+        self.info_manager.changes.mark_seen(position)
 
     def show_launchpads_menu(self) -> None:
         """
         Prints launchpad menu
         """
         msg = "\nChoose a launchpad by typing a number and pressing [ENTER]:"
-        all_lps = self.info_manager.get("launchpads")
-        lps_menu = [self.info_manager.launchpad_info[key]["name"]
-                    for key in self.info_manager.launchpad_info]
+        launchpad_ids, launchpads_menu = self.launchpad_ids, self.launchpads_menu
         choice = self.ui_manager.ask_user_choice(
-            msg, lps_menu, ask_exit=True)
+            msg, launchpads_menu, ask_exit=True)
         if choice is None:
             self.ui_manager.say('Input was not valid, please'
                                 ' enter a valid number!')
             return
-        for lp in all_lps:
-            if lp.get('full_name') == lps_menu[choice]:
-                self.ui_manager.show_single_launchpad_info(lp)
-                break
+        lp = self.info_manager.entity("launchpads", launchpad_ids[choice])
+        self.ui_manager.show_single_launchpad_info(lp)
 
     def show_rockets_menu(self) -> None:
         """
@@ -102,26 +184,23 @@ class MainManager(object):
         external condition breaks it.
         """
         msg = '\nChoose a rocket by typing a number and pressing [ENTER]:'
-        all_rockets = self.info_manager.get("rockets")
-        rockets_menu = [self.info_manager.rocket_info[key]['name']
-                        for key in self.info_manager.rocket_info]
+        rocket_ids, rockets_menu = self.rocket_ids, self.rockets_menu
         choice = self.ui_manager.ask_user_choice(
             msg, rockets_menu, ask_exit=True)
         if choice is None:
             self.ui_manager.say('Input was not valid, please'
                                 ' enter a valid number!')
             return
-        for rocket in all_rockets:
-            if rocket.get('name') == rockets_menu[choice]:
-                extras = self.info_manager.rocket_info[rocket["id"]]
-                rocket_successes = extras['successful_launches']
-                rocket_total = extras['total_launches']
-                rocket_success_rate = None
-                if rocket_total > 0:
-                    rocket_success_rate = rocket_successes / rocket_total * 100
-                self.ui_manager.show_single_rocket_info(rocket, 
-                                                            rocket_success_rate=rocket_success_rate)
-                break
+        rocket_id = rocket_ids[choice]
+        rocket = self.info_manager.entity("rockets", rocket_id)
+        extras = self.info_manager.rocket_info[rocket_id]
+        rocket_successes = extras['successful_launches']
+        rocket_total = extras['total_launches']
+        rocket_success_rate = None
+        if rocket_total > 0:
+            rocket_success_rate = rocket_successes / rocket_total * 100
+        self.ui_manager.show_single_rocket_info(rocket,
+                                                rocket_success_rate=rocket_success_rate)
 
     def show_launches_menu(self) -> None:
         """
@@ -137,25 +216,56 @@ class MainManager(object):
                                     ' enter a valid number!')
                 continue
             filtered = self.launches_menu[choice]()
-            if len(filtered) < 1:
-                self.ui_manager.separator()
-                self.ui_manager.say("No launches found!")
-                self.ui_manager.separator()
-                break
-            launch_list_menu = [launch['date_local'].split(
-                'T')[0] for launch in filtered]
-            msg_launch = 'Choose date by typing number and pressing [ENTER]:'
-            choice_launch = self.ui_manager.ask_user_choice(
-                msg_launch, launch_list_menu, ask_exit=True)
-            if choice_launch is None:
-                self.ui_manager.say('Input was not valid, please'
-                                    ' enter a valid number!')
-            else:
-                rocket_name = self.info_manager.rocket_info[filtered[choice_launch].get('rocket')]['name']
-                self.ui_manager.show_single_launch_info(
-                    filtered[choice_launch], rocket_name=rocket_name)
+            if self.show_launch_choice(
+                    filtered, lambda launch: launch['date_local'].split('T')[0]):
                 break
 
+    def show_launch_choice(self, launches: list, label: Callable[[dict], str]) -> bool:
+        """
+        Asks for one of the launches and prints it,
+        returns False if the input was not valid
+        """
+        if len(launches) < 1:
+            self.ui_manager.separator()
+            self.ui_manager.say("No launches found!")
+            self.ui_manager.separator()
+            return True
+        launch_list_menu = SequenceView(launches, label)
+        msg_launch = 'Choose date by typing number and pressing [ENTER]:'
+        choice_launch = self.ui_manager.ask_user_choice(
+            msg_launch, launch_list_menu, ask_exit=True)
+        if choice_launch is None:
+            self.ui_manager.say('Input was not valid, please'
+                                ' enter a valid number!')
+            return False
+        launch = launches[choice_launch]
+        # a synced launch may fly a rocket that is not known yet
+        rocket_name = self.info_manager.rocket_info.get(launch.get('rocket'), {}).get('name')
+        # the details of the whole list are fetched at once
+        related = self.info_manager.launch_details(launch, launches)
+        self.ui_manager.show_single_launch_info(
+            launch, rocket_name=rocket_name, related=related)
+        return True
+
+    def show_search(self) -> None:
+        """
+        Searches launches, rockets, launchpads and landpads by words
+        of their names and descriptions
+        """
+        text = self.ui_manager.ask_text("\nType the words to search for and press [ENTER]:")
+        if not text:
+            return
+        entities = self.info_manager.search_entities(text, limit=10)
+        if entities:
+            self.ui_manager.separator()
+            for kind, entity in entities:
+                self.ui_manager.say(f"{kind[:-1].capitalize()}: "
+                                    f"{entity.get('full_name') or entity.get('name')}")
+        launches = self.info_manager.search(text, limit=self.ui_manager.page_size)
+        self.show_launch_choice(
+            launches,
+            lambda launch: f"{launch['date_local'].split('T')[0]} {launch.get('name')}")
+
     def main_loop(self) -> None:
         """
         Creates an infinite loop until the user or an
@@ -164,6 +274,7 @@ class MainManager(object):
         self.ui_manager.say(self.greeting)
         msg = '\nChoose an action by typing a number and pressing [ENTER]:'
         while True:
+            self.show_status()
             choice = self.ui_manager.ask_user_choice(
                 msg, self.main_menu, ask_exit=True)
             if choice is None:
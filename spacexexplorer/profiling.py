@@ -0,0 +1,175 @@
+"""
+Optional timers and counters of the hot paths.
+
+Instrumented code checks `profiler.enabled` before measuring anything,
+so a disabled profiler costs one attribute lookup per call.
+"""
+import json
+import time
+import functools
+import threading
+from typing import Callable
+
+
+class Timer(object):
+    """Context manager adding its elapsed time to a profiler operation"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+
+
+class NullTimer(object):
+    """Timer used while the profiler is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "NullTimer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+class Profiler(object):
+    """
+    Collects the number of calls, total and maximum time of operations
+    and free-form counters such as bytes read or cache hits
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.timers: dict = {}
+        self.counters: dict = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self.lock:
+            self.timers.clear()
+            self.counters.clear()
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Adds one call of an operation that took `seconds`
+        """
+        with self.lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                timer[2] = max(timer[2], seconds)
+
+    def add(self, name: str, value: float = 1) -> None:
+        """
+        Increments a counter
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def timer(self, name: str):
+        """
+        Returns a context manager timing the operation `name`
+        """
+        if not self.enabled:
+            return NULL_TIMER
+        return Timer(self, name)
+
+    def timed(self, name: str) -> Callable:
+        """
+        Decorator timing every call of a function as the operation `name`
+        """
+        def decorator(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> dict:
+        """
+        Returns a copy of the collected measurements
+        """
+        with self.lock:
+            operations = {name: {"calls": calls, "seconds": total, "max_seconds": longest}
+                          for name, (calls, total, longest) in self.timers.items()}
+            counters = dict(self.counters)
+        return {"operations": operations, "counters": counters}
+
+    def summary(self) -> str:
+        """
+        Returns a human readable table of the measurements
+        """
+        data = self.snapshot()
+        lines = [f"{'operation':<32} {'calls':>8} {'total s':>10} {'mean ms':>10} {'max ms':>10}"]
+        for name, op in sorted(data["operations"].items(),
+                               key=lambda item: -item[1]["seconds"]):
+            lines.append(f"{name:<32} {op['calls']:>8} {op['seconds']:>10.4f} "
+                         f"{op['seconds'] / op['calls'] * 1000:>10.3f} "
+                         f"{op['max_seconds'] * 1000:>10.3f}")
+        if data["counters"]:
+            lines.append("")
+            lines.append(f"{'counter':<32} {'value':>10}")
+            for name, value in sorted(data["counters"].items()):
+                lines.append(f"{name:<32} {value:>10g}")
+        return "\n".join(lines)
+
+    def to_prometheus(self, prefix: str = "spacexexplorer") -> str:
+        """
+        Returns the measurements in the Prometheus text exposition format
+        """
+        data = self.snapshot()
+        lines = []
+        for metric, key, kind in ((f"{prefix}_operation_calls_total", "calls", "counter"),
+                                  (f"{prefix}_operation_seconds_total", "seconds", "counter"),
+                                  (f"{prefix}_operation_max_seconds", "max_seconds", "gauge")):
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, op in sorted(data["operations"].items()):
+                lines.append(f'{metric}{{operation="{name}"}} {op[key]}')
+        metric = f"{prefix}_counter_total"
+        lines.append(f"# TYPE {metric} counter")
+        for name, value in sorted(data["counters"].items()):
+            lines.append(f'{metric}{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """
+        Writes the measurements to `path`, in the Prometheus
+        format for a `.prom` file and as JSON otherwise
+        """
+        with open(path, 'w') as f:
+            if str(path).endswith(".prom"):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.snapshot(), f, indent='    ')
+
+
+# shared by the whole package, enabled with `spacexexplorer --profile`
+profiler = Profiler()
@@ -0,0 +1,221 @@
+"""
+Indexed queries over the launch list.
+"""
+import bisect
+from typing import Any, Optional, Sequence
+
+EMPTY: frozenset = frozenset()
+
+
+def launch_year(launch: dict) -> Optional[int]:
+    date = launch.get("date_utc")
+    return int(date[:4]) if date else None
+
+
+def launch_month(launch: dict) -> Optional[int]:
+    date = launch.get("date_utc")
+    return int(date[5:7]) if date else None
+
+
+class LaunchIndex(object):
+    """
+    Hash indexes on the most used launch fields plus sorted
+    date and flight number indexes for range predicates
+    """
+
+    indexed_fields = ("rocket", "launchpad", "success", "upcoming")
+    derived_fields = {"year": launch_year, "month": launch_month}
+
+    def __init__(self, launches: Sequence):
+        self.launches = launches
+        self.hash_indexes: dict = {field: {} for field in self.indexed_fields}
+        for field in self.derived_fields:
+            self.hash_indexes[field] = {}
+        self.dates: list = []
+        self.date_positions: list = []
+        self.flights: list = []
+        self.flight_positions: list = []
+        self.ids: dict = {}
+        dates = []
+        flights = []
+        for position, launch in enumerate(launches):
+            self.index_fields(position, launch)
+            if launch.get("date_utc") is not None:
+                dates.append((launch["date_utc"], position))
+            if launch.get("flight_number") is not None:
+                flights.append((launch["flight_number"], position))
+        dates.sort()
+        flights.sort()
+        self.dates = [date for date, _ in dates]
+        self.date_positions = [position for _, position in dates]
+        self.flights = [flight for flight, _ in flights]
+        self.flight_positions = [position for _, position in flights]
+
+    def index_fields(self, position: int, launch: dict) -> None:
+        """
+        Adds a launch to the hash indexes
+        """
+        if launch.get("id") is not None:
+            self.ids[launch["id"]] = position
+        for field in self.indexed_fields:
+            if field in launch:
+                self.hash_indexes[field].setdefault(launch[field], set()).add(position)
+        for field, derive in self.derived_fields.items():
+            value = derive(launch)
+            if value is not None:
+                self.hash_indexes[field].setdefault(value, set()).add(position)
+
+    def add(self, position: int, launch: dict) -> None:
+        """
+        Adds a single launch to every index
+        """
+        self.index_fields(position, launch)
+        for values, positions, value in ((self.dates, self.date_positions, launch.get("date_utc")),
+                                         (self.flights, self.flight_positions, launch.get("flight_number"))):
+            if value is not None:
+                i = bisect.bisect_right(values, value)
+                values.insert(i, value)
+                positions.insert(i, position)
+
+    def remove(self, position: int, launch: dict) -> None:
+        """
+        Removes a single launch from every index
+        """
+        if self.ids.get(launch.get("id")) == position:
+            del self.ids[launch["id"]]
+        for field in self.hash_indexes:
+            value = self.derived_fields[field](launch) if field in self.derived_fields else launch.get(field)
+            self.hash_indexes[field].get(value, set()).discard(position)
+        for values, positions, value in ((self.dates, self.date_positions, launch.get("date_utc")),
+                                         (self.flights, self.flight_positions, launch.get("flight_number"))):
+            if value is None:
+                continue
+            i = bisect.bisect_left(values, value)
+            while i < len(values) and values[i] == value:
+                if positions[i] == position:
+                    del values[i]
+                    del positions[i]
+                    break
+                i += 1
+
+    def last_finished_date(self) -> Optional[str]:
+        """
+        Returns the latest `date_utc` of a launch that is not upcoming
+        """
+        upcoming = self.hash_indexes["upcoming"].get(True, EMPTY)
+        for i in range(len(self.dates) - 1, -1, -1):
+            if self.date_positions[i] not in upcoming:
+                return self.dates[i]
+        return None
+
+    def date_range(self, since: Any = None, until: Any = None) -> tuple:
+        """
+        Returns the slice bounds in the date index for `since <= date < until`
+        """
+        low = 0 if since is None else bisect.bisect_left(self.dates, str(since))
+        high = len(self.dates) if until is None else bisect.bisect_left(self.dates, str(until))
+        return low, max(low, high)
+
+    def flight_range(self, min_flight: Any = None, max_flight: Any = None) -> tuple:
+        """
+        Returns the slice bounds in the flight index for `min <= flight <= max`
+        """
+        low = 0 if min_flight is None else bisect.bisect_left(self.flights, min_flight)
+        high = len(self.flights) if max_flight is None else bisect.bisect_right(self.flights, max_flight)
+        return low, max(low, high)
+
+    def query(self, filters: Optional[dict] = None, since: Any = None, until: Any = None,
+              min_flight: Any = None, max_flight: Any = None,
+              sort_by: Optional[str] = None, reverse: bool = False,
+              limit: Optional[int] = None, offset: int = 0,
+              ranked: Optional[list] = None) -> list:
+        """
+        Returns launches matching all equality filters and range predicates.
+        Candidates come from the most selective index, the remaining
+        predicates are checked on those candidates only.
+        With `ranked`, only those positions are candidates and the
+        launches keep their order unless `sort_by` is given.
+        """
+        filters = filters or {}
+        sets = []
+        residual = {}
+        for key, value in filters.items():
+            try:
+                sets.append(self.hash_indexes[key].get(value, EMPTY))
+            except (KeyError, TypeError):
+                residual[key] = value
+        ranges = []
+        has_dates = since is not None or until is not None
+        has_flights = min_flight is not None or max_flight is not None
+        if has_dates:
+            ranges.append((self.date_positions,) + self.date_range(since, until))
+        if has_flights:
+            ranges.append((self.flight_positions,) + self.flight_range(min_flight, max_flight))
+        sets.sort(key=len)
+        ranges.sort(key=lambda r: r[2] - r[1])
+        if ranked is not None:
+            positions = ranked
+        elif ranges and (not sets or ranges[0][2] - ranges[0][1] < len(sets[0])):
+            index_positions, low, high = ranges[0]
+            positions = sorted(index_positions[low:high])
+        elif sets:
+            positions = sorted(sets.pop(0))
+        else:
+            positions = range(len(self.launches))
+        if sets:
+            positions = [p for p in positions if all(p in s for s in sets)]
+        end = None if limit is None else offset + limit
+        # without sorting the scan can stop as soon as the page is full
+        stop = end if sort_by is None and not reverse else None
+        launches = []
+        for position in positions:
+            launch = self.launches[position]
+            if has_dates and not self.in_dates(launch, since, until):
+                continue
+            if has_flights and not self.in_flights(launch, min_flight, max_flight):
+                continue
+            if any(launch.get(key) != value for key, value in residual.items()):
+                continue
+            launches.append(launch)
+            if stop is not None and len(launches) >= stop:
+                break
+        if sort_by is not None:
+            launches.sort(key=lambda launch: (launch.get(sort_by) is None,
+                                              launch.get(sort_by)),
+                          reverse=reverse)
+        elif reverse:
+            launches.reverse()
+        return launches[offset:end]
+
+    @classmethod
+    def matches(cls, launch: dict, filters: Optional[dict] = None,
+                since: Any = None, until: Any = None,
+                min_flight: Any = None, max_flight: Any = None) -> bool:
+        """
+        Checks the predicates of query on a single launch without any index
+        """
+        for key, value in (filters or {}).items():
+            derive = cls.derived_fields.get(key)
+            if (derive(launch) if derive else launch.get(key)) != value:
+                return False
+        if (since is not None or until is not None) \
+                and not cls.in_dates(launch, since, until):
+            return False
+        if (min_flight is not None or max_flight is not None) \
+                and not cls.in_flights(launch, min_flight, max_flight):
+            return False
+        return True
+
+    @staticmethod
+    def in_dates(launch: dict, since: Any, until: Any) -> bool:
+        date = launch.get("date_utc")
+        if date is None:
+            return False
+        return (since is None or date >= str(since)) and (until is None or date < str(until))
+
+    @staticmethod
+    def in_flights(launch: dict, min_flight: Any, max_flight: Any) -> bool:
+        flight = launch.get("flight_number")
+        if flight is None:
+            return False
+        return (min_flight is None or flight >= min_flight) and (max_flight is None or flight <= max_flight)
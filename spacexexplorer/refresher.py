@@ -0,0 +1,68 @@
+"""
+Background refresh of the SpaceX data.
+"""
+import threading
+from typing import Callable, Optional
+
+from spacexexplorer.info_manager import InfoManager
+
+
+class BackgroundRefresher(threading.Thread):
+    """
+    Worker thread that periodically revalidates the data into a new
+    snapshot and swaps it into the InfoManager used by the UI
+    when anything changed
+    """
+
+    def __init__(self, info_manager: InfoManager, interval: float, **fetch_args):
+        super().__init__(name="spacexexplorer-refresher", daemon=True)
+        self.info_manager = info_manager
+        self.interval = interval
+        self.fetch_args = fetch_args
+        self.listeners: list = []
+        self.stopped = threading.Event()
+        self.refreshing = threading.Event()
+        self.last_error: Optional[BaseException] = None
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """
+        Registers a function called after every refresh that changed the data
+        """
+        self.listeners.append(callback)
+
+    def refresh(self) -> bool:
+        """
+        Fetches a new snapshot and swaps it in if any file changed,
+        returns True if every endpoint was revalidated. Endpoints that
+        failed keep their stored data and the error is kept in `last_error`.
+        """
+        self.refreshing.set()
+        try:
+            snapshot = self.info_manager.refreshed(**self.fetch_args)
+        except (Exception, SystemExit) as error:
+            # keep serving the current data, the next refresh may succeed
+            self.last_error = error
+            return False
+        finally:
+            self.refreshing.clear()
+        self.last_error = next(iter(snapshot.fetch_errors.values()), None)
+        if not snapshot.updated:
+            # same data, the current snapshot and what was derived from it stay
+            with self.info_manager.lock:
+                self.info_manager.fetched_at = snapshot.fetched_at
+                self.info_manager.fetch_errors = snapshot.fetch_errors
+            return self.last_error is None
+        self.info_manager.adopt(snapshot)
+        for listener in self.listeners:
+            listener()
+        return self.last_error is None
+
+    def run(self) -> None:
+        # spacexpy needs an event loop in the thread that creates it
+        import asyncio
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        while not self.stopped.wait(self.interval):
+            self.refresh()
+
+    def stop(self) -> None:
+        self.stopped.set()
@@ -0,0 +1,29 @@
+"""
+Records of the static endpoints by id.
+"""
+from typing import Any, Iterable, Optional
+
+
+class EntityRegistry(object):
+    """
+    Maps the id of every rocket, launchpad or landpad to its record,
+    filled once when the static files are loaded
+    """
+
+    def __init__(self):
+        self.entities: dict = {}
+
+    def add(self, kind: str, records: Iterable[dict]) -> None:
+        """
+        Replaces all records of a kind, e.g. "rockets"
+        """
+        self.entities[kind] = {record["id"]: record for record in records}
+
+    def get(self, kind: str, entity_id: Any) -> Optional[dict]:
+        return self.entities.get(kind, {}).get(entity_id)
+
+    def ids(self, kind: str) -> list:
+        return list(self.entities.get(kind, {}))
+
+    def __contains__(self, kind: str) -> bool:
+        return kind in self.entities
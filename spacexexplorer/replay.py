@@ -0,0 +1,257 @@
+"""
+Replays scripted menu sessions against one shared InfoManager to time
+the interactive paths end to end, without network access:
+
+    python -m spacexexplorer.replay --size 20000 --sessions 200 --workers 8
+    python -m spacexexplorer.replay --record session.json --sessions 1
+    python -m spacexexplorer.replay --script session.json --processes
+
+A session is the list of answers a user types, from the main menu until
+'e'. Sessions are generated from the menus or read from a JSON file,
+the time of every main menu action is reported as percentiles.
+"""
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+from spacexexplorer.cache import StaticCache
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.main_manager import MainManager, MenuItem
+from spacexexplorer.search import tokenize
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset
+from spacexexplorer.textui_manager import TextUIManager
+
+PERCENTILES = (50, 90, 99)
+
+
+class ScriptedInput(object):
+    """
+    Returns the answers of a session one by one,
+    raises EOFError like input() once they are exhausted
+    """
+
+    def __init__(self, answers: Iterable[str]):
+        self.answers = iter(answers)
+
+    def __call__(self) -> str:
+        try:
+            return next(self.answers)
+        except StopIteration:
+            raise EOFError('End of the session') from None
+
+
+class NullOutput(io.TextIOBase):
+    """Output stream counting the characters written to it"""
+
+    def __init__(self):
+        super().__init__()
+        self.written = 0
+
+    def write(self, text: str) -> int:
+        self.written += len(text)
+        return len(text)
+
+
+def generate_session(main: MainManager, rng: random.Random, actions: int = 5) -> list:
+    """
+    Returns the answers of a user opening `actions` random main menu
+    entries, with valid answers for the menus they lead to
+    """
+    answers = []
+    launches = main.info_manager.get("launches")
+    for _ in range(actions):
+        choice = rng.randrange(len(main.main_menu))
+        answers.append(str(choice))
+        action = main.main_menu[choice].call_function
+        if action == main.show_launches_menu:
+            item = rng.randrange(len(main.launches_menu))
+            answers.append(str(item))
+            found = len(main.launches_menu[item]())
+            if found:
+                answers.append(str(rng.randrange(min(found, main.ui_manager.page_size))))
+        elif action == main.show_rockets_menu:
+            answers.append(str(rng.randrange(len(main.rockets_menu))))
+        elif action == main.show_launchpads_menu:
+            answers.append(str(rng.randrange(len(main.launchpads_menu))))
+        elif action == main.show_search:
+            words = tokenize(launches[rng.randrange(len(launches))].get("name"))
+            text = rng.choice(words) if words else "falcon"
+            answers.append(text)
+            if main.info_manager.search(text, limit=1):
+                answers.append("0")
+    answers.append(main.ui_manager.exit_symbol)
+    return answers
+
+
+def timed_menu(menu: list, timings: list) -> list:
+    """
+    Returns the menu with every action appending (name, seconds) to `timings`
+    """
+    def timed(name: str, function: Callable) -> Callable:
+        def run(*args, **kwargs) -> Any:
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timings.append((name, time.perf_counter() - start))
+        return run
+    return [MenuItem(item.display_name, timed(item.display_name, item.call_function),
+                     item.arguments)
+            for item in menu]
+
+
+def run_session(info_manager: InfoManager, answers: list) -> list:
+    """
+    Plays one session through MainManager.main_loop,
+    returns (action, seconds) for every main menu action
+    """
+    ui_manager = TextUIManager()
+    ui_manager.reader = ScriptedInput(answers)
+    ui_manager.stream = NullOutput()
+    main = MainManager(info_manager, ui_manager)
+    timings: list = []
+    main.main_menu = timed_menu(main.main_menu, timings)
+    try:
+        main.main_loop()
+    except (SystemExit, EOFError):
+        pass
+    return timings
+
+
+def percentile(ordered: list, percent: float) -> float:
+    """
+    Returns the nearest-rank percentile of sorted values
+    """
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(timings: Iterable[tuple]) -> dict:
+    """
+    Returns count, mean, percentiles and maximum in milliseconds per action
+    """
+    by_action: dict = {}
+    for name, seconds in timings:
+        by_action.setdefault(name, []).append(seconds * 1000)
+    summary = {}
+    for name, values in sorted(by_action.items()):
+        values.sort()
+        summary[name] = dict({f"p{percent}": percentile(values, percent)
+                              for percent in PERCENTILES},
+                             count=len(values), mean=sum(values) / len(values),
+                             max=values[-1])
+    return summary
+
+
+def synthetic_manager(location: str, size: int) -> InfoManager:
+    """
+    Returns an InfoManager with a synthetic dataset of `size` launches
+    stored in `location`
+    """
+    info_manager = InfoManager(cache=StaticCache(location), storage_format="jsonl",
+                               spacex=SyntheticSpaceX(make_dataset(size)))
+    info_manager.fetch_static()
+    info_manager.enricher.offline = True
+    return info_manager
+
+
+# InfoManager of a worker process, see replay
+_worker_manager: Optional[InfoManager] = None
+
+
+def start_worker(location: str) -> None:
+    global _worker_manager
+    _worker_manager = InfoManager(cache=StaticCache(location), storage_format="jsonl")
+    _worker_manager.fetch_static(offline=True)
+    _worker_manager.enricher.offline = True
+
+
+def run_worker_session(answers: list) -> list:
+    return run_session(_worker_manager, answers)
+
+
+def replay(info_manager: InfoManager, sessions: list, workers: int = 4,
+           processes: bool = False) -> dict:
+    """
+    Plays the sessions concurrently, on threads sharing `info_manager`
+    or on processes each loading the data `info_manager` stored.
+    Returns the timings summary with the wall time and sessions per second.
+    """
+    start = time.perf_counter()
+    if processes:
+        with ProcessPoolExecutor(workers, initializer=start_worker,
+                                 initargs=(str(info_manager.location),)) as pool:
+            results = list(pool.map(run_worker_session, sessions))
+    else:
+        with ThreadPoolExecutor(workers) as pool:
+            results = list(pool.map(lambda answers: run_session(info_manager, answers),
+                                    sessions))
+    elapsed = time.perf_counter() - start
+    return {"sessions": len(sessions), "workers": workers,
+            "mode": "processes" if processes else "threads",
+            "seconds": elapsed, "sessions_per_second": len(sessions) / elapsed,
+            "actions": summarize(timing for timings in results for timing in timings)}
+
+
+def format_summary(report: dict) -> str:
+    lines = [f"{report['sessions']} sessions on {report['workers']} {report['mode']} "
+             f"in {report['seconds']:.2f} s ({report['sessions_per_second']:.1f}/s)",
+             f"{'action':<26} {'count':>6} {'mean':>9} "
+             + " ".join(f"{f'p{percent}':>9}" for percent in PERCENTILES) + f" {'max':>9}"]
+    for name, stats in report["actions"].items():
+        lines.append(f"{name:<26} {stats['count']:>6} {stats['mean']:>9.2f} "
+                     + " ".join(f"{stats[f'p{percent}']:>9.2f}" for percent in PERCENTILES)
+                     + f" {stats['max']:>9.2f}")
+    lines.append("times in ms")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:  # pragma: no cover
+    parser = argparse.ArgumentParser(prog="spacexexplorer.replay",
+                                     description="Replays menu sessions and times them")
+    parser.add_argument("--size", type=int, default=2000,
+                        help="number of synthetic launches")
+    parser.add_argument("--sessions", type=int, default=100,
+                        help="number of generated sessions")
+    parser.add_argument("--actions", type=int, default=5,
+                        help="main menu actions per generated session")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="number of sessions played at the same time")
+    parser.add_argument("--processes", action="store_true",
+                        help="play the sessions on processes instead of threads")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated sessions")
+    parser.add_argument("--script", default=None,
+                        help="JSON file with a list of sessions to play instead")
+    parser.add_argument("--record", default=None,
+                        help="file the generated sessions are saved to")
+    parser.add_argument("--output", default=None, help="file the timings are saved to as JSON")
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as location:
+        info_manager = synthetic_manager(location, args.size)
+        if args.script:
+            with open(args.script) as f:
+                sessions = json.load(f)
+        else:
+            rng = random.Random(args.seed)
+            manager = MainManager(info_manager, TextUIManager())
+            sessions = [generate_session(manager, rng, args.actions)
+                        for _ in range(args.sessions)]
+        if args.record:
+            with open(args.record, "w") as f:
+                json.dump(sessions, f, indent='    ')
+        report = replay(info_manager, sessions, args.workers, args.processes)
+    print(format_summary(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent='    ')
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Reports per rocket and launchpad and statistics tables, exported
+as CSV, JSON and Markdown files.
+
+Every report is described by a job holding all of its input. Jobs are
+rendered on a process pool, each file is written atomically, and a
+manifest of job hashes lets the next export skip unchanged reports.
+"""
+import io
+import os
+import csv
+import json
+import hashlib
+import pathlib
+from typing import Iterable, Optional
+
+from spacexexplorer.storage import write_atomic
+
+REPORT_FORMATS = ("csv", "json", "md")
+# changing the rendering must change the hashes of all reports
+REPORT_VERSION = 1
+REPORTS_DIR = "reports"
+MANIFEST_NAME = "manifest.json"
+LAUNCH_COLUMNS = ["flight_number", "date_utc", "name", "rocket", "launchpad", "success"]
+# below this many jobs a process pool costs more than it saves
+MIN_PARALLEL_JOBS = 8
+
+
+def job_hash(job: dict) -> str:
+    content = json.dumps([REPORT_VERSION, job], sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def entity_jobs(kind: str, records: Iterable[dict], info: dict, launches: Iterable[dict],
+                names: dict) -> list:
+    """
+    Returns the report jobs of every rocket or launchpad with its launches,
+    `names` maps rocket and launchpad ids to the names shown in the reports
+    """
+    key = "rocket" if kind == "rockets" else "launchpad"
+    rows: dict = {}
+    for launch in launches:
+        rows.setdefault(launch.get(key), []).append(
+            [launch.get("flight_number"), launch.get("date_utc"), launch.get("name"),
+             names.get(launch.get("rocket")), names.get(launch.get("launchpad")),
+             launch.get("success")])
+    jobs = []
+    for record in records:
+        stats = info.get(record["id"], {})
+        total = stats.get("total_launches", 0)
+        summary = {"total_launches": total,
+                   "successful_launches": stats.get("successful_launches", 0),
+                   "success_rate": stats["successful_launches"] / total * 100 if total else None}
+        jobs.append({"path": f"{kind}/{record['id']}",
+                     "title": record.get("full_name") or record.get("name") or record["id"],
+                     "summary": summary,
+                     "header": LAUNCH_COLUMNS,
+                     "rows": rows.get(record["id"], [])})
+    return jobs
+
+
+def stats_jobs(launch_stats: dict, month_names: Optional[list] = None) -> list:
+    """
+    Returns the report jobs of the launches by year and by month
+    """
+    jobs = []
+    for period, counts in launch_stats.items():
+        rows = [[month_names[key - 1] if month_names and period == "months" else key, count]
+                for key, count in sorted(counts.items())]
+        jobs.append({"path": f"stats/{period}",
+                     "title": f"Launches by {period[:-1]}",
+                     "summary": {"total_launches": sum(counts.values())},
+                     "header": [period[:-1], "launches"],
+                     "rows": rows})
+    return jobs
+
+
+def render_csv(job: dict) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(job["header"])
+    writer.writerows(job["rows"])
+    return out.getvalue()
+
+
+def render_json(job: dict) -> str:
+    return json.dumps({"title": job["title"], "summary": job["summary"],
+                       "rows": [dict(zip(job["header"], row)) for row in job["rows"]]},
+                      indent='    ')
+
+
+def render_markdown(job: dict) -> str:
+    def cell(value) -> str:
+        if value is None:
+            return "-"
+        if isinstance(value, float):
+            return f"{value:.1f}"
+        return str(value).replace("|", "\\|")
+    lines = [f"# {job['title']}", ""]
+    lines.extend(f"- {key.replace('_', ' ').capitalize()}: {cell(value)}"
+                 for key, value in job["summary"].items())
+    lines.append("")
+    lines.append("| " + " | ".join(job["header"]) + " |")
+    lines.append("|" + "---|" * len(job["header"]))
+    lines.extend("| " + " | ".join(cell(value) for value in row) + " |" for row in job["rows"])
+    return "\n".join(lines) + "\n"
+
+
+RENDERERS = {"csv": render_csv, "json": render_json, "md": render_markdown}
+
+
+def render_job(destination: str, job: dict) -> str:
+    """
+    Writes the files of one report, returns its path
+    """
+    base = pathlib.Path(destination) / job["path"]
+    base.parent.mkdir(parents=True, exist_ok=True)
+    for fmt in REPORT_FORMATS:
+        write_atomic(base.with_name(f"{base.name}.{fmt}"), RENDERERS[fmt](job))
+    return job["path"]
+
+
+def export_reports(destination: pathlib.Path, jobs: list,
+                   workers: Optional[int] = None) -> dict:
+    """
+    Renders the reports whose input changed since the last export into
+    `destination`, on `workers` processes (all cores by default), and
+    removes the reports that are no longer exported.
+    Returns the number of written and skipped reports.
+    """
+    destination = pathlib.Path(destination)
+    destination.mkdir(parents=True, exist_ok=True)
+    manifest_path = destination / MANIFEST_NAME
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    hashes = {job["path"]: job_hash(job) for job in jobs}
+    changed = [job for job in jobs
+               if manifest.get(job["path"]) != hashes[job["path"]]
+               or not all((destination / f"{job['path']}.{fmt}").exists()
+                          for fmt in REPORT_FORMATS)]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(changed) >= MIN_PARALLEL_JOBS:
+        # multiprocessing is only imported by exports, not by every run
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(min(workers, len(changed))) as pool:
+            # chunks amortize the transfer of many small jobs
+            chunksize = max(1, len(changed) // (4 * workers))
+            list(pool.map(render_job, [str(destination)] * len(changed), changed,
+                          chunksize=chunksize))
+    else:
+        for job in changed:
+            render_job(str(destination), job)
+    for path in set(manifest) - set(hashes):
+        for fmt in REPORT_FORMATS:
+            (destination / f"{path}.{fmt}").unlink(missing_ok=True)
+    write_atomic(manifest_path, json.dumps(hashes, indent='    ', sort_keys=True))
+    return {"written": len(changed), "skipped": len(jobs) - len(changed)}
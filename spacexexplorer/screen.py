@@ -0,0 +1,95 @@
+"""
+Terminal output helpers: ANSI control sequences, in-place redraws and
+text charts.
+"""
+from typing import Iterable, Optional
+
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+CLEAR_LINE = "\r\x1b[2K"
+CLEAR_BELOW = "\x1b[J"
+# ASCII levels of a sparkline, from the lowest value to the highest
+SPARK_LEVELS = "_.-~=+*#"
+
+
+def cursor_up(lines: int) -> str:
+    return f"\x1b[{lines}A" if lines > 0 else ""
+
+
+def cursor_down(lines: int) -> str:
+    return f"\x1b[{lines}B" if lines > 0 else ""
+
+
+class Screen(object):
+    """
+    Block of lines on a terminal that is redrawn in place,
+    only the lines that changed since the last frame are written again.
+    Lines are expected to fit in the width of the terminal.
+    """
+
+    def __init__(self):
+        self.previous: Optional[list] = None
+
+    def render(self, lines: list, below: int = 0) -> str:
+        """
+        Returns the text drawing `lines` over the previous frame.
+        `below` is the number of lines written after that frame,
+        e.g. an echoed answer, they are erased.
+        """
+        previous = self.previous
+        self.previous = list(lines)
+        if previous is None:
+            return "".join(line + "\n" for line in lines)
+        parts = [cursor_up(len(previous) + below)]
+        unchanged = 0
+        for number, line in enumerate(lines):
+            if number < len(previous) and previous[number] == line:
+                unchanged += 1
+                continue
+            parts.append(cursor_down(unchanged))
+            unchanged = 0
+            parts.append(CLEAR_LINE + line + "\n")
+        parts.append(cursor_down(unchanged))
+        parts.append(CLEAR_BELOW)
+        return "".join(parts)
+
+
+def bar_chart(items: Iterable[tuple], width: int = 50,
+              symbol: str = "#", rest: str = "-") -> list:
+    """
+    Returns one line per (label, value) with a bar proportional to the
+    value. Items may be (label, value, part): only `part` of the bar is
+    drawn with `symbol`, the remainder with `rest`.
+    """
+    rows = []
+    label_width = 0
+    value_width = 0
+    top = 0
+    for item in items:
+        label, value = str(item[0]), item[1]
+        part = item[2] if len(item) > 2 else value
+        text = f"{value:g}"
+        rows.append((label, value, part, text))
+        label_width = max(label_width, len(label))
+        value_width = max(value_width, len(text))
+        top = max(top, value)
+    lines = []
+    for label, value, part, text in rows:
+        length = round(value / top * width) if top > 0 else 0
+        filled = round(part / top * width) if top > 0 else 0
+        bar = symbol * filled + rest * (length - filled)
+        lines.append(f"{label.rjust(label_width)} |{bar.ljust(width)}| {text.rjust(value_width)}")
+    return lines
+
+
+def sparkline(values: Iterable[float]) -> str:
+    """
+    Returns one character per value, higher values get denser characters
+    """
+    values = list(values)
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    span = high - low
+    top = len(SPARK_LEVELS) - 1
+    return "".join(SPARK_LEVELS[round((value - low) / span * top) if span else top // 2]
+                   for value in values)
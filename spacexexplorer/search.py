@@ -0,0 +1,125 @@
+"""
+Inverted full-text index over launch and entity descriptions.
+"""
+import re
+import math
+import bisect
+import heapq
+from typing import Any, Iterable, List, Optional, Tuple
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> list:
+    return TOKEN.findall(text.lower()) if text else []
+
+
+class SearchIndex(object):
+    """
+    Maps every token to the documents containing it with a tf-idf score.
+    Documents are added as (key, [(text, weight), ...]); the last word of
+    a query also matches every token starting with it.
+    """
+
+    def __init__(self, documents: Iterable[Tuple[Any, list]]):
+        counts: dict = {}
+        size = 0
+        for key, fields in documents:
+            size += 1
+            for text, weight in fields:
+                for token in tokenize(text):
+                    postings = counts.setdefault(token, {})
+                    postings[key] = postings.get(key, 0) + weight
+        self.size = size
+        self.postings: dict = {}
+        for token, postings in counts.items():
+            idf = math.log(1 + size / len(postings))
+            self.postings[token] = {key: weight * idf for key, weight in postings.items()}
+        self.vocabulary = sorted(self.postings)
+        # documents of a token by decreasing score, sorted on first use
+        self.impact_order: dict = {}
+
+    def expand(self, prefix: str) -> list:
+        """
+        Returns the indexed tokens starting with `prefix`
+        """
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + "\uffff", start)
+        return self.vocabulary[start:end]
+
+    def term_postings(self, tokens: list) -> dict:
+        if len(tokens) == 1:
+            return self.postings[tokens[0]]
+        merged: dict = {}
+        for token in tokens:
+            for key, score in self.postings[token].items():
+                if score > merged.get(key, 0):
+                    merged[key] = score
+        return merged
+
+    def search(self, text: str, limit: Optional[int] = None,
+               prefix: bool = True) -> List[Tuple[Any, float]]:
+        """
+        Returns (key, score) of the documents containing every word
+        of `text`, best first
+        """
+        terms = tokenize(text)
+        if not terms:
+            return []
+        groups = []
+        for position, term in enumerate(terms):
+            if prefix and position == len(terms) - 1 and not text[-1:].isspace():
+                tokens = self.expand(term)
+            else:
+                tokens = [term] if term in self.postings else []
+            if not tokens:
+                return []
+            groups.append(tokens)
+        if len(groups) == 1 and len(groups[0]) == 1 and limit is not None:
+            return self.best(groups[0][0], limit)
+        postings = sorted((self.term_postings(tokens) for tokens in groups), key=len)
+        smallest, others = postings[0], postings[1:]
+        scores = []
+        for key, score in smallest.items():
+            for other in others:
+                extra = other.get(key)
+                if extra is None:
+                    break
+                score += extra
+            else:
+                scores.append((key, score))
+        if limit is not None:
+            return heapq.nlargest(limit, scores, key=lambda item: item[1])
+        scores.sort(key=lambda item: -item[1])
+        return scores
+
+    def best(self, token: str, limit: int) -> list:
+        """
+        Returns the `limit` best documents of a single token
+        """
+        ordered = self.impact_order.get(token)
+        if ordered is None:
+            postings = self.postings[token]
+            ordered = self.impact_order[token] = sorted(postings.items(),
+                                                        key=lambda item: -item[1])
+        return ordered[:limit]
+
+
+def launch_documents(launches: Iterable[dict]) -> Iterable[Tuple[int, list]]:
+    """
+    Yields the searchable text of every launch by position
+    """
+    for position, launch in enumerate(launches):
+        yield position, [(launch.get("name"), 3), (launch.get("details"), 1)]
+
+
+def entity_documents(registry: Any, kinds: Iterable[str]) -> Iterable[Tuple[tuple, list]]:
+    """
+    Yields the searchable text of rockets, launchpads and landpads by (kind, id)
+    """
+    for kind in kinds:
+        for entity_id in registry.ids(kind):
+            entity = registry.get(kind, entity_id)
+            yield (kind, entity_id), [(entity.get("name"), 3), (entity.get("full_name"), 3),
+                                      (entity.get("description"), 1),
+                                      (entity.get("details"), 1)]
@@ -0,0 +1,163 @@
+"""
+HTTP service answering launch queries from one shared InfoManager.
+"""
+import json
+import asyncio
+import hashlib
+from typing import Any, Callable, Optional
+
+from aiohttp import web
+
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.lru import LRUCache
+from spacexexplorer.profiling import profiler
+
+BOOLEAN_PARAMS = ("success", "upcoming", "reverse")
+INTEGER_PARAMS = ("year", "month", "min_flight", "max_flight", "limit", "offset",
+                  "flight_number")
+STRING_PARAMS = ("rocket", "launchpad", "since", "until", "sort_by", "name", "id", "text")
+
+
+class ResponseCache(LRUCache):
+    """
+    Least recently used cache of encoded responses
+    """
+
+
+def parse_launch_query(query: Any) -> dict:
+    """
+    Returns filter_launches arguments from the query string,
+    raises ValueError for unknown or malformed parameters
+    """
+    arguments: dict = {}
+    for key, value in query.items():
+        if key in BOOLEAN_PARAMS:
+            if value.lower() not in ("true", "false"):
+                raise ValueError(f"{key} must be true or false")
+            arguments[key] = value.lower() == "true"
+        elif key in INTEGER_PARAMS:
+            arguments[key] = int(value)
+        elif key in STRING_PARAMS:
+            arguments[key] = value
+        else:
+            raise ValueError(f"Unknown parameter {key}")
+    return arguments
+
+
+class QueryServer(object):
+    """
+    Serves launches, statistics, rockets and launchpads as JSON.
+    Encoded responses are kept in an LRU cache that is emptied
+    whenever the data is refreshed, clients can revalidate them
+    with their ETag.
+    """
+
+    def __init__(self, info_manager: InfoManager, cache_size: int = 256):
+        self.info_manager = info_manager
+        self.cache = ResponseCache(cache_size)
+        # event loop serving the requests, set when the app starts
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def on_refresh(self) -> None:
+        """
+        Drops the cached responses, see BackgroundRefresher.add_listener
+        """
+        if self.loop is not None and self.loop.is_running():
+            # the cache is only used from the event loop, the refresher
+            # thread leaves the clearing to it
+            self.loop.call_soon_threadsafe(self.cache.clear)
+        else:
+            self.cache.clear()
+
+    async def on_startup(self, app: web.Application) -> None:
+        self.loop = asyncio.get_running_loop()
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.on_startup.append(self.on_startup)
+        app.router.add_get("/launches", self.cached(self.launches))
+        app.router.add_get("/stats", self.cached(self.stats))
+        app.router.add_get("/analytics", self.cached(self.analytics))
+        app.router.add_get("/rockets", self.cached(self.rockets))
+        app.router.add_get("/rockets/{id}", self.cached(self.rocket))
+        app.router.add_get("/launchpads", self.cached(self.launchpads))
+        app.router.add_get("/launchpads/{id}", self.cached(self.launchpad))
+        app.router.add_get("/status", self.status)
+        return app
+
+    def cached(self, build: Callable[[web.Request], Any]) -> Callable:
+        """
+        Wraps a function returning JSON data into a handler
+        serving it from the response cache
+        """
+        async def handler(request: web.Request) -> web.Response:
+            key = (request.path, tuple(sorted(request.query.items())))
+            entry = self.cache.get(key)
+            if entry is None:
+                try:
+                    with self.info_manager.lock, profiler.timer(f"serve{request.path}"):
+                        data = build(request)
+                except ValueError as error:
+                    return web.json_response({"error": str(error)}, status=400)
+                except KeyError as error:
+                    return web.json_response({"error": f"Unknown id {error}"}, status=404)
+                body = json.dumps(data).encode()
+                entry = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+                self.cache.put(key, entry)
+            body, etag = entry
+            if etag in request.headers.get("If-None-Match", ""):
+                return web.Response(status=304, headers={"ETag": etag})
+            return web.Response(body=body, content_type="application/json",
+                                headers={"ETag": etag})
+        return handler
+
+    def launches(self, request: web.Request) -> list:
+        return list(self.info_manager.filter_launches(**parse_launch_query(request.query)))
+
+    def stats(self, request: web.Request) -> dict:
+        return {period: {str(key): value for key, value in sorted(counts.items())}
+                for period, counts in self.info_manager.launch_stats.items()}
+
+    def analytics(self, request: web.Request) -> dict:
+        return self.info_manager.analytics()
+
+    def details(self, info: dict, name: str, item_id: Optional[str] = None) -> Any:
+        """
+        Returns the registered records of a static file with their
+        launch statistics, or only the one with `item_id`
+        """
+        if item_id is not None and item_id not in info:
+            raise KeyError(item_id)
+        ids = [item_id] if item_id is not None else self.info_manager.registry.ids(name)
+        items = []
+        for entity_id in ids:
+            item = self.info_manager.entity(name, entity_id)
+            extras = info.get(entity_id, {})
+            total = extras.get("total_launches", 0)
+            items.append(dict(item,
+                              total_launches=total,
+                              successful_launches=extras.get("successful_launches", 0),
+                              success_rate=extras["successful_launches"] / total * 100
+                              if total else None))
+        return items if item_id is None else items[0]
+
+    def rockets(self, request: web.Request) -> list:
+        return self.details(self.info_manager.rocket_info, "rockets")
+
+    def rocket(self, request: web.Request) -> dict:
+        return self.details(self.info_manager.rocket_info, "rockets",
+                            request.match_info["id"])
+
+    def launchpads(self, request: web.Request) -> list:
+        return self.details(self.info_manager.launchpad_info, "launchpads")
+
+    def launchpad(self, request: web.Request) -> dict:
+        return self.details(self.info_manager.launchpad_info, "launchpads",
+                            request.match_info["id"])
+
+    async def status(self, request: web.Request) -> web.Response:
+        return web.json_response({"data_age": self.info_manager.data_age(),
+                                  "cache": self.cache.stats()})
+
+    def run(self, host: str = "127.0.0.1", port: int = 8080) -> None:  # pragma: no cover
+        web.run_app(self.make_app(), host=host, port=port)
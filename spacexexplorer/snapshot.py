@@ -0,0 +1,115 @@
+"""
+Single-file binary snapshot of a loaded dataset.
+
+Layout: MAGIC, a 4-byte little-endian header length and a JSON header,
+then a pickle (protocol 5) payload followed by its out-of-band buffers,
+which hold the launch table columns. The header records the format
+version, the offsets of every part and the SHA-256 of everything after it.
+"""
+import json
+import pickle
+import struct
+import hashlib
+import pathlib
+from array import array
+from typing import Any
+
+from spacexexplorer.columnar import CodeColumn, LaunchTable
+from spacexexplorer.storage import atomic_file
+
+MAGIC = b"SPXSNAP\0"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_NAME = "spacexexplorer.snapshot"
+TABLE_COLUMNS = ("timestamps", "years", "months", "weekdays",
+                 "successful", "finished", "landings")
+TABLE_CODES = ("rockets", "launchpads")
+
+
+class SnapshotError(ValueError):
+    """Raised for a snapshot that is truncated, corrupted or of another version"""
+
+
+def table_state(table: LaunchTable) -> dict:
+    """
+    Returns the launch table with its columns as out-of-band buffers
+    """
+    state: dict = {"columns": {}, "codes": {}}
+    for name in TABLE_COLUMNS:
+        column = getattr(table, name)
+        state["columns"][name] = (column.typecode, pickle.PickleBuffer(column))
+    for name in TABLE_CODES:
+        codes = getattr(table, name)
+        state["codes"][name] = (codes.codes.typecode, pickle.PickleBuffer(codes.codes),
+                                codes.labels)
+    return state
+
+
+def restore_table(state: dict) -> LaunchTable:
+    """
+    Rebuilds a launch table from table_state, each column is a single copy
+    """
+    table = LaunchTable()
+    for name, (typecode, buffer) in state["columns"].items():
+        column = array(typecode)
+        column.frombytes(buffer)
+        setattr(table, name, column)
+    for name, (typecode, buffer, labels) in state["codes"].items():
+        codes = CodeColumn()
+        codes.codes.frombytes(buffer)
+        codes.labels = labels
+        codes.lookup = {label: code for code, label in enumerate(labels)}
+        setattr(table, name, codes)
+    return table
+
+
+def write_snapshot(path: pathlib.Path, state: dict) -> str:
+    """
+    Writes a snapshot atomically, returns its SHA-256
+    """
+    buffers: list = []
+    payload = pickle.dumps(state, protocol=5, buffer_callback=buffers.append)
+    parts = [payload] + [buffer.raw() for buffer in buffers]
+    sha256 = hashlib.sha256()
+    offsets = []
+    offset = 0
+    for part in parts:
+        sha256.update(part)
+        offsets.append((offset, len(part)))
+        offset += len(part)
+    header = json.dumps({"version": SNAPSHOT_VERSION,
+                         "parts": offsets,
+                         "sha256": sha256.hexdigest()}).encode()
+    with atomic_file(pathlib.Path(path)) as f:
+        f.write(MAGIC + struct.pack('<I', len(header)) + header)
+        for part in parts:
+            f.write(part)
+    return sha256.hexdigest()
+
+
+def read_snapshot(path: pathlib.Path) -> dict:
+    """
+    Reads and validates a snapshot written by write_snapshot.
+    The out-of-band buffers are views of the file content, not copies.
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    if content[:len(MAGIC)] != MAGIC or len(content) < len(MAGIC) + 4:
+        raise SnapshotError(f'{path} is not a spacexexplorer snapshot')
+    start = len(MAGIC) + 4
+    (header_length,) = struct.unpack('<I', content[len(MAGIC):start])
+    try:
+        header = json.loads(content[start:start + header_length])
+    except ValueError:
+        raise SnapshotError(f'Snapshot {path} has a corrupted header')
+    if header.get("version") != SNAPSHOT_VERSION:
+        raise SnapshotError(f'Snapshot {path} has version {header.get("version")}, '
+                            f'expected {SNAPSHOT_VERSION}')
+    data = memoryview(content)[start + header_length:]
+    if hashlib.sha256(data).hexdigest() != header["sha256"]:
+        raise SnapshotError(f'Snapshot {path} is corrupted, checksum mismatch')
+    parts = [data[offset:offset + length] for offset, length in header["parts"]]
+    return pickle.loads(parts[0], buffers=parts[1:])
+
+
+def snapshot_path(location: Any) -> pathlib.Path:
+    return pathlib.Path(location) / SNAPSHOT_NAME
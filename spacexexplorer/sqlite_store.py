@@ -0,0 +1,219 @@
+"""
+Optional SQLite copy of the static data, queried with SQL.
+
+The fetched files stay the source of the data; each one is copied into
+indexed tables when it changes, in a single transaction. The database
+uses write-ahead logging so that several processes can read it while
+another one updates it.
+"""
+import json
+import sqlite3
+import pathlib
+import threading
+from typing import Any, Callable, Optional
+
+from spacexexplorer.query import LaunchIndex
+
+STORE_NAME = "spacexexplorer.sqlite"
+# launch fields with a column of their own, `year` and `month` are derived
+LAUNCH_COLUMNS = ("id", "flight_number", "name", "date_utc", "year", "month",
+                  "rocket", "launchpad", "success", "upcoming")
+INDEXED_COLUMNS = ("rocket", "launchpad", "date_utc", "year", "flight_number",
+                   "success", "upcoming")
+ENTITIES = ("landpads", "launchpads", "rockets")
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS sources (name TEXT PRIMARY KEY, signature TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS documents (name TEXT PRIMARY KEY, data TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS entities (kind TEXT NOT NULL, id TEXT NOT NULL, "
+    "position INTEGER NOT NULL, name TEXT, data TEXT NOT NULL, PRIMARY KEY (kind, id))",
+    "CREATE TABLE IF NOT EXISTS launches (position INTEGER PRIMARY KEY, id TEXT, "
+    "flight_number INTEGER, name TEXT, date_utc TEXT, year INTEGER, month INTEGER, "
+    "rocket TEXT, launchpad TEXT, success INTEGER, upcoming INTEGER, data TEXT NOT NULL)",
+] + [f"CREATE INDEX IF NOT EXISTS launches_{column} ON launches ({column})"
+     for column in INDEXED_COLUMNS]
+
+
+def launch_row(position: int, launch: dict) -> tuple:
+    date = launch.get("date_utc")
+    success = launch.get("success")
+    upcoming = launch.get("upcoming")
+    return (position, launch.get("id"), launch.get("flight_number"), launch.get("name"), date,
+            int(date[:4]) if date else None, int(date[5:7]) if date else None,
+            launch.get("rocket"), launch.get("launchpad"),
+            None if success is None else int(bool(success)),
+            None if upcoming is None else int(bool(upcoming)),
+            json.dumps(launch))
+
+
+class SQLiteStore(object):
+    """
+    Launches, rockets, launchpads and landpads in indexed tables,
+    other static files as JSON documents. Every thread has its own
+    connection.
+    """
+
+    def __init__(self, path: pathlib.Path, timeout: float = 30.0):
+        self.path = pathlib.Path(path)
+        self.timeout = timeout
+        self.local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            # transactions are started explicitly, see transaction
+            connection = sqlite3.connect(str(self.path), timeout=self.timeout,
+                                         isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                connection.execute(statement)
+            self.local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    def signature(self, name: str) -> Optional[str]:
+        row = self.connection.execute("SELECT signature FROM sources WHERE name = ?",
+                                      (name,)).fetchone()
+        return row[0] if row else None
+
+    def update(self, name: str, signature: str, load: Callable[[], Any]) -> bool:
+        """
+        Replaces the data of a static file with `load()` unless it was
+        stored with the same `signature`, returns True if it was replaced
+        """
+        if self.signature(name) == signature:
+            return False
+        self.write(name, load(), signature)
+        return True
+
+    def write(self, name: str, data: Any, signature: str = "") -> None:
+        """
+        Replaces the data of a static file in a single transaction
+        """
+        connection = self.connection
+        # takes the write lock at once, readers keep the previous data
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if name == "launches":
+                connection.execute("DELETE FROM launches")
+                connection.executemany(
+                    f"INSERT INTO launches ({', '.join(('position',) + LAUNCH_COLUMNS)}, data) "
+                    f"VALUES ({', '.join('?' * (len(LAUNCH_COLUMNS) + 2))})",
+                    (launch_row(position, launch) for position, launch in enumerate(data)))
+            elif name in ENTITIES:
+                connection.execute("DELETE FROM entities WHERE kind = ?", (name,))
+                connection.executemany(
+                    "INSERT INTO entities (kind, id, position, name, data) VALUES (?, ?, ?, ?, ?)",
+                    ((name, record["id"], position, record.get("name"), json.dumps(record))
+                     for position, record in enumerate(data)))
+            else:
+                connection.execute("INSERT OR REPLACE INTO documents (name, data) VALUES (?, ?)",
+                                   (name, json.dumps(data)))
+            connection.execute("INSERT OR REPLACE INTO sources (name, signature) VALUES (?, ?)",
+                               (name, signature))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def read(self, name: str) -> Any:
+        """
+        Returns the stored data of a static file
+        """
+        if name == "launches":
+            rows = self.connection.execute("SELECT data FROM launches ORDER BY position")
+            return [json.loads(data) for (data,) in rows]
+        if name in ENTITIES:
+            rows = self.connection.execute(
+                "SELECT data FROM entities WHERE kind = ? ORDER BY position", (name,))
+            return [json.loads(data) for (data,) in rows]
+        row = self.connection.execute("SELECT data FROM documents WHERE name = ?",
+                                      (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return json.loads(row[0])
+
+    def query_launches(self, filters: Optional[dict] = None, since: Any = None,
+                       until: Any = None, min_flight: Any = None, max_flight: Any = None,
+                       sort_by: Optional[str] = None, reverse: bool = False,
+                       limit: Optional[int] = None, offset: int = 0) -> list:
+        """
+        Same as LaunchIndex.query, the predicates on launch columns,
+        the ordering and the page are left to SQLite
+        """
+        clauses = []
+        params: list = []
+        residual = {}
+        for key, value in (filters or {}).items():
+            if key in LAUNCH_COLUMNS and (value is None or isinstance(value, (str, int))):
+                clauses.append(f"{key} IS ?")
+                params.append(value)
+            else:
+                residual[key] = value
+        for clause, value in (("date_utc >= ?", since), ("date_utc < ?", until)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(str(value))
+        for clause, value in (("flight_number >= ?", min_flight),
+                              ("flight_number <= ?", max_flight)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        sql = "SELECT data FROM launches"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        pushed = not residual and (sort_by is None or sort_by in LAUNCH_COLUMNS)
+        order = " DESC" if reverse else ""
+        if pushed and sort_by is not None:
+            # missing values last, ties in storage order as with sorted()
+            sql += f" ORDER BY {sort_by} IS NULL{order}, {sort_by}{order}, position"
+        else:
+            sql += f" ORDER BY position{order if pushed else ''}"
+        if pushed and (limit is not None or offset):
+            sql += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else limit, offset]
+        launches = [json.loads(data) for (data,) in self.connection.execute(sql, params)]
+        if pushed:
+            return launches
+        launches = [launch for launch in launches if LaunchIndex.matches(launch, residual)]
+        if sort_by is not None:
+            launches.sort(key=lambda launch: (launch.get(sort_by) is None,
+                                              launch.get(sort_by)),
+                          reverse=reverse)
+        elif reverse:
+            launches.reverse()
+        end = None if limit is None else offset + limit
+        return launches[offset:end]
+
+    def count_by(self, key: str) -> dict:
+        """
+        Counts launches per year or month, like LaunchTable.count_by
+        """
+        if key not in ("year", "month"):
+            raise KeyError(f'Cannot count launches by {key}')
+        rows = self.connection.execute(
+            f"SELECT {key}, COUNT(*) FROM launches WHERE {key} IS NOT NULL "
+            f"GROUP BY {key} ORDER BY MIN(position)")
+        return dict(rows)
+
+    def group_by(self, key: str) -> dict:
+        """
+        Returns total, successful and finished launches with the success
+        rate in percent per rocket or launchpad, like LaunchTable.group_by
+        """
+        if key not in ("rocket", "launchpad"):
+            raise KeyError(f'Cannot group launches by {key}')
+        rows = self.connection.execute(
+            f"SELECT {key}, COUNT(*), TOTAL(success = 1), COUNT(success) FROM launches "
+            f"GROUP BY {key} ORDER BY MIN(position)")
+        return {value: {"total_launches": total,
+                        "successful_launches": int(successes),
+                        "finished_launches": finished,
+                        "success_rate": successes / finished * 100 if finished else None}
+                for value, total, successes, finished in rows}
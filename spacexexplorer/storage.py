@@ -0,0 +1,208 @@
+"""
+Streaming read and write of the static data files.
+"""
+import os
+import re
+import json
+import codecs
+import hashlib
+import pathlib
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Iterable, Iterator
+
+from spacexexplorer.profiling import profiler
+
+# "json" is an indented JSON document, "jsonl" stores one compact record per line
+FORMATS = ("json", "jsonl")
+SEPARATORS = re.compile(r'[\s,]*')
+# numbers the temporary files of this process, see temp_path
+_temp_numbers = itertools.count()
+
+
+def data_path(location: pathlib.Path, name: str, fmt: str = "json") -> pathlib.Path:
+    """
+    Returns the file holding a static endpoint in the given format
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown storage format {fmt}, use one of {FORMATS}')
+    return pathlib.Path(location) / f'{name}.{fmt}'
+
+
+def temp_path(path: pathlib.Path) -> pathlib.Path:
+    """
+    Returns a temporary file next to `path` that no other writer uses,
+    e.g. another run sharing the cache from cron
+    """
+    path = pathlib.Path(path)
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}."
+                          f"{next(_temp_numbers)}.tmp")
+
+
+@contextmanager
+def atomic_file(path: pathlib.Path) -> Iterator[BinaryIO]:
+    """
+    Yields a binary file that replaces `path` once it is written,
+    readers see either the old or the new content
+    """
+    tmp_path = temp_path(path)
+    try:
+        with open(tmp_path, 'wb') as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_atomic(path: pathlib.Path, content: Any) -> None:
+    """
+    Replaces a file with text or bytes at once
+    """
+    with atomic_file(path) as f:
+        f.write(content.encode() if isinstance(content, str) else content)
+
+
+class JSONArrayStream(object):
+    """
+    Incremental decoder returning the items of a JSON array
+    as soon as the bytes holding them arrive
+    """
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.started = False
+        self.done = False
+
+    def feed(self, chunk: bytes) -> list:
+        """
+        Adds a chunk of the document, returns the items completed by it
+        """
+        self.buffer += self.text_decoder.decode(chunk)
+        items = []
+        pos = 0
+        while not self.done:
+            pos = SEPARATORS.match(self.buffer, pos).end()
+            if pos == len(self.buffer):
+                break
+            if not self.started:
+                if self.buffer[pos] != '[':
+                    raise ValueError('Expected a JSON array')
+                self.started = True
+                pos += 1
+                continue
+            if self.buffer[pos] == ']':
+                self.done = True
+                break
+            try:
+                item, end = self.decoder.raw_decode(self.buffer, pos)
+            except json.JSONDecodeError:
+                break
+            if end == len(self.buffer) and not isinstance(item, (dict, list)):
+                # a number or literal may continue in the next chunk
+                break
+            items.append(item)
+            pos = end
+        self.buffer = self.buffer[pos:]
+        return items
+
+    def close(self) -> None:
+        if not self.done:
+            raise ValueError('JSON array is truncated')
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yields the items of a JSON array read chunk by chunk
+    """
+    stream = JSONArrayStream()
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+    stream.close()
+
+
+class RecordWriter(object):
+    """
+    Writes records one at a time into a temporary file that replaces
+    the target file on commit, hashing the content on the way
+    """
+
+    def __init__(self, path: pathlib.Path, fmt: str = "json"):
+        self.path = pathlib.Path(path)
+        self.fmt = fmt
+        self.tmp_path = temp_path(self.path)
+        self.file = open(self.tmp_path, 'wb')
+        self.sha256 = hashlib.sha256()
+        self.count = 0
+        if fmt == "json":
+            self.write_bytes(b'[')
+
+    def write_bytes(self, data: bytes) -> None:
+        self.file.write(data)
+        self.sha256.update(data)
+
+    def write(self, record: Any) -> None:
+        if self.fmt == "jsonl":
+            text = json.dumps(record, separators=(',', ':')) + '\n'
+        else:
+            # same layout as json.dump(records, f, indent='    ')
+            text = (',\n    ' if self.count else '\n    ') + \
+                json.dumps(record, indent='    ').replace('\n', '\n    ')
+        self.write_bytes(text.encode())
+        self.count += 1
+
+    def commit(self) -> str:
+        """
+        Moves the written file into place, returns its SHA-256
+        """
+        if self.fmt == "json":
+            self.write_bytes(b'\n]' if self.count else b']')
+        profiler.add("bytes_written", self.file.tell())
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+        return self.sha256.hexdigest()
+
+    def abort(self) -> None:
+        self.file.close()
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+@profiler.timed("write_data")
+def write_data(path: pathlib.Path, data: Any, fmt: str = "json") -> str:
+    """
+    Writes a static endpoint, returns the SHA-256 of the file.
+    Only lists can be stored as JSON Lines.
+    """
+    if isinstance(data, list):
+        with RecordWriter(path, fmt) as writer:
+            for record in data:
+                writer.write(record)
+        return writer.sha256.hexdigest()
+    path = pathlib.Path(path)
+    content = json.dumps(data, indent='    ').encode()
+    profiler.add("bytes_written", len(content))
+    write_atomic(path, content)
+    return hashlib.sha256(content).hexdigest()
+
+
+def load_data(path: pathlib.Path, fmt: str = "json") -> Any:
+    """
+    Reads a static endpoint written by write_data
+    """
+    with open(path, 'r') as f:
+        if fmt == "jsonl":
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
@@ -0,0 +1,241 @@
+"""
+Offline stand-ins for the SpaceX API serving synthetic datasets,
+used by the tests and the benchmarks.
+"""
+import random
+import asyncio
+import datetime
+import threading
+from typing import Any, Optional
+
+ROCKET_NAMES = ["Falcon 1", "Falcon 9", "Falcon Heavy", "Starship"]
+LAUNCHPAD_NAMES = ["Kwajalein Atoll Omelek Island", "Cape Canaveral SLC 40",
+                   "Kennedy Space Center LC 39A", "Vandenberg SLC 4E",
+                   "Boca Chica Starbase", "Vandenberg SLC 3W"]
+LANDPAD_NAMES = ["LZ-1", "LZ-2", "LZ-4", "OCISLY", "JRTI", "ASOG"]
+WORDS = ["orbit", "satellite", "crew", "cargo", "dragon", "starlink", "resupply",
+         "demo", "geostationary", "polar", "rideshare", "booster", "landing",
+         "mission", "station", "payload", "fairing", "recovery", "test", "flight"]
+FIRST_LAUNCH = datetime.datetime(2006, 3, 24, 22, 30)
+
+
+def make_id(kind: str, number: int) -> str:
+    """
+    Returns a stable 24 character id like the ones of the SpaceX API
+    """
+    return f"{kind[:4]}{number:020x}"
+
+
+def make_dataset(launches: int = 200, seed: int = 0, upcoming: int = 5) -> dict:
+    """
+    Returns synthetic data for every static endpoint,
+    the last `upcoming` launches have no outcome yet
+    """
+    rng = random.Random(seed)
+    rockets = [{"id": make_id("rocket", n), "name": name, "type": "rocket",
+                "active": n > 0, "stages": 2, "success_rate_pct": 90,
+                "description": f"{name} is a {rng.choice(WORDS)} {rng.choice(WORDS)} rocket."}
+               for n, name in enumerate(ROCKET_NAMES)]
+    launchpads = [{"id": make_id("launchpad", n), "name": name.split()[-1],
+                   "full_name": name, "locality": "Somewhere", "region": "Earth",
+                   "status": "active", "launch_attempts": 0, "launch_successes": 0,
+                   "details": f"{name} hosts {rng.choice(WORDS)} launches."}
+                  for n, name in enumerate(LAUNCHPAD_NAMES)]
+    landpads = [{"id": make_id("landpad", n), "name": name, "full_name": name,
+                 "type": "ASDS" if n > 2 else "RTLS", "status": "active",
+                 "landing_attempts": 0, "landing_successes": 0,
+                 "details": f"{name} recovers boosters."}
+                for n, name in enumerate(LANDPAD_NAMES)]
+    items = []
+    date = FIRST_LAUNCH
+    cores: list = []
+    for number in range(launches):
+        date += datetime.timedelta(hours=rng.randint(12, 24 * 20))
+        pending = number >= launches - upcoming
+        if cores and rng.random() < 0.6:
+            core = rng.choice(cores)
+        else:
+            core = {"id": make_id("core", len(cores)), "flights": 0}
+            cores.append(core)
+        core["flights"] += 1
+        landing_attempt = rng.random() < 0.8
+        items.append({
+            "id": make_id("launch", number),
+            "flight_number": number + 1,
+            "name": f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {number + 1}",
+            "date_utc": date.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "date_unix": int((date - datetime.datetime(1970, 1, 1)).total_seconds()),
+            "date_local": date.strftime("%Y-%m-%dT%H:%M:%S-04:00"),
+            "rocket": rng.choice(rockets)["id"],
+            "launchpad": rng.choice(launchpads)["id"],
+            "success": None if pending else rng.random() < 0.9,
+            "upcoming": pending,
+            "details": " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12))),
+            "payloads": [make_id("payload", number)],
+            "crew": [{"crew": make_id("crew", number % 8), "role": "Commander"}]
+            if number % 10 == 9 else [],
+            "ships": [make_id("ship", number % 3)] if landing_attempt else [],
+            "cores": [{"core": core["id"], "flight": core["flights"],
+                       "reused": core["flights"] > 1,
+                       "landing_attempt": landing_attempt and not pending,
+                       "landing_success": (rng.random() < 0.9) if landing_attempt and not pending else None,
+                       "landpad": rng.choice(landpads)["id"] if landing_attempt else None}],
+        })
+    company = {"name": "SpaceX", "founded": 2002, "employees": 12000,
+               "vehicles": len(rockets), "ceo": "Elon Musk",
+               "summary": "Synthetic company data.",
+               "headquarters": {"city": "Hawthorne"}, "links": {}}
+    return {"company": company, "landpads": landpads, "launchpads": launchpads,
+            "rockets": rockets, "launches": items}
+
+
+def make_related(dataset: dict) -> dict:
+    """
+    Returns the payloads, cores, crew and ships the launches refer to
+    """
+    related: dict = {"payloads": {}, "cores": {}, "crew": {}, "ships": {}}
+    for launch in dataset["launches"]:
+        for payload in launch.get("payloads") or ():
+            related["payloads"][payload] = {"id": payload, "name": f"Payload {payload[-4:]}",
+                                            "type": "Satellite", "orbit": "LEO",
+                                            "mass_kg": 1000}
+        for core in launch.get("cores") or ():
+            record = related["cores"].setdefault(core["core"], {
+                "id": core["core"], "serial": f"B{len(related['cores']) + 1000}",
+                "block": 5, "reuse_count": -1, "status": "active"})
+            record["reuse_count"] += 1
+        for member in launch.get("crew") or ():
+            related["crew"][member["crew"]] = {"id": member["crew"], "name": "Astronaut",
+                                               "agency": "NASA"}
+        for ship in launch.get("ships") or ():
+            related["ships"][ship] = {"id": ship, "name": "Recovery ship", "type": "Tug"}
+    return {kind: list(records.values()) for kind, records in related.items()}
+
+
+class SyntheticSpaceX(object):
+    """Stand-in for spacexpy.SpaceX returning a synthetic dataset"""
+
+    def __init__(self, dataset: Optional[dict] = None):
+        self.dataset = dataset if dataset is not None else make_dataset()
+
+    def request_company(self):
+        return self.dataset["company"]
+
+    def request_landpads(self):
+        return self.dataset["landpads"]
+
+    def request_launchpads(self):
+        return self.dataset["launchpads"]
+
+    def request_rockets(self):
+        return self.dataset["rockets"]
+
+    def request_launches(self):
+        return self.dataset["launches"]
+
+
+class BackgroundServer(object):
+    """
+    Serves an aiohttp application on a free local port
+    from a background thread, used as a context manager
+    """
+
+    def __init__(self, app: Any = None):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever,
+                                       daemon=True)
+
+    def make_app(self) -> Any:
+        return self.app
+
+    async def start(self):
+        from aiohttp import web
+        self.runner = web.AppRunner(self.make_app())
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.start(), self.loop).result()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(),
+                                         self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class StubSpaceXServer(BackgroundServer):
+    """
+    Local stand-in for the SpaceX HTTP API.
+    Routes map paths to JSON data or to aiohttp handlers,
+    `faults` map paths to one of FAULTS to simulate a failing upstream.
+    """
+
+    # "error" answers 503, "hang" answers after `hang_seconds`
+    # and "truncate" closes the connection in the middle of the body
+    FAULTS = ("error", "hang", "truncate")
+
+    def __init__(self, routes: dict):
+        super().__init__()
+        self.routes = routes
+        self.requests: list = []
+        self.delay = 0.0
+        self.faults: dict = {}
+        self.hang_seconds = 2.0
+
+    @classmethod
+    def for_dataset(cls, dataset: dict) -> "StubSpaceXServer":
+        return cls({f"/{name}": data for name, data in dataset.items()})
+
+    async def handle(self, request):
+        from aiohttp import web
+        self.requests.append(request.path)
+        await asyncio.sleep(self.delay)
+        fault = self.faults.get(request.path)
+        if fault == "error":
+            return web.json_response({}, status=503)
+        if fault == "hang":
+            await asyncio.sleep(self.hang_seconds)
+        if fault == "truncate":
+            response = web.StreamResponse(headers={"Content-Length": "1000"})
+            await response.prepare(request)
+            await response.write(b'[{"id": "truncated"')
+            request.transport.close()
+            return response
+        handler = self.routes.get(request.path)
+        if handler is None:
+            return web.json_response({}, status=404)
+        if callable(handler):
+            return await handler(request)
+        return web.json_response(handler)
+
+    def add_queries(self, collections: dict) -> None:
+        """
+        Answers `/<kind>/query` requests selecting records by `_id` with `$in`
+        """
+        from aiohttp import web
+
+        def query(records: list):
+            by_id = {record["id"]: record for record in records}
+
+            async def handler(request):
+                body = await request.json()
+                ids = body.get("query", {}).get("_id", {}).get("$in", list(by_id))
+                return web.json_response({"docs": [by_id[entity_id] for entity_id in ids
+                                                   if entity_id in by_id]})
+            return handler
+        for kind, records in collections.items():
+            self.routes[f"/{kind}/query"] = query(records)
+
+    def make_app(self) -> Any:
+        from aiohttp import web
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        return app
@@ -1,7 +1,61 @@
 import os
 import sys
+import functools
+from contextlib import contextmanager
+from itertools import islice
 
-from typing import Optional
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, TextIO
+
+from spacexexplorer.profiling import profiler
+from spacexexplorer.screen import CLEAR_SCREEN, Screen, bar_chart, sparkline
+
+
+def buffered(method: Callable) -> Callable:
+    """
+    Decorator writing everything a TextUIManager method says at once
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.frame():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class SequenceView(Sequence):
+    """Read-only view applying a function to the items of a sequence on access"""
+
+    def __init__(self, items: Sequence, function: Callable[[Any], Any]):
+        self.items = items
+        self.function = function
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.function(item) for item in self.items[index]]
+        return self.function(self.items[index])
+
+
+class IteratorView(object):
+    """Indexable view over an iterator, items are consumed only when needed"""
+
+    def __init__(self, items: Iterable):
+        self.iterator: Iterator = iter(items)
+        self.consumed: list = []
+
+    def has_index(self, index: int) -> bool:
+        if index >= len(self.consumed):
+            self.consumed.extend(islice(self.iterator, index + 1 - len(self.consumed)))
+        return index < len(self.consumed)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self.has_index(index.stop - 1)
+            return self.consumed[index]
+        if not self.has_index(index):
+            raise IndexError('IteratorView index out of range')
+        return self.consumed[index]
 
 
 class TextUIManager():
@@ -14,62 +68,176 @@ class TextUIManager():
         Constructor method.
         """
         self.column_limit = 10
+        self.page_size = 60
         self.exit_symbol = "e"
+        self.next_symbol = "n"
+        self.previous_symbol = "p"
+        self.goto_symbol = "g"
         self.sep_str = '='*80
         self.month_names = ["Jan", "Feb", "Mar",
                             "Apl", "May", "Jun",
                             "Jul", "Aug", "Sep",
                             "Oct", "Nov", "Dec"]
+        self.chart_width = 40
+        # number of change events listed by show_changes
+        self.changes_limit = 20
+        self.kind_names = {"company": "Company", "landpads": "Landpad",
+                           "launchpads": "Launchpad", "rockets": "Rocket",
+                           "launches": "Launch"}
+        # output stream, sys.stdout at the time of writing if None
+        self.stream: Optional[TextIO] = None
+        # lines of the frame being built, see frame
+        self.lines: Optional[list] = None
+        # returns the next answer of the user, input() if None
+        self.reader: Optional[Callable[[], str]] = None
+
+    @property
+    def output(self) -> TextIO:
+        return self.stream if self.stream is not None else sys.stdout
+
+    def is_terminal(self) -> bool:
+        """
+        Returns True if control sequences can be written to the output
+        """
+        isatty = getattr(self.output, "isatty", None)
+        return bool(isatty and isatty())
+
+    def read_answer(self) -> str:
+        return self.reader() if self.reader is not None else input()
+
+    def write(self, text: str) -> None:
+        output = self.output
+        output.write(text)
+        output.flush()
+
+    @contextmanager
+    def frame(self, screen: Optional[Screen] = None, below: int = 0) -> Iterator[list]:
+        """
+        Collects the lines said inside the block and writes them with
+        a single call. On a terminal, a `screen` redraws its previous
+        frame in place, see Screen.render. Nested frames are written
+        with the outermost one.
+        """
+        if self.lines is not None:
+            yield self.lines
+            return
+        self.lines = lines = []
+        try:
+            yield lines
+        finally:
+            self.lines = None
+        if screen is not None and self.is_terminal():
+            self.write(screen.render(lines, below))
+        elif lines:
+            self.write("".join(line + "\n" for line in lines))
 
     def clear(self) -> None:
         """
         Clears the terminal
         """
-        os.system('cls||clear')
+        if self.is_terminal():
+            if os.name == "nt" and not getattr(self, "ansi_enabled", False):
+                # makes the Windows console interpret ANSI sequences
+                os.system("")
+                self.ansi_enabled = True
+            self.write(CLEAR_SCREEN)
 
     def say(self, message: str) -> None:
         """
         Prints a message.
         """
-        print(message)
+        if self.lines is not None:
+            self.lines.extend(str(message).split("\n"))
+            return
+        self.output.write(f"{message}\n")
 
     def separator(self) -> None:
         """
         Prints a separator.
         """
-        print(self.sep_str)
+        self.say(self.sep_str)
+
+    def ask_text(self, message: str) -> str:
+        """
+        Asks user to type a line of text
+        """
+        self.say(message)
+        return self.read_answer().strip()
 
     def ask_continue_or_exit(self) -> bool:
         """
         Asks user if we want to continue the main loop
         """
         self.say(f"To continue press Enter, to exit please type '{self.exit_symbol}'")
-        answer = input()
+        answer = self.read_answer()
         if answer == self.exit_symbol:
             sys.exit('Bye!')
         return True
     
-    def show_launch_stats(self, yearly: list, monthly: list) -> None:
+    def show_data_age(self, age: Optional[float], refreshing: bool = False,
+                      error: Optional[BaseException] = None) -> None:
+        """
+        Prints how old the displayed data is and whether
+        a background refresh is running or has failed
+        """
+        if age is None:
+            pass
+        elif age < 60:
+            self.say("Data updated just now")
+        elif age < 3600:
+            self.say(f"Data updated {int(age // 60)} min ago")
+        else:
+            self.say(f"Data updated {int(age // 3600)} h ago")
+        if refreshing:
+            self.say("Refreshing data in the background...")
+        elif error is not None:
+            self.say(f"Last refresh failed, showing the stored data: {error}")
+
+    @profiler.timed("ui.show_launch_stats")
+    @buffered
+    def show_launch_stats(self, yearly: list, monthly: list,
+                          rockets: Optional[list] = None) -> None:
         """
-        Prints launch stats
+        Prints launch stats by year and month as rows, bar charts
+        and sparklines; `rockets` are (name, launches, successes)
         """
         self.say("Statistics by years:")
-        title_row = "|"
-        value_row = "|"
-        for year, val in yearly:
-            title_row += str(year) + "|"
-            value_row += str(val).ljust(4) + "|"
-        self.say(title_row)
-        self.say(value_row)
+        self.say("|" + "|".join(str(year) for year, _ in yearly) + "|")
+        self.say("|" + "|".join(str(val).ljust(4) for _, val in yearly) + "|")
+        for line in bar_chart(yearly, self.chart_width):
+            self.say(line)
+        self.say(f"Trend: {sparkline(val for _, val in yearly)}")
         self.say("Statistics by months:")
-        title_row = "|"
-        value_row = "|"
-        for month, val in monthly:
-            title_row += str(self.month_names[month-1]).ljust(4) + "|"
-            value_row += str(val).ljust(4) + "|"
-        self.say(title_row)
-        self.say(value_row)
+        names = [(self.month_names[month - 1], val) for month, val in monthly]
+        self.say("|" + "|".join(name.ljust(4) for name, _ in names) + "|")
+        self.say("|" + "|".join(str(val).ljust(4) for _, val in names) + "|")
+        for line in bar_chart(names, self.chart_width):
+            self.say(line)
+        self.say(f"Trend: {sparkline(val for _, val in names)}")
+        if rockets:
+            self.say("Launches by rocket, '#' successful:")
+            for line in bar_chart(rockets, self.chart_width):
+                self.say(line)
+
+    @profiler.timed("ui.show_table")
+    @buffered
+    def show_table(self, title: str, header: list, rows: list) -> None:
+        """
+        Prints rows under a header with aligned columns,
+        None values are shown as '-'
+        """
+        cells = [[str(value) for value in header]]
+        for row in rows:
+            cells.append(['-' if value is None else
+                          f'{value:.1f}' if isinstance(value, float) else str(value)
+                          for value in row])
+        widths = [max(len(line[i]) for line in cells) for i in range(len(header))]
+        self.say(title)
+        for line in cells:
+            self.say("|" + "|".join(cell.ljust(width) for cell, width in zip(line, widths)) + "|")
 
+    @profiler.timed("ui.show_single_launchpad_info")
+    @buffered
     def show_single_launchpad_info(self, launchpad: dict, **extra_info) -> None:
         """
         Prints a single launchpad info
@@ -87,6 +255,8 @@ class TextUIManager():
                 f"{prop.capitalize().replace('_', ' ')}: {launchpad.get(prop)}")
         self.separator()
 
+    @profiler.timed("ui.show_single_rocket_info")
+    @buffered
     def show_single_rocket_info(self, rocket: dict, **extra_info) -> None:
         """
         Prints a signal rocket info
@@ -105,6 +275,8 @@ class TextUIManager():
             self.say(f"Rocket success rate: {rocket_success_rate: 0.1f}%")
         self.separator()
 
+    @profiler.timed("ui.show_single_launch_info")
+    @buffered
     def show_single_launch_info(self, launch: dict, **extra_info) -> None:
         """
         Prints a single launch info
@@ -121,43 +293,100 @@ class TextUIManager():
         for prop in properties:
             self.say(
                 f"{prop.capitalize().replace('_', ' ')}: {launch.get(prop)}")
+        for kind, records in extra_info.get("related", {}).items():
+            if records:
+                self.say(f"{kind.capitalize()}: "
+                         + ", ".join(self.related_label(kind, record) for record in records))
         
         self.separator()
 
-    def ask_user_choice(self, message: str, mlist: list, default: Optional[int] = None,
+    @profiler.timed("ui.show_changes")
+    @buffered
+    def show_changes(self, events: list) -> None:
+        """
+        Prints the number of changes by kind and the latest changes
+        """
+        self.separator()
+        if not events:
+            self.say("Nothing changed since the last visit")
+            self.separator()
+            return
+        self.say("What's new since the last visit:")
+        counts: dict = {}
+        for event in events:
+            key = (event["kind"], event["event"])
+            counts[key] = counts.get(key, 0) + 1
+        for (kind, change), count in sorted(counts.items()):
+            self.say(f"{kind.capitalize()} {change}: {count}")
+        self.separator()
+        for event in events[-self.changes_limit:]:
+            kind = self.kind_names.get(event["kind"], event["kind"])
+            line = f"{kind} {event['event']}: {event.get('name') or event['id']}"
+            fields = sorted(event.get("set", {})) + event.get("unset", [])
+            if fields:
+                line += f" ({', '.join(fields)})"
+            self.say(line)
+        if len(events) > self.changes_limit:
+            self.say(f"... and {len(events) - self.changes_limit} earlier changes")
+        self.separator()
+
+    def related_label(self, kind: str, record: dict) -> str:
+        """
+        Returns a short description of a payload, core, crew member or ship
+        """
+        if kind == "cores":
+            return f"{record.get('serial')} (block {record.get('block')}, " \
+                   f"{record.get('reuse_count')} reuses)"
+        if kind == "payloads":
+            details = [str(record[key]) for key in ("type", "orbit") if record.get(key)]
+            if record.get("mass_kg"):
+                details.append(f"{record['mass_kg']} kg")
+            return f"{record.get('name')} ({', '.join(details)})" if details \
+                else str(record.get('name'))
+        if kind == "crew":
+            return f"{record.get('name')} ({record.get('agency')})"
+        return f"{record.get('name')} ({record.get('type')})"
+
+    def ask_user_choice(self, message: str, mlist: Iterable, default: Optional[int] = None,
                         ask_exit: bool = False):
         """
         Asks user to choose the value among the proposed ones.
+        `mlist` may be a sequence or an iterator, only the items of the
+        displayed page are formatted; longer lists are split into pages.
         """
-        list_length = len(mlist)
+        items = mlist if isinstance(mlist, Sequence) else IteratorView(mlist)
+        page = 0 if default is None else default // self.page_size
+        # on a terminal other pages replace the lines of the current one
+        screen = Screen()
         while True:
-            self.say(message)
-            # single column print:
-            if (len(mlist) < self.column_limit):
-                for iteration, item  in enumerate(mlist):
-                    if iteration == default:
-                        self.say(f'{iteration}: {item} [default]')
-                        continue
-                    self.say(f'{iteration}: {item}')
-            else:  # three column print
-                strlist = []
-                for i in range(0, list_length):
-                    if default is not None and i == default:
-                        strlist += [f'{i}: {mlist[i]} [default]']
-                        continue
-                    strlist += [f'{i}: {mlist[i]}']
-                strlist = self.add_spaces(strlist)
-                for a, b, c in zip(strlist[::3], strlist[1::3], strlist[2::3]):
-                    print('{}{}{}'.format(a, b, c))
-                if (len(strlist) % 3 == 1):
-                    print(strlist[-1])
-                if (len(strlist) % 3 == 2):
-                    print('{}{}'.format(strlist[-2], strlist[-1]))
-            if ask_exit:
-                self.say(f"To exit: please type '{self.exit_symbol}'")
-            answer = input()
+            start = page * self.page_size
+            visible = items[start:start + self.page_size]
+            has_next = items.has_index(start + self.page_size) \
+                if isinstance(items, IteratorView) else start + self.page_size < len(items)
+            # the answer to the previous page is echoed below it
+            with self.frame(screen, below=1):
+                self.say(message)
+                self.show_choices(visible, start, default)
+                if page > 0 or has_next:
+                    self.say(f"Page {page + 1}: type '{self.next_symbol}' for next, "
+                             f"'{self.previous_symbol}' for previous page, "
+                             f"'{self.goto_symbol} <number>' to go to an item")
+                if ask_exit:
+                    self.say(f"To exit: please type '{self.exit_symbol}'")
+            answer = self.read_answer()
+            if answer == self.next_symbol and has_next:
+                page += 1
+                continue
+            if answer == self.previous_symbol and page > 0:
+                page -= 1
+                continue
+            if answer.startswith(self.goto_symbol) and self.is_int(answer[len(self.goto_symbol):]):
+                index = int(answer[len(self.goto_symbol):])
+                if index >= 0 and self.has_index(items, index):
+                    page = index // self.page_size
+                    continue
             if self.is_int(answer):
-                if abs(int(answer)) < list_length:
+                if self.has_index(items, abs(int(answer))):
                     return int(answer)
             if not answer and default is None:
                 return default
@@ -165,6 +394,38 @@ class TextUIManager():
                 sys.exit('Bye!')
             return None
 
+    def has_index(self, items: Sequence, index: int) -> bool:
+        if isinstance(items, IteratorView):
+            return items.has_index(index)
+        return index < len(items)
+
+    @profiler.timed("ui.show_choices")
+    def show_choices(self, visible: list, start: int, default: Optional[int] = None) -> None:
+        """
+        Prints one page of choices numbered from `start`.
+        """
+        # single column print:
+        if (len(visible) < self.column_limit):
+            for iteration, item in enumerate(visible, start):
+                if iteration == default:
+                    self.say(f'{iteration}: {item} [default]')
+                    continue
+                self.say(f'{iteration}: {item}')
+        else:  # three column print
+            strlist = []
+            for i, item in enumerate(visible, start):
+                if default is not None and i == default:
+                    strlist += [f'{i}: {item} [default]']
+                    continue
+                strlist += [f'{i}: {item}']
+            strlist = self.add_spaces(strlist)
+            for a, b, c in zip(strlist[::3], strlist[1::3], strlist[2::3]):
+                self.say('{}{}{}'.format(a, b, c))
+            if (len(strlist) % 3 == 1):
+                self.say(strlist[-1])
+            if (len(strlist) % 3 == 2):
+                self.say('{}{}'.format(strlist[-2], strlist[-1]))
+
     def add_spaces(self, strlist: list) -> list:
         """
         Adds spaces to make columns.
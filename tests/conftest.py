@@ -1,6 +1,9 @@
 import sys
+
 import pytest
 
+from spacexexplorer.testing import StubSpaceXServer
+
 
 # each test runs on cwd to its temp dir
 @pytest.fixture(autouse=True)
@@ -12,3 +15,17 @@ def go_to_tmpdir(request):
     # Chdir only for the duration of the test.
     with tmpdir.as_cwd():
         yield
+
+
+@pytest.fixture
+def stub_server():
+    """Returns a factory starting a stub SpaceX API with the given routes"""
+    servers = []
+
+    def factory(routes: dict) -> StubSpaceXServer:
+        server = StubSpaceXServer(routes)
+        servers.append(server.__enter__())
+        return server
+    yield factory
+    for server in servers:
+        server.__exit__(None, None, None)
@@ -0,0 +1,43 @@
+from spacexexplorer.analytics import launch_analytics
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset
+
+
+def launch(day, pad, rocket, success=True, cores=(), upcoming=False):
+    return {"date_utc": f"2020-01-{day:02d}T00:00:00.000Z", "launchpad": pad,
+            "rocket": rocket, "success": None if upcoming else success,
+            "upcoming": upcoming,
+            "cores": [{"core": core, "landpad": landpad, "landing_attempt": landed is not None,
+                       "landing_success": landed} for core, landpad, landed in cores]}
+
+
+def test_launch_analytics():
+    launches = [launch(11, "pad1", "f9", cores=[("c1", "lz1", True)]),
+                launch(1, "pad1", "f9", success=False, cores=[("c1", "lz1", False)]),
+                launch(5, "pad2", "fh", cores=[("c2", "lz1", True), ("c3", None, None)]),
+                launch(21, "pad1", "f9", cores=[("c1", "asds", True)]),
+                launch(30, "pad1", "f9", upcoming=True, cores=[("c1", "asds", None)])]
+    analytics = launch_analytics(launches, window=2)
+    assert analytics["pad_turnaround"]["pad1"] == {"launches": 3, "mean_days": 10.0,
+                                                   "min_days": 10.0}
+    assert analytics["pad_turnaround"]["pad2"]["mean_days"] is None
+    assert analytics["rocket_cadence"] == {"f9": {2020: 3}, "fh": {2020: 1}}
+    reuse = analytics["core_reuse"]
+    assert reuse["flights"] == {"c1": 3, "c2": 1, "c3": 1}
+    assert (reuse["cores"], reuse["reused_cores"], reuse["max_flights"]) == (3, 1, 3)
+    assert reuse["mean_days"] == 10.0
+    assert analytics["landpad_landings"]["lz1"] == {"attempts": 3, "successes": 2,
+                                                    "success_rate": 2 / 3 * 100}
+    assert [rate for _, rate in analytics["rolling_success"]] == [0.0, 50.0, 100.0, 100.0]
+
+
+def test_analytics_memoized_per_dataset_version(tmpdir):
+    info_manager = InfoManager(location=str(tmpdir),
+                               spacex=SyntheticSpaceX(make_dataset(50)))
+    info_manager.fetch_static()
+    analytics = info_manager.analytics()
+    assert info_manager.analytics() is analytics
+    assert sum(sum(years.values()) for years in analytics["rocket_cadence"].values()) == 45
+    info_manager.dataset.put("launches", info_manager.get("launches")[:10])
+    assert info_manager.analytics() is not analytics
+    assert len(info_manager.analytics()["rolling_success"]) == 10
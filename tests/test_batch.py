@@ -0,0 +1,67 @@
+import io
+import csv
+import json
+
+import pytest
+
+from spacexexplorer.batch import run_command
+from spacexexplorer.cli import parse_args
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset
+
+
+@pytest.fixture
+def info_manager(tmpdir):
+    info_manager = InfoManager(location=str(tmpdir), lazy=True, storage_format="jsonl",
+                               spacex=SyntheticSpaceX(make_dataset(120)))
+    info_manager.fetch_static()
+    return info_manager
+
+
+def run(info_manager, *argv):
+    out = io.StringIO()
+    count = run_command(parse_args(list(argv)), info_manager, out)
+    return count, out.getvalue()
+
+
+def test_iter_launches_matches_filter_launches(info_manager):
+    rocket = next(iter(info_manager.rocket_info))
+    for kwargs in [{}, {"success": True}, {"rocket": rocket, "year": 2008},
+                   {"since": "2008", "until": "2010", "limit": 5, "offset": 2},
+                   {"min_flight": 10, "max_flight": 20},
+                   {"sort_by": "flight_number", "reverse": True, "limit": 3}]:
+        assert list(info_manager.iter_launches(**kwargs)) == \
+            list(info_manager.filter_launches(**kwargs))
+
+
+def test_launches_command(info_manager):
+    rocket_id, rocket = next(iter(info_manager.rocket_info.items()))
+    count, output = run(info_manager, "launches", "--rocket", rocket["name"].upper(),
+                        "--success", "--since", "2008")
+    launches = [json.loads(line) for line in output.splitlines()]
+    assert count == len(launches)
+    assert launches == info_manager.filter_launches(rocket=rocket_id, success=True,
+                                                    since="2008")
+    count, output = run(info_manager, "launches", "--failed", "--limit", "2",
+                        "--format", "csv")
+    rows = list(csv.DictReader(io.StringIO(output)))
+    assert count == len(rows) == 2
+    assert rows[0]["success"] == "False"
+    assert rows[0]["rocket"] in {info["name"] for info in info_manager.rocket_info.values()}
+    with pytest.raises(SystemExit):
+        run(info_manager, "launches", "--rocket", "Saturn V")
+
+
+def test_summary_commands(info_manager):
+    _, output = run(info_manager, "stats")
+    stats = [json.loads(line) for line in output.splitlines()]
+    assert sum(row["launches"] for row in stats if row["period"] == "year") == 120
+    _, output = run(info_manager, "rockets", "--format", "csv")
+    rows = list(csv.DictReader(io.StringIO(output)))
+    assert {row["id"] for row in rows} == set(info_manager.rocket_info)
+    count, _ = run(info_manager, "launchpads")
+    assert count == len(info_manager.launchpad_info)
+
+
+def test_menu_without_command():
+    assert parse_args([]).command is None
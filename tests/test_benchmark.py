@@ -0,0 +1,28 @@
+from spacexexplorer.benchmark import compare, format_report, run
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset
+
+import copy
+
+
+def test_synthetic_dataset_loads_offline():
+    dataset = make_dataset(50, upcoming=3)
+    info_manager = InfoManager(spacex=SyntheticSpaceX(dataset))
+    info_manager.fetch_static()
+    assert len(info_manager.get("launches")) == 50
+    assert sum(info["total_launches"] for info in info_manager.rocket_info.values()) == 50
+    assert len(info_manager.filter_launches(upcoming=True)) == 3
+
+
+def test_benchmark_report_and_regressions():
+    report = run([200], repeat=1)
+    operations = report["results"]["200"]
+    for name in ("fetch_static", "get_cold", "get_warm", "filter_launches",
+                 "launch_table", "record_launch", "ask_user_choice"):
+        assert operations[name]["seconds"] > 0
+        assert operations[name]["peak_bytes"] >= 0
+    assert "filter_launches" in format_report(report)
+    assert compare(report, report) == []
+    faster = copy.deepcopy(report)
+    faster["results"]["200"]["get_cold"]["seconds"] /= 10
+    assert [name for _, name, _ in compare(report, faster)] == ["get_cold"]
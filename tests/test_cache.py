@@ -0,0 +1,75 @@
+from spacexexplorer.cache import StaticCache
+from spacexexplorer.fetcher import AsyncFetcher
+from spacexexplorer.info_manager import InfoManager
+
+import os
+from aiohttp import web
+
+
+ROUTES = {"/company": {"name": "SpaceX"},
+          "/landpads": [],
+          "/launchpads": [{"id": "lp1", "full_name": "Pad 1"}],
+          "/rockets": [{"id": "r1", "name": "Falcon 1"}],
+          "/launches": [{"success": True, "rocket": "r1", "launchpad": "lp1",
+                         "date_utc": "2006-03-24T22:30:00.000Z"}]}
+
+
+def make_info_manager(server, ttls=None):
+    return InfoManager(fetcher=AsyncFetcher(base_url=server.url),
+                       cache=StaticCache("cache", ttls=ttls))
+
+
+def test_store_writes_metadata():
+    cache = StaticCache("cache")
+    cache.store("company", {"name": "SpaceX"}, etag='"abc"')
+    meta = cache.metadata("company")
+    assert meta["etag"] == '"abc"'
+    assert len(meta["sha256"]) == 64
+    assert cache.is_fresh("company")
+    assert not cache.is_fresh("company", now=meta["fetched_at"] + 10 ** 6)
+    assert cache.load("company") == {"name": "SpaceX"}
+
+
+def test_fresh_cache_needs_no_network(stub_server):
+    server = stub_server(ROUTES)
+    make_info_manager(server).fetch_static(concurrent=True)
+    assert len(server.requests) == len(ROUTES)
+    info_manager = make_info_manager(server)
+    info_manager.fetch_static(concurrent=True)
+    assert len(server.requests) == len(ROUTES)
+    assert info_manager.rocket_info["r1"]["total_launches"] == 1
+
+
+def test_expired_cache_is_revalidated(stub_server):
+    async def company(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.json_response({"name": "SpaceX"}, headers={"ETag": '"v1"'})
+    routes = dict(ROUTES, **{"/company": company})
+    server = stub_server(routes)
+    make_info_manager(server).fetch_static(concurrent=True)
+    info_manager = make_info_manager(server, ttls={"company": 0})
+    info_manager.fetch_static(concurrent=True)
+    assert server.requests.count("/company") == 2
+    assert info_manager.get("company") == {"name": "SpaceX"}
+    assert info_manager.cache.is_fresh("company", now=0)
+
+
+def test_offline_uses_cache_only(stub_server):
+    server = stub_server(ROUTES)
+    make_info_manager(server).fetch_static(concurrent=True)
+    info_manager = make_info_manager(server, ttls=dict.fromkeys(ROUTES, 0))
+    info_manager.fetch_static(concurrent=True, offline=True)
+    assert len(server.requests) == len(ROUTES)
+    assert info_manager.launchpad_info["lp1"]["successful_launches"] == 1
+
+
+def test_save_and_load_static(stub_server):
+    server = stub_server(ROUTES)
+    make_info_manager(server).fetch_static(concurrent=True)
+    make_info_manager(server).save_static("export")
+    assert "launches.meta.json" in os.listdir("export")
+    info_manager = InfoManager(cache=StaticCache("imported"))
+    info_manager.load_static("export")
+    assert info_manager.cache.is_fresh("launches")
+    assert info_manager.rocket_info["r1"]["successful_launches"] == 1
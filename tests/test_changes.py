@@ -0,0 +1,96 @@
+import io
+import os
+import json
+
+from spacexexplorer.batch import run_command
+from spacexexplorer.cache import StaticCache
+from spacexexplorer.changes import ChangeLog, record_state
+from spacexexplorer.cli import parse_args
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.main_manager import MainManager
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset
+from spacexexplorer.textui_manager import TextUIManager
+
+
+def test_diff_events(tmpdir):
+    changes = ChangeLog(str(tmpdir))
+    records = [{"id": "a", "name": "A", "x": 1}, {"id": "b", "name": "B", "x": [1, 2]},
+               {"id": "c", "name": "C", "x": {"y": 1}}]
+    # the first version has nothing to compare with
+    assert changes.diff("rockets", records) == []
+    changes.append([])
+    changes = ChangeLog(str(tmpdir))
+    events = changes.diff("rockets", [{"id": "a", "name": "A", "x": 1},
+                                      {"id": "c", "name": "C2", "x": {"y": 1}, "z": None},
+                                      {"id": "d", "name": "D"}])
+    assert events == [
+        {"kind": "rockets", "event": "modified", "id": "c", "name": "C2",
+         "set": {"name": "C2", "z": None}},
+        {"kind": "rockets", "event": "added", "id": "d", "name": "D"},
+        {"kind": "rockets", "event": "removed", "id": "b", "name": "B"}]
+    # a part of the data removes nothing
+    events = changes.diff("rockets", [{"id": "d", "name": "D", "x": 2}], complete=False)
+    assert events == [{"kind": "rockets", "event": "modified", "id": "d", "name": "D",
+                       "set": {"x": 2}}]
+    events = changes.diff("rockets", [{"id": "d", "name": "D"}], complete=False)
+    assert events[0]["unset"] == ["x"] and "set" not in events[0]
+    assert set(changes.state["records"]["rockets"]) == {"a", "c", "d"}
+    assert record_state({"b": 1, "a": 2})[0] == record_state({"a": 2, "b": 1})[0]
+
+
+def test_unseen_events(tmpdir):
+    changes = ChangeLog(str(tmpdir))
+    assert changes.unseen() == ([], {"seq": 0, "offset": 0})
+    changes.append([{"kind": "launches", "event": "added", "id": str(n)} for n in range(3)])
+    events, position = changes.unseen()
+    assert [event["seq"] for event in events] == [1, 2, 3]
+    changes.mark_seen(position)
+    changes.append([{"kind": "launches", "event": "removed", "id": "0"}])
+    events, position = ChangeLog(str(tmpdir)).unseen()
+    assert [(event["seq"], event["event"]) for event in events] == [(4, "removed")]
+    # a log replaced by a shorter one is read from the start
+    changes.mark_seen(position)
+    changes.log_path.write_text(changes.log_path.read_text().splitlines(True)[0])
+    assert changes.unseen()[0] == []
+
+
+def test_fetch_logs_changes(tmpdir, capsys):
+    dataset = make_dataset(80, upcoming=0)
+    InfoManager(cache=StaticCache(str(tmpdir)), spacex=SyntheticSpaceX(dataset)).fetch_static()
+    assert not (tmpdir / "changes" / "changes.jsonl").exists()
+    dataset = make_dataset(81, upcoming=0)
+    dataset["launches"][3]["success"] = not dataset["launches"][3]["success"]
+    dataset["landpads"].pop()
+    info_manager = InfoManager(cache=StaticCache(str(tmpdir), ttls=dict.fromkeys(dataset, 0)),
+                               spacex=SyntheticSpaceX(dataset))
+    info_manager.fetch_static(concurrent=False)
+    events, _ = info_manager.changes.unseen()
+    assert {(event["kind"], event["event"], event["id"]) for event in events} == {
+        ("launches", "modified", dataset["launches"][3]["id"]),
+        ("launches", "added", dataset["launches"][80]["id"]),
+        ("landpads", "removed", make_dataset(1)["landpads"][-1]["id"])}
+    modified = [event for event in events if event["event"] == "modified"][0]
+    assert modified["set"] == {"success": dataset["launches"][3]["success"]}
+
+    main = MainManager(info_manager, TextUIManager())
+    main.show_changes()
+    out = capsys.readouterr().out
+    assert "Launches modified: 1" in out and "Landpads removed: 1" in out
+    assert f"Launch modified: {dataset['launches'][3]['name']} (success)" in out
+    main.show_changes()
+    assert "Nothing changed since the last visit" in capsys.readouterr().out
+
+    out = io.StringIO()
+    assert run_command(parse_args(["changes", "--since", "1"]), info_manager, out) == 2
+    assert all(json.loads(line)["seq"] > 1 for line in out.getvalue().splitlines())
+    # the data directory only holds the data
+    assert not [name for name in os.listdir(tmpdir) if name.startswith("changes.")]
+
+
+def test_no_changes_without_cache(tmpdir):
+    info_manager = InfoManager(location=str(tmpdir), spacex=SyntheticSpaceX(make_dataset(10)))
+    info_manager.fetch_static()
+    assert info_manager.changes is None
+    assert len(tmpdir.listdir()) == len(info_manager.static_file_dict)
+    main = MainManager(info_manager, TextUIManager())
+    assert "What's new" not in [item.display_name for item in main.main_menu]
@@ -0,0 +1,66 @@
+from spacexexplorer.columnar import LaunchTable, landing_outcome, parse_timestamp
+from spacexexplorer.info_manager import InfoManager
+
+import random
+
+
+def make_launches(count=500, seed=1):
+    rng = random.Random(seed)
+    launches = []
+    for n in range(count):
+        launches.append({"rocket": rng.choice(["falcon1", "falcon9", "heavy"]),
+                         "launchpad": rng.choice(["slc40", "lc39a"]),
+                         "success": rng.choice([True, True, False, None]),
+                         "date_utc": "%d-%02d-%02dT12:00:00.000Z" % (rng.randint(2006, 2022),
+                                                                    rng.randint(1, 12),
+                                                                    rng.randint(1, 28))})
+    return launches
+
+
+def test_group_by_matches_per_launch_loop():
+    launches = make_launches()
+    rockets = [{"id": name, "name": name} for name in ("falcon1", "falcon9", "heavy")]
+    launchpads = [{"id": name, "full_name": name} for name in ("slc40", "lc39a")]
+    expected = InfoManager()
+    expected.ingest_static("rockets", rockets)
+    expected.ingest_static("launchpads", launchpads)
+    for launch in launches:
+        expected.record_launch(launch)
+    info_manager = InfoManager()
+    info_manager.ingest_static("rockets", rockets)
+    info_manager.ingest_static("launchpads", launchpads)
+    info_manager.ingest_static("launches", launches)
+    assert info_manager.rocket_info == expected.rocket_info
+    assert info_manager.launchpad_info == expected.launchpad_info
+    assert info_manager.launch_stats == expected.launch_stats
+
+
+def test_success_rate_and_weekday():
+    table = LaunchTable.from_launches([
+        {"rocket": "r", "success": True, "date_utc": "2020-01-06T00:00:00.000Z"},
+        {"rocket": "r", "success": False, "date_utc": "2020-01-07T00:00:00.000Z"},
+        {"rocket": "r", "success": None, "date_utc": "2020-01-07T10:00:00.000Z"},
+    ])
+    group = table.group_by("rocket")["r"]
+    assert group["total_launches"] == 3
+    assert group["finished_launches"] == 2
+    assert group["success_rate"] == 50
+    assert table.count_by("weekday") == {0: 1, 1: 2}
+
+
+def test_rolling_cadence():
+    table = LaunchTable.from_launches([{"date_unix": day * 86400} for day in (0, 10, 20, 45)])
+    assert [count for _, count in table.rolling_cadence(window_days=30)] == [1, 2, 3, 2]
+
+
+def test_landing_outcome():
+    assert landing_outcome({"cores": [{"landing_attempt": True, "landing_success": True}]}) == 1
+    assert landing_outcome({"cores": [{"landing_attempt": True, "landing_success": True},
+                                      {"landing_attempt": True, "landing_success": False}]}) == 0
+    assert landing_outcome({"cores": [{"landing_attempt": False}]}) == -1
+    assert parse_timestamp({"date_utc": "1970-01-02T00:00:00.000Z"}) == 86400
+
+
+def test_columns_are_compact():
+    table = LaunchTable.from_launches(make_launches(1000))
+    assert table.nbytes() < 30 * len(table)
@@ -0,0 +1,59 @@
+from spacexexplorer.dataset import Dataset, LazyJSONList
+from spacexexplorer.info_manager import InfoManager
+
+import json
+import pytest
+
+
+LAUNCHES = [{"name": "FalconSat", "success": False, "cores": [{"core": "c1"}]},
+            {"name": "DemoSat", "success": False, "cores": []},
+            {"name": "Trailblazer", "success": True, "details": "a\nb }"}]
+
+
+def write_launches(data=LAUNCHES):
+    with open('launches.json', 'w') as f:
+        json.dump(data, f, indent='    ')
+
+
+def test_get_reads_disk_once():
+    write_launches()
+    dataset = Dataset(".")
+    assert dataset.get("launches") == LAUNCHES
+    assert dataset.get("launches") == LAUNCHES
+    assert dataset.stats()["misses"] == 1
+    assert dataset.stats()["hits"] == 1
+
+
+def test_missing_file():
+    with pytest.raises(FileNotFoundError):
+        Dataset(".").get("launches")
+
+
+def test_lazy_list_decodes_records():
+    write_launches()
+    lazy = LazyJSONList("launches.json")
+    assert len(lazy) == 3
+    assert lazy[0] == LAUNCHES[0]
+    assert lazy[-1] == LAUNCHES[-1]
+    assert list(lazy) == LAUNCHES
+    assert lazy[1:] == LAUNCHES[1:]
+
+
+def test_lazy_dataset_falls_back_for_compact_files():
+    with open('launches.json', 'w') as f:
+        json.dump(LAUNCHES, f)
+    launches = Dataset(".", lazy=["launches"]).get("launches")
+    assert isinstance(launches, list)
+    write_launches([])
+    assert len(Dataset(".", lazy=["launches"]).get("launches")) == 0
+
+
+def test_fetch_static_refreshes_memory():
+    info_manager = InfoManager()
+    info_manager.static_file_dict = {"company": lambda: {"name": "SpaceX"}}
+    with open('company.json', 'w') as f:
+        json.dump({"name": "Old"}, f)
+    assert info_manager.get("company") == {"name": "Old"}
+    info_manager.fetch_static()
+    assert info_manager.get("company") == {"name": "SpaceX"}
+    assert info_manager.dataset.misses == 1
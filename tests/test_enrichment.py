@@ -0,0 +1,103 @@
+import pytest
+
+from spacexexplorer.enrichment import EntityCache, Enricher, referenced_ids
+from spacexexplorer.fetcher import AsyncFetcher, FetchError
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.main_manager import MainManager
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset, make_related
+from spacexexplorer.textui_manager import TextUIManager
+
+
+@pytest.fixture
+def upstream(stub_server):
+    dataset = make_dataset(60)
+    server = stub_server({})
+    server.add_queries(make_related(dataset))
+    return server, dataset
+
+
+def test_referenced_ids():
+    launches = [{"payloads": ["p1", "p2"], "cores": [{"core": "c1"}, {"core": None}],
+                 "crew": [{"crew": "m1", "role": "Pilot"}], "ships": ["s1"]},
+                {"payloads": ["p2"], "cores": [{"core": "c1"}], "crew": ["m2"], "ships": []}]
+    assert referenced_ids(launches) == {"payloads": ["p1", "p2"], "cores": ["c1"],
+                                        "crew": ["m1", "m2"], "ships": ["s1"]}
+    limited = referenced_ids(launches, limit=3, skip=lambda kind, entity_id: entity_id == "p1")
+    assert limited == {"payloads": ["p2"], "cores": ["c1"], "crew": ["m1"], "ships": []}
+
+
+def test_entity_cache_is_bounded():
+    cache = EntityCache(maxsize=2)
+    cache.put(("cores", "a"), {"id": "a"})
+    cache.put(("cores", "b"), None)
+    cache.get(("cores", "a"))
+    cache.put(("cores", "c"), {"id": "c"})
+    assert list(cache.entries) == [("cores", "a"), ("cores", "c")]
+    assert ("cores", "b") not in cache
+
+
+def test_prefetch_batches_by_kind(upstream):
+    server, dataset = upstream
+    enricher = Enricher(AsyncFetcher(base_url=server.url), batch_size=25)
+    launches = dataset["launches"]
+    requested = enricher.prefetch(launches)
+    ids = referenced_ids(launches)
+    assert requested == sum(len(found) for found in ids.values())
+    # one request per kind and per batch of 25 ids, none per launch
+    expected = sum((len(found) + 24) // 25 for found in ids.values() if found)
+    assert len(server.requests) == expected
+    assert enricher.prefetch(launches) == 0
+    assert len(server.requests) == expected
+    related = enricher.related(launches[9])
+    assert [payload["id"] for payload in related["payloads"]] == launches[9]["payloads"]
+    assert [core["id"] for core in related["cores"]] == [launches[9]["cores"][0]["core"]]
+    assert related["crew"][0]["name"] == "Astronaut"
+
+
+def test_launch_details_in_menu(upstream, tmpdir, monkeypatch, capsys):
+    server, dataset = upstream
+    info_manager = InfoManager(location=str(tmpdir), spacex=SyntheticSpaceX(dataset),
+                               fetcher=AsyncFetcher(base_url=server.url))
+    info_manager.fetch_static()
+    main = MainManager(info_manager, TextUIManager())
+    answers = iter(["0", "9", "0", "9"])
+    monkeypatch.setattr("builtins.input", lambda: next(answers))
+    main.show_launches_menu()
+    out = capsys.readouterr().out
+    assert "Payloads: Payload" in out
+    assert "Crew: Astronaut (NASA)" in out
+    requests = len(server.requests)
+    main.show_launches_menu()
+    assert len(server.requests) == requests
+    assert "Cores: B10" in capsys.readouterr().out
+
+
+def test_launch_details_without_network(tmpdir):
+    dataset = make_dataset(20)
+    info_manager = InfoManager(location=str(tmpdir), spacex=SyntheticSpaceX(dataset),
+                               fetcher=AsyncFetcher(base_url="http://127.0.0.1:9", retries=0))
+    info_manager.fetch_static()
+    launch = info_manager.get("launches")[0]
+    assert info_manager.launch_details(launch) == {"payloads": [], "cores": [],
+                                                   "crew": [], "ships": []}
+    info_manager.enricher.offline = True
+    assert info_manager.enricher.prefetch([launch]) == 0
+
+
+def test_failed_batches_wait_before_retry(upstream):
+    server, dataset = upstream
+    server.faults["/payloads/query"] = "error"
+    now = [0.0]
+    enricher = Enricher(AsyncFetcher(base_url=server.url, retries=0), clock=lambda: now[0])
+    launches = dataset["launches"][:5]
+    with pytest.raises(FetchError):
+        enricher.prefetch(launches)
+    assert enricher.related(launches[0])["cores"]
+    requests = len(server.requests)
+    # the failed payloads are not requested again at every detail view
+    assert enricher.prefetch(launches) == 0
+    assert len(server.requests) == requests
+    del server.faults["/payloads/query"]
+    now[0] = enricher.retry_after
+    assert enricher.prefetch(launches) == 5
+    assert enricher.related(launches[0])["payloads"]
@@ -0,0 +1,102 @@
+import os
+import time
+
+import pytest
+
+from spacexexplorer.cache import StaticCache
+from spacexexplorer.fetcher import AsyncFetcher, CircuitBreaker, CircuitOpenError, FetchError
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.testing import StubSpaceXServer, SyntheticSpaceX, make_dataset
+
+
+def test_backoff_is_jittered():
+    fetcher = AsyncFetcher(retry_delay=1.0, jitter=0.5)
+    delays = {fetcher.backoff(3) for _ in range(20)}
+    assert len(delays) > 1
+    assert all(2.0 <= delay <= 6.0 for delay in delays)
+    assert AsyncFetcher(retry_delay=1.0, jitter=0).backoff(2) == 2.0
+
+
+def test_circuit_breaker_states():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    now[0] = 10.0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_breaker_stops_requests_to_failing_upstream():
+    with StubSpaceXServer({"/company": {}}) as server:
+        server.faults["/company"] = "error"
+        fetcher = AsyncFetcher(base_url=server.url, retries=10, retry_delay=0,
+                               breaker=CircuitBreaker(failure_threshold=3))
+        with pytest.raises(CircuitOpenError):
+            fetcher.fetch({"company": "/company"})
+        with pytest.raises(CircuitOpenError):
+            fetcher.fetch({"company": "/company"})
+        assert len(server.requests) == 3
+
+
+def test_degraded_upstream_falls_back_within_deadline(tmpdir):
+    dataset = make_dataset(30)
+    cache = StaticCache(str(tmpdir), ttls=dict.fromkeys(dataset, 0))
+    with StubSpaceXServer.for_dataset(dataset) as server:
+        server.hang_seconds = 1.5
+        fetcher = AsyncFetcher(base_url=server.url, retries=1, retry_delay=0.01,
+                               deadline=0.5)
+        info_manager = InfoManager(fetcher=fetcher, cache=cache, storage_format="jsonl",
+                                   spacex=SyntheticSpaceX(dataset))
+        info_manager.fetch_static(concurrent=True)
+        stored = {name: os.path.getmtime(cache.data_path(name)) for name in dataset}
+        server.faults.update({"/launches": "hang", "/rockets": "error",
+                              "/company": "truncate"})
+        start = time.perf_counter()
+        info_manager.fetch_static(concurrent=True)
+        assert time.perf_counter() - start < 1.2
+    assert sorted(info_manager.fetch_errors) == ["company", "launches", "rockets"]
+    assert info_manager.get("launches") == dataset["launches"]
+    assert info_manager.get("company") == dataset["company"]
+    assert sum(info["total_launches"] for info in info_manager.rocket_info.values()) == 30
+    for name in ("company", "launches", "rockets"):
+        assert os.path.getmtime(cache.data_path(name)) == stored[name]
+    assert not [name for name in os.listdir(tmpdir) if name.endswith(".tmp")]
+
+
+def test_hanging_sync_query_within_deadline(tmpdir):
+    dataset = make_dataset(30)
+    cache = StaticCache(str(tmpdir), ttls={"launches": 0})
+    with StubSpaceXServer.for_dataset(dataset) as server:
+        fetcher = AsyncFetcher(base_url=server.url, timeout=2, retries=1, retry_delay=0.01,
+                               deadline=0.5)
+        info_manager = InfoManager(fetcher=fetcher, cache=cache, storage_format="jsonl",
+                                   spacex=SyntheticSpaceX(dataset))
+        info_manager.fetch_static(concurrent=True)
+        server.hang_seconds = 1.5
+        server.faults["/launches/query"] = "hang"
+        start = time.perf_counter()
+        info_manager.fetch_static(concurrent=True, incremental=True)
+        assert time.perf_counter() - start < 1.2
+        assert "/launches/query" in server.requests
+    assert list(info_manager.fetch_errors) == ["launches"]
+    assert info_manager.get("launches") == dataset["launches"]
+    assert not cache.is_fresh("launches")
+
+
+def test_failure_without_stored_copy(tmpdir):
+    dataset = make_dataset(10)
+    with StubSpaceXServer.for_dataset(dataset) as server:
+        server.faults["/launches"] = "truncate"
+        info_manager = InfoManager(fetcher=AsyncFetcher(base_url=server.url, retries=0),
+                                   cache=StaticCache(str(tmpdir)), storage_format="jsonl",
+                                   spacex=SyntheticSpaceX(dataset))
+        with pytest.raises(FetchError, match="launches"):
+            info_manager.fetch_static(concurrent=True)
+    assert not [name for name in os.listdir(tmpdir) if name.startswith("launches")]
+    with pytest.raises(FetchError, match="--offline"):
+        InfoManager(cache=StaticCache(str(tmpdir / "empty"))).fetch_static(offline=True)
@@ -0,0 +1,58 @@
+from spacexexplorer.fetcher import AsyncFetcher
+from spacexexplorer.info_manager import InfoManager
+
+import time
+import pytest
+from aiohttp import web
+from aiohttp.client_exceptions import ClientResponseError
+
+
+ROUTES = {"/company": {"name": "SpaceX"},
+          "/landpads": [],
+          "/launchpads": [{"id": "lp1", "full_name": "Pad 1"}],
+          "/rockets": [{"id": "r1", "name": "Falcon 1"}],
+          "/launches": [{"success": True, "rocket": "r1", "launchpad": "lp1",
+                         "date_utc": "2006-03-24T22:30:00.000Z"}]}
+
+
+def test_fetch_all_concurrently(stub_server):
+    server = stub_server(ROUTES)
+    server.delay = 0.2
+    fetcher = AsyncFetcher(base_url=server.url, concurrency=5)
+    start = time.perf_counter()
+    data = fetcher.fetch({"company": "/company", "rockets": "/rockets"})
+    assert time.perf_counter() - start < 0.4
+    assert data["company"] == {"name": "SpaceX"}
+    assert data["rockets"][0]["id"] == "r1"
+
+
+def test_fetch_retries_server_errors(stub_server):
+    calls = []
+
+    async def flaky(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return web.json_response({}, status=503)
+        return web.json_response({"name": "SpaceX"})
+    server = stub_server({"/company": flaky})
+    fetcher = AsyncFetcher(base_url=server.url, retries=2, retry_delay=0)
+    assert fetcher.fetch({"company": "/company"}) == {"company": {"name": "SpaceX"}}
+    assert len(calls) == 3
+
+
+def test_fetch_does_not_retry_client_errors(stub_server):
+    server = stub_server({})
+    fetcher = AsyncFetcher(base_url=server.url, retries=2, retry_delay=0)
+    with pytest.raises(ClientResponseError):
+        fetcher.fetch({"company": "/company"})
+    assert len(server.requests) == 1
+
+
+def test_concurrent_fetch_static(stub_server):
+    server = stub_server(ROUTES)
+    info_manager = InfoManager(fetcher=AsyncFetcher(base_url=server.url))
+    info_manager.fetch_static(concurrent=True)
+    assert sorted(server.requests) == sorted(ROUTES)
+    assert info_manager.rocket_info["r1"]["total_launches"] == 1
+    assert info_manager.launchpad_info["lp1"]["successful_launches"] == 1
+    assert info_manager.get("company") == {"name": "SpaceX"}
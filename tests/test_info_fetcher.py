@@ -78,4 +78,26 @@ def test_rocket_stats():
     assert info_manager.rocket_info[1]["successful_launches"] == 3
     assert info_manager.rocket_info[1]["total_launches"] == 4
     assert info_manager.rocket_info[2]["successful_launches"] == 2
-    assert info_manager.rocket_info[2]["total_launches"] == 4
\ No newline at end of file
+    assert info_manager.rocket_info[2]["total_launches"] == 4
+
+def test_static_order_respects_dependencies():
+    info_manager = InfoManager()
+    info_manager.static_file_dict = {"launches": None, "company": None,
+                                     "rockets": None, "launchpads": None}
+    order = info_manager.static_order()
+    assert order.index("launches") > order.index("rockets")
+    assert order.index("launches") > order.index("launchpads")
+    assert set(order) == set(info_manager.static_file_dict)
+
+
+def test_filter_launches_ranges():
+    info_manager = InfoManager()
+    launches = [{"success": True, "flight_number": 1, "date_utc": "2006-03-24T22:30:00.000Z"},
+                {"success": False, "flight_number": 2, "date_utc": "2007-03-21T01:10:00.000Z"},
+                {"success": True, "flight_number": 3, "date_utc": "2008-09-28T23:15:00.000Z"}]
+    with open('launches.json', 'w') as f:
+        json.dump(launches, f, indent='    ')
+    assert info_manager.filter_launches(since=2007, success=True) == launches[2:]
+    assert info_manager.filter_launches(max_flight=2, sort_by="date_utc", reverse=True) == \
+        [launches[1], launches[0]]
+    assert info_manager.filter_launches(year=2006) == launches[:1]
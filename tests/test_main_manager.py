@@ -0,0 +1,51 @@
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.main_manager import MainManager
+from spacexexplorer.registry import EntityRegistry
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset
+from spacexexplorer.textui_manager import TextUIManager
+
+
+def make_main_manager(tmpdir):
+    dataset = make_dataset(60)
+    # two rockets with the same name can only be told apart by id
+    dataset["rockets"][2]["name"] = dataset["rockets"][1]["name"]
+    info_manager = InfoManager(location=str(tmpdir), spacex=SyntheticSpaceX(dataset))
+    info_manager.fetch_static()
+    return MainManager(info_manager, TextUIManager()), dataset
+
+
+def test_detail_views_use_registry(tmpdir, monkeypatch):
+    main, dataset = make_main_manager(tmpdir)
+    shown = []
+    main.ui_manager.show_single_rocket_info = lambda rocket, **extra: shown.append(rocket)
+    main.ui_manager.show_single_launchpad_info = lambda lp, **extra: shown.append(lp)
+
+    def no_file_access(*args):
+        raise AssertionError("detail views must not load static files")
+    main.info_manager.get = no_file_access
+    answers = iter(["2", "3"])
+    monkeypatch.setattr("builtins.input", lambda: next(answers))
+    main.show_rockets_menu()
+    main.show_launchpads_menu()
+    assert shown == [dataset["rockets"][2], dataset["launchpads"][3]]
+    assert main.rocket_ids[2] == dataset["rockets"][2]["id"]
+
+
+def test_registry():
+    registry = EntityRegistry()
+    registry.add("rockets", [{"id": "a", "name": "x"}, {"id": "b", "name": "x"}])
+    assert registry.get("rockets", "b") == {"id": "b", "name": "x"}
+    assert registry.get("rockets", "c") is None
+    assert registry.get("ships", "a") is None
+    assert registry.ids("rockets") == ["a", "b"]
+    assert "rockets" in registry
+
+
+def test_show_launch_stats_includes_analytics(tmpdir, capsys):
+    main, dataset = make_main_manager(tmpdir)
+    main.show_launch_stats()
+    out = capsys.readouterr().out
+    assert "Statistics by years:" in out
+    assert "Launch cadence by rocket:" in out
+    assert dataset["landpads"][0]["name"] in out
+    assert "Success rate of the last 20 launches" in out
@@ -0,0 +1,70 @@
+import json
+
+from spacexexplorer.cli import parse_args
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.profiling import NULL_TIMER, Profiler, profiler
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset
+
+
+def test_disabled_profiler_records_nothing():
+    disabled = Profiler()
+    with disabled.timer("operation"):
+        pass
+    disabled.add("counter")
+    assert disabled.timed("operation")(lambda: 1)() == 1
+    assert disabled.timer("operation") is NULL_TIMER
+    assert disabled.snapshot() == {"operations": {}, "counters": {}}
+
+
+def test_profiler_outputs(tmpdir):
+    enabled = Profiler(enabled=True)
+    with enabled.timer("load"):
+        pass
+    enabled.timed("load")(lambda: None)()
+    enabled.add("bytes_read", 10)
+    enabled.add("bytes_read", 5)
+    data = enabled.snapshot()
+    assert data["operations"]["load"]["calls"] == 2
+    assert data["counters"] == {"bytes_read": 15}
+    assert "load" in enabled.summary()
+    prometheus = enabled.to_prometheus()
+    assert 'spacexexplorer_operation_calls_total{operation="load"} 2' in prometheus
+    assert 'spacexexplorer_counter_total{name="bytes_read"} 15' in prometheus
+    enabled.dump(str(tmpdir / "profile.json"))
+    with open(tmpdir / "profile.json") as f:
+        assert json.load(f) == data
+    enabled.dump(str(tmpdir / "profile.prom"))
+    with open(tmpdir / "profile.prom") as f:
+        assert f.read() == prometheus
+
+
+def test_info_manager_instrumentation(tmpdir):
+    profiler.reset()
+    profiler.enable()
+    try:
+        info_manager = InfoManager(location=str(tmpdir),
+                                   spacex=SyntheticSpaceX(make_dataset(40)))
+        info_manager.fetch_static()
+        info_manager.dataset.invalidate()
+        info_manager.get("launches")
+        info_manager.get("launches")
+        info_manager.filter_launches(success=True)
+        data = profiler.snapshot()
+    finally:
+        profiler.disable()
+        profiler.reset()
+    for name in ("fetch_static", "request.launches", "load.launches", "filter_launches"):
+        assert data["operations"][name]["calls"] >= 1
+    counters = data["counters"]
+    assert counters["bytes_written"] > 0
+    assert counters["bytes_read"] > 0
+    assert counters["dataset.hits"] >= 1
+    assert counters["filter.total"] == 40
+    assert 0 < counters["filter.matched"] < 40
+
+
+def test_parse_profile_args():
+    args = parse_args(["--profile", "--profile-output", "metrics.prom"])
+    assert args.profile
+    assert args.profile_output == "metrics.prom"
+    assert not parse_args([]).profile
@@ -0,0 +1,55 @@
+from spacexexplorer.query import LaunchIndex
+
+import pytest
+
+
+def make_launches():
+    return [{"flight_number": n, "rocket": "r%d" % (n % 2), "launchpad": "lp%d" % (n % 3),
+             "success": n % 4 != 0, "date_utc": "%d-%02d-01T00:00:00.000Z" % (2006 + n // 12, n % 12 + 1),
+             "name": "Launch %d" % n}
+            for n in range(1, 61)]
+
+
+@pytest.fixture
+def index():
+    return LaunchIndex(make_launches())
+
+
+def brute_force(launches, **filters):
+    return [launch for launch in launches
+            if all(launch[key] == value for key, value in filters.items())]
+
+
+def test_equality_filters_intersect(index):
+    result = index.query({"rocket": "r1", "launchpad": "lp2", "success": True})
+    assert result == brute_force(index.launches, rocket="r1", launchpad="lp2", success=True)
+    assert result
+
+
+def test_year_and_month(index):
+    result = index.query({"year": 2008, "month": 3})
+    assert [launch["date_utc"][:7] for launch in result] == ["2008-03"]
+
+
+def test_date_range(index):
+    result = index.query(since=2009, until="2010-06")
+    assert result
+    assert all("2009" <= launch["date_utc"] < "2010-06" for launch in result)
+    assert len(result) == 17
+
+
+def test_flight_range_with_filter(index):
+    result = index.query({"rocket": "r0"}, min_flight=10, max_flight=20)
+    assert [launch["flight_number"] for launch in result] == [10, 12, 14, 16, 18, 20]
+
+
+def test_sort_limit_offset(index):
+    result = index.query({"success": False}, sort_by="flight_number", reverse=True,
+                         limit=3, offset=1)
+    assert [launch["flight_number"] for launch in result] == [56, 52, 48]
+    assert [launch["flight_number"] for launch in index.query(limit=2, offset=5)] == [6, 7]
+
+
+def test_unindexed_and_missing_values(index):
+    assert index.query({"name": "Launch 7"})[0]["flight_number"] == 7
+    assert index.query({"rocket": "unknown"}) == []
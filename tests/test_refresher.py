@@ -0,0 +1,94 @@
+from spacexexplorer.cache import StaticCache
+from spacexexplorer.fetcher import AsyncFetcher
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.main_manager import MainManager
+from spacexexplorer.refresher import BackgroundRefresher
+from spacexexplorer.textui_manager import TextUIManager
+
+import time
+from aiohttp import web
+
+
+def make_routes(rockets):
+    return {"/company": {}, "/landpads": [],
+            "/launchpads": [{"id": "lp1", "full_name": "Pad 1"}],
+            "/rockets": rockets,
+            "/launches": [{"success": True, "rocket": "r1", "launchpad": "lp1",
+                           "date_utc": "2006-03-24T22:30:00.000Z"}]}
+
+
+def test_refresh_swaps_snapshot_and_menus(stub_server):
+    rockets = [{"id": "r1", "name": "Falcon 1"}]
+
+    async def get_rockets(request):
+        return web.json_response(rockets)
+    server = stub_server(make_routes(get_rockets))
+    info_manager = InfoManager(fetcher=AsyncFetcher(base_url=server.url),
+                               cache=StaticCache("cache", ttls={"rockets": 0}))
+    info_manager.fetch_static(concurrent=True)
+    main = MainManager(info_manager, TextUIManager())
+    old_table = info_manager.launch_table
+    rockets.append({"id": "r9", "name": "Starship"})
+    refresher = BackgroundRefresher(info_manager, 0.05, concurrent=True)
+    refresher.add_listener(main.on_refresh)
+    refresher.start()
+    deadline = time.time() + 5
+    while "r9" not in info_manager.rocket_info and time.time() < deadline:
+        time.sleep(0.01)
+    refresher.stop()
+    refresher.join()
+    assert refresher.last_error is None
+    assert info_manager.launch_table is not old_table
+    assert info_manager.rocket_info["r1"]["total_launches"] == 1
+    assert any("Starship" in repr(item) for item in main.launches_menu)
+    assert info_manager.data_age() < 5
+
+
+def test_failed_refresh_keeps_data(stub_server, capsys):
+    server = stub_server(make_routes([{"id": "r1", "name": "Falcon 1"}]))
+    info_manager = InfoManager(fetcher=AsyncFetcher(base_url=server.url, retries=0))
+    info_manager.fetch_static(concurrent=True)
+    server.routes.pop("/rockets")
+    refresher = BackgroundRefresher(info_manager, 60, concurrent=True)
+    assert not refresher.refresh()
+    assert refresher.last_error is not None
+    assert info_manager.rocket_info["r1"]["total_launches"] == 1
+    # the menu tells the data is not being updated
+    main = MainManager(info_manager, TextUIManager())
+    main.refresher = refresher
+    main.show_status()
+    out = capsys.readouterr().out
+    assert "Data updated just now" in out and "Last refresh failed" in out
+    refresher.refreshing.set()
+    main.show_status()
+    assert "Refreshing data in the background..." in capsys.readouterr().out
+
+
+def test_refresh_revalidates_fresh_cache(stub_server):
+    routes = make_routes([{"id": "r1", "name": "Falcon 1"}])
+    launches = routes["/launches"]
+    requests = []
+
+    async def get_launches(request):
+        requests.append(request.path)
+        return web.json_response(launches)
+    routes["/launches"] = get_launches
+    server = stub_server(routes)
+    info_manager = InfoManager(fetcher=AsyncFetcher(base_url=server.url), cache=StaticCache("cache"))
+    info_manager.fetch_static(concurrent=True)
+    refreshes = []
+    refresher = BackgroundRefresher(info_manager, 60, concurrent=True)
+    refresher.add_listener(lambda: refreshes.append(True))
+    # the default TTLs keep everything fresh, the refresh still asks the API
+    launches.append(dict(launches[0], date_utc="2007-03-21T01:10:00.000Z"))
+    assert refresher.refresh()
+    assert len(requests) == 2
+    assert len(info_manager.get("launches")) == 2 and len(refreshes) == 1
+    assert info_manager.rocket_info["r1"]["total_launches"] == 2
+    # nothing changed, nothing is swapped
+    dataset, launch_table = info_manager.dataset, info_manager.launch_table
+    analytics = info_manager.analytics()
+    assert refresher.refresh()
+    assert len(requests) == 3 and len(refreshes) == 1
+    assert info_manager.dataset is dataset and info_manager.launch_table is launch_table
+    assert info_manager.analytics() is analytics
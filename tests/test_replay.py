@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from spacexexplorer.main_manager import MainManager
+from spacexexplorer.replay import (ScriptedInput, format_summary, generate_session, percentile,
+                                   replay, run_session, summarize, synthetic_manager)
+from spacexexplorer.textui_manager import TextUIManager
+
+
+@pytest.fixture
+def info_manager(tmpdir):
+    return synthetic_manager(str(tmpdir), 200)
+
+
+def test_scripted_input():
+    read = ScriptedInput(["1", "e"])
+    assert (read(), read()) == ("1", "e")
+    with pytest.raises(EOFError):
+        read()
+
+
+def test_run_session(info_manager):
+    timings = run_session(info_manager, ["0", "3", "1", "e"])
+    assert [name for name, _ in timings] == ["About company", "Browse rockets"]
+    # a session may also end without 'e'
+    assert [name for name, _ in run_session(info_manager, ["5"])] == ["Show launch statistics"]
+
+
+def test_generated_sessions_replay(info_manager):
+    main = MainManager(info_manager, TextUIManager())
+    rng = random.Random(1)
+    sessions = [generate_session(main, rng, actions=4) for _ in range(20)]
+    assert all(session[-1] == "e" for session in sessions)
+    report = replay(info_manager, sessions, workers=4)
+    assert sum(stats["count"] for stats in report["actions"].values()) == 80
+    for stats in report["actions"].values():
+        assert stats["p50"] <= stats["p90"] <= stats["p99"] <= stats["max"]
+    assert "Browse launches" in format_summary(report)
+
+
+def test_replay_on_processes(info_manager):
+    sessions = [["4", "e"], ["1", "0", "2", "e"]]
+    report = replay(info_manager, sessions, workers=2, processes=True)
+    assert report["mode"] == "processes"
+    assert {name: stats["count"] for name, stats in report["actions"].items()} == \
+        {"Search": 1, "Browse launches": 1}
+
+
+def test_percentiles():
+    values = list(range(1, 101))
+    assert [percentile(values, p) for p in (50, 90, 99, 100)] == [50, 90, 99, 100]
+    assert percentile([7.0], 99) == 7.0
+    summary = summarize([("a", 0.001), ("a", 0.003), ("b", 0.002)])
+    assert summary["a"]["count"] == 2 and summary["a"]["max"] == 3.0
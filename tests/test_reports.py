@@ -0,0 +1,81 @@
+import csv
+import json
+
+import pytest
+
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.reports import (MANIFEST_NAME, REPORTS_DIR, export_reports, render_csv,
+                                    render_markdown, stats_jobs)
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset
+
+
+@pytest.fixture
+def loaded(tmpdir):
+    dataset = make_dataset(120)
+    info_manager = InfoManager(location=str(tmpdir.mkdir("data")), spacex=SyntheticSpaceX(dataset))
+    info_manager.fetch_static()
+    return info_manager, dataset
+
+
+def test_save_static_writes_reports(loaded, tmpdir):
+    info_manager, dataset = loaded
+    result = info_manager.save_static(str(tmpdir / "export"), workers=1)
+    reports = tmpdir / "export" / REPORTS_DIR
+    jobs = info_manager.report_jobs()
+    assert result == {"written": len(jobs), "skipped": 0}
+    rocket = dataset["rockets"][0]
+    with open(reports / "rockets" / f"{rocket['id']}.csv", newline='') as f:
+        rows = list(csv.reader(f))
+    assert len(rows) - 1 == info_manager.rocket_info[rocket["id"]]["total_launches"]
+    with open(reports / "launchpads" / f"{dataset['launchpads'][0]['id']}.json") as f:
+        report = json.load(f)
+    assert report["title"] == dataset["launchpads"][0]["full_name"]
+    with open(reports / "stats" / "months.md") as f:
+        assert "| Jan |" in f.read()
+    assert not list(reports.visit("*.tmp"))
+    # the reports are not part of the imported data
+    imported = InfoManager(location=str(tmpdir.mkdir("imported")), spacex=None)
+    imported.load_static(str(tmpdir / "export"))
+    assert imported.launch_stats == info_manager.launch_stats
+
+
+def test_unchanged_reports_are_skipped(loaded, tmpdir):
+    info_manager, dataset = loaded
+    destination = tmpdir / "reports"
+    jobs = info_manager.report_jobs()
+    export_reports(destination, jobs, workers=1)
+    assert export_reports(destination, jobs, workers=1) == {"written": 0, "skipped": len(jobs)}
+    # only the reports of the launch rocket and launchpad change
+    launch = dict(info_manager.get("launches")[0], name="Renamed")
+    changed = [dict(job, rows=[list(row) for row in job["rows"]]) for job in jobs]
+    for job in changed:
+        for row in job["rows"]:
+            if row[0] == launch["flight_number"]:
+                row[2] = launch["name"]
+    assert export_reports(destination, changed, workers=1)["written"] == 2
+    # a deleted file is written again, a report that is no longer exported is removed
+    (destination / f"{jobs[0]['path']}.md").remove()
+    assert export_reports(destination, changed[:-1], workers=1)["written"] == 1
+    assert not (destination / f"{jobs[-1]['path']}.csv").exists()
+    with open(destination / MANIFEST_NAME) as f:
+        assert len(json.load(f)) == len(jobs) - 1
+
+
+def test_parallel_export_matches_serial(tmpdir):
+    jobs = [{"path": f"items/{number}", "title": f"Item {number}", "summary": {"count": number},
+             "header": ["a", "b"], "rows": [[number, "x|y"]] * number}
+            for number in range(12)]
+    assert export_reports(tmpdir / "serial", jobs, workers=1)["written"] == 12
+    assert export_reports(tmpdir / "parallel", jobs, workers=2)["written"] == 12
+    for job in jobs:
+        for fmt in ("csv", "json", "md"):
+            name = f"{job['path']}.{fmt}"
+            assert (tmpdir / "parallel" / name).read() == (tmpdir / "serial" / name).read()
+
+
+def test_renderers():
+    job = stats_jobs({"years": {2007: 1, 2006: 2}})[0]
+    assert render_csv(job).splitlines() == ["year,launches", "2006,2", "2007,1"]
+    markdown = render_markdown(job)
+    assert markdown.startswith("# Launches by year\n")
+    assert "- Total launches: 3" in markdown and "| 2006 | 2 |" in markdown
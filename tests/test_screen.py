@@ -0,0 +1,22 @@
+from spacexexplorer.screen import CLEAR_BELOW, Screen, bar_chart, sparkline
+
+
+def test_render_rewrites_changed_lines_only():
+    screen = Screen()
+    assert screen.render(["a", "b", "c"]) == "a\nb\nc\n"
+    text = screen.render(["a", "x", "c", "d"], below=1)
+    assert text == "\x1b[4A\x1b[1B\r\x1b[2Kx\n\x1b[1B\r\x1b[2Kd\n" + CLEAR_BELOW
+    assert screen.render(["a"]) == "\x1b[4A\x1b[1B" + CLEAR_BELOW
+
+
+def test_bar_chart():
+    assert bar_chart([(2019, 5), (2020, 10)], width=4) == ["2019 |##  |  5",
+                                                          "2020 |####| 10"]
+    assert bar_chart([("F9", 4, 3)], width=4) == ["F9 |###-| 4"]
+    assert bar_chart([("none", 0)], width=2) == ["none |  | 0"]
+
+
+def test_sparkline():
+    assert sparkline([0, 7, 14]) == "_=#"
+    assert sparkline([1, 1]) == sparkline([5, 5])
+    assert sparkline([]) == ""
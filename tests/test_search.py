@@ -0,0 +1,109 @@
+import time
+
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.main_manager import MainManager
+from spacexexplorer.search import SearchIndex, tokenize
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset
+from spacexexplorer.textui_manager import TextUIManager
+
+
+def make_index():
+    return SearchIndex([
+        (0, [("Starlink 4-1", 3), ("Batch of Starlink satellites", 1)]),
+        (1, [("CRS-20", 3), ("Cargo resupply to the station", 1)]),
+        (2, [("Crew-1", 3), ("Crew rotation to the station", 1)]),
+        (3, [("Starship SN8", 3), (None, 1)]),
+    ])
+
+
+def test_tokenize():
+    assert tokenize("Falcon 9, Block-5!") == ["falcon", "9", "block", "5"]
+    assert tokenize(None) == []
+
+
+def test_search_ranking_and_prefix():
+    index = make_index()
+    # the name weighs more than the details
+    assert [key for key, _ in index.search("crew")] == [2]
+    assert [key for key, _ in index.search("station")] in ([1, 2], [2, 1])
+    # the last word is a prefix unless followed by a space
+    assert sorted(key for key, _ in index.search("star")) == [0, 3]
+    assert index.search("star ") == []
+    assert index.search("star", prefix=False) == []
+    assert [key for key, _ in index.search("starl", limit=1)] == [0]
+
+
+def test_search_requires_every_word():
+    index = make_index()
+    assert [key for key, _ in index.search("station cargo")] == [1]
+    assert index.search("station starlink ") == []
+    assert index.search("unknown") == []
+    assert index.search("  ") == []
+
+
+def make_info_manager(tmpdir, launches=300):
+    dataset = make_dataset(launches)
+    info_manager = InfoManager(location=str(tmpdir), spacex=SyntheticSpaceX(dataset))
+    info_manager.fetch_static()
+    return info_manager, dataset
+
+
+def test_filter_launches_with_text(tmpdir):
+    info_manager, dataset = make_info_manager(tmpdir)
+    word = dataset["launches"][0]["details"].split()[0]
+    expected = [launch for launch in dataset["launches"]
+                if word in tokenize(launch["name"]) + tokenize(launch["details"])]
+    found = info_manager.filter_launches(text=word + " ")
+    assert sorted(launch["id"] for launch in found) == sorted(launch["id"] for launch in expected)
+    # a launch named after the word comes first
+    if any(word in tokenize(launch["name"]) for launch in expected):
+        assert word in tokenize(found[0]["name"])
+    rocket = dataset["rockets"][1]["id"]
+    combined = info_manager.filter_launches(text=word + " ", rocket=rocket,
+                                            sort_by="flight_number")
+    assert combined == sorted((launch for launch in expected if launch["rocket"] == rocket),
+                              key=lambda launch: launch["flight_number"])
+    assert list(info_manager.iter_launches(text=word + " ", limit=3)) \
+        == info_manager.filter_launches(text=word + " ")[:3]
+
+
+def test_search_entities(tmpdir):
+    info_manager, dataset = make_info_manager(tmpdir, launches=20)
+    found = info_manager.search_entities("boosters")
+    assert {kind for kind, _ in found} == {"landpads"}
+    assert len(found) == len(dataset["landpads"])
+
+
+def test_search_index_follows_data(tmpdir):
+    info_manager, dataset = make_info_manager(tmpdir, launches=20)
+    index = info_manager.search_index()
+    assert info_manager.search_index() is index
+    launches = dataset["launches"] + [dict(dataset["launches"][0], id="new",
+                                           name="Zyzzyva")]
+    info_manager.dataset.put("launches", launches)
+    assert info_manager.search_index() is not index
+    assert [launch["id"] for launch in info_manager.search("zyzz")] == ["new"]
+
+
+def test_search_is_fast(tmpdir):
+    info_manager, dataset = make_info_manager(tmpdir, launches=5000)
+    info_manager.search_index()
+    word = dataset["launches"][0]["details"].split()[0]
+    info_manager.search(word, limit=10)
+    start = time.perf_counter()
+    for _ in range(100):
+        info_manager.search(word, limit=10)
+    assert (time.perf_counter() - start) / 100 < 0.005
+
+
+def test_main_manager_search(tmpdir, monkeypatch, capsys):
+    info_manager, dataset = make_info_manager(tmpdir, launches=20)
+    info_manager.enricher.offline = True
+    main = MainManager(info_manager, TextUIManager())
+    shown = []
+    main.ui_manager.show_single_launch_info = lambda launch, **extra: shown.append(launch)
+    name = dataset["launches"][4]["name"]
+    answers = iter([name, "0"])
+    monkeypatch.setattr("builtins.input", lambda: next(answers))
+    main.show_search()
+    assert shown[0]["name"] == name
@@ -0,0 +1,99 @@
+import json
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from spacexexplorer.cache import StaticCache
+from spacexexplorer.fetcher import AsyncFetcher
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.server import QueryServer, ResponseCache, parse_launch_query
+from spacexexplorer.testing import (BackgroundServer, StubSpaceXServer,
+                                    SyntheticSpaceX, make_dataset)
+
+
+def get(url, headers=None):
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        body = error.read()
+        return error.code, error.headers, json.loads(body) if body else None
+
+
+@pytest.fixture
+def served(tmpdir):
+    dataset = make_dataset(80)
+    with StubSpaceXServer.for_dataset(dataset) as upstream:
+        info_manager = InfoManager(fetcher=AsyncFetcher(base_url=upstream.url),
+                                   cache=StaticCache(str(tmpdir)),
+                                   spacex=SyntheticSpaceX(dataset))
+        info_manager.fetch_static(concurrent=True)
+        server = QueryServer(info_manager, cache_size=4)
+        with BackgroundServer(server.make_app()) as background:
+            yield server, background.url, dataset
+
+
+def test_launches_and_etag(served):
+    server, url, dataset = served
+    rocket = dataset["rockets"][1]["id"]
+    status, headers, launches = get(f"{url}/launches?rocket={rocket}&success=true")
+    assert status == 200
+    assert launches == server.info_manager.filter_launches(rocket=rocket, success=True)
+    etag = headers["ETag"]
+    status, headers, _ = get(f"{url}/launches?success=true&rocket={rocket}",
+                             {"If-None-Match": etag})
+    assert status == 304
+    assert headers["ETag"] == etag
+    assert server.cache.hits == 1
+    status, _, error = get(f"{url}/launches?success=maybe")
+    assert status == 400
+    assert "success" in error["error"]
+
+
+def test_details_and_stats(served):
+    server, url, dataset = served
+    _, _, rockets = get(f"{url}/rockets")
+    assert sum(rocket["total_launches"] for rocket in rockets) == 80
+    launchpad = dataset["launchpads"][2]["id"]
+    _, _, details = get(f"{url}/launchpads/{launchpad}")
+    info = server.info_manager.launchpad_info[launchpad]
+    assert details["total_launches"] == info["total_launches"]
+    assert details["full_name"] == info["name"]
+    assert get(f"{url}/rockets/unknown")[0] == 404
+    _, _, stats = get(f"{url}/stats")
+    assert sum(stats["years"].values()) == 80
+
+
+def test_concurrent_requests_and_refresh(served):
+    server, url, _ = served
+    paths = [f"{url}/launches?year={year}" for year in range(2006, 2012)] * 5
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(get, paths))
+    assert all(status == 200 for status, _, _ in results)
+    assert server.cache.stats()["size"] == 4
+    # the refresher thread leaves the clearing to the event loop
+    assert server.loop is not None
+    server.on_refresh()
+    _, _, status = get(f"{url}/status")
+    assert status["cache"]["size"] == 0
+    assert server.cache.stats()["size"] == 0
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(2)
+    cache.put("a", (b"a", "1"))
+    cache.put("b", (b"b", "2"))
+    cache.get("a")
+    cache.put("c", (b"c", "3"))
+    assert cache.get("b") is None
+    assert cache.get("a") == (b"a", "1")
+
+
+def test_parse_launch_query():
+    assert parse_launch_query({"success": "False", "limit": "3", "rocket": "x"}) == \
+        {"success": False, "limit": 3, "rocket": "x"}
+    with pytest.raises(ValueError):
+        parse_launch_query({"colour": "red"})
@@ -0,0 +1,63 @@
+import pytest
+
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.snapshot import SNAPSHOT_NAME, SnapshotError, read_snapshot
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset
+
+
+@pytest.fixture
+def loaded(tmpdir):
+    info_manager = InfoManager(location=str(tmpdir / "data"),
+                               spacex=SyntheticSpaceX(make_dataset(100)))
+    (tmpdir / "data").mkdir()
+    info_manager.fetch_static()
+    info_manager.filter_launches(success=True)
+    info_manager.analytics()
+    return info_manager
+
+
+def test_snapshot_round_trip(loaded, tmpdir, monkeypatch):
+    path = str(tmpdir / "dataset.snapshot")
+    loaded.save_snapshot(path)
+    restored = InfoManager(location=str(tmpdir), spacex=SyntheticSpaceX())
+
+    def no_recompute(*args):
+        raise AssertionError("statistics must come from the snapshot")
+    monkeypatch.setattr(InfoManager, "record_launch", no_recompute)
+    monkeypatch.setattr(InfoManager, "ingest_static", no_recompute)
+    restored.load_snapshot(path)
+    assert restored.get("launches") == loaded.get("launches")
+    assert restored.rocket_info == loaded.rocket_info
+    assert restored.launch_stats == loaded.launch_stats
+    assert restored.fetched_at == loaded.fetched_at
+    assert restored.analytics() == loaded.analytics()
+    assert list(restored.launch_table.timestamps) == list(loaded.launch_table.timestamps)
+    assert restored.launch_table.rockets.labels == loaded.launch_table.rockets.labels
+    assert restored.launch_index.launches is restored.get("launches")
+    assert restored.filter_launches(success=True) == loaded.filter_launches(success=True)
+    assert restored.entity("rockets", next(iter(loaded.rocket_info))) is not None
+    restored.launch_table.append(loaded.get("launches")[0])
+    assert len(restored.launch_table) == 101
+
+
+def test_snapshot_checksum(loaded, tmpdir):
+    path = tmpdir / "dataset.snapshot"
+    loaded.save_snapshot(str(path))
+    content = bytearray(path.read_binary())
+    content[-10] ^= 0xFF
+    path.write_binary(bytes(content))
+    with pytest.raises(SnapshotError, match="checksum"):
+        read_snapshot(path)
+    path.write_binary(b"{}")
+    with pytest.raises(SnapshotError):
+        read_snapshot(path)
+
+
+def test_save_static_writes_snapshot(loaded, tmpdir):
+    loaded.save_static(str(tmpdir / "export"))
+    assert (tmpdir / "export" / SNAPSHOT_NAME).exists()
+    imported = InfoManager(location=str(tmpdir / "imported"), spacex=SyntheticSpaceX())
+    (tmpdir / "imported").mkdir()
+    imported.load_static(str(tmpdir / "export"))
+    assert imported.launchpad_info == loaded.launchpad_info
+    assert (tmpdir / "imported" / "launches.json").exists()
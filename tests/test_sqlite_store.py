@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from spacexexplorer.cache import StaticCache
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.sqlite_store import STORE_NAME, SQLiteStore
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset
+
+QUERIES = [
+    {"success": True},
+    {"success": False, "sort_by": "date_utc", "reverse": True},
+    {"upcoming": True},
+    {"year": 2012, "month": 3},
+    {"since": "2014", "until": "2016-06", "sort_by": "name"},
+    {"min_flight": 10, "max_flight": 40, "limit": 5, "offset": 3},
+    {"reverse": True, "limit": 4},
+    {"sort_by": "success", "limit": 10},
+    {"sort_by": "details", "offset": 100},
+    {"name": "unknown"},
+    {"cores": []},
+]
+
+
+@pytest.fixture
+def managers(tmpdir):
+    dataset = make_dataset(300)
+    dataset["launches"][7]["success"] = None
+    memory = InfoManager(location=str(tmpdir.mkdir("files")), spacex=SyntheticSpaceX(dataset))
+    memory.fetch_static()
+    sqlite = InfoManager(location=str(tmpdir.mkdir("sqlite")), spacex=SyntheticSpaceX(dataset),
+                         backend="sqlite")
+    sqlite.fetch_static()
+    return memory, sqlite, dataset
+
+
+def test_queries_match_in_memory_index(managers):
+    memory, sqlite, dataset = managers
+    rocket = dataset["rockets"][1]["id"]
+    launchpad = dataset["launchpads"][2]["id"]
+    for query in QUERIES + [{"rocket": rocket}, {"rocket": rocket, "launchpad": launchpad,
+                                                 "sort_by": "flight_number", "reverse": True}]:
+        assert sqlite.filter_launches(**query) == memory.filter_launches(**query), query
+        assert list(sqlite.iter_launches(**query)) == memory.filter_launches(**query), query
+    assert sqlite.filter_launches() == memory.filter_launches()
+
+
+def test_statistics_match_launch_table(managers):
+    memory, sqlite, dataset = managers
+    assert sqlite.launch_stats == memory.launch_stats
+    assert sqlite.rocket_info == memory.rocket_info
+    assert sqlite.launchpad_info == memory.launchpad_info
+    assert sqlite.store.group_by("rocket") == memory.launch_table.group_by("rocket")
+    assert sqlite.store.read("rockets") == dataset["rockets"]
+    assert sqlite.store.read("company") == dataset["company"]
+
+
+def test_store_persists_across_runs(tmpdir):
+    dataset = make_dataset(50)
+    first = InfoManager(cache=StaticCache(str(tmpdir)), spacex=SyntheticSpaceX(dataset),
+                        backend="sqlite")
+    first.fetch_static()
+    second = InfoManager(cache=StaticCache(str(tmpdir)), spacex=None, backend="sqlite")
+    second.store.write = lambda *args: pytest.fail("unchanged files must not be copied again")
+    second.fetch_static(offline=True)
+    assert second.filter_launches(success=True) == first.filter_launches(success=True)
+    assert second.rocket_info == first.rocket_info
+
+
+def test_readers_see_complete_writes(tmpdir):
+    path = tmpdir / STORE_NAME
+    writer = SQLiteStore(path)
+    launches = make_dataset(200)["launches"]
+    writer.write("launches", launches)
+    sizes = set()
+
+    def read():
+        reader = SQLiteStore(path)
+        for _ in range(20):
+            sizes.add(len(reader.query_launches()))
+        reader.close()
+    thread = threading.Thread(target=read)
+    thread.start()
+    for size in (100, 200, 100):
+        writer.write("launches", launches[:size])
+    thread.join()
+    assert sizes <= {100, 200}
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        InfoManager(backend="postgres")
@@ -0,0 +1,43 @@
+import sys
+import json
+import subprocess
+
+from spacexexplorer.benchmark import import_times
+from spacexexplorer.cache import StaticCache
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.testing import SyntheticSpaceX, make_dataset
+
+NETWORK_MODULES = ("aiohttp", "spacexpy")
+# only needed by exports, the HTTP service and the SQLite backend
+DEFERRED_MODULES = ("multiprocessing", "concurrent", "sqlite3")
+
+OFFLINE_RUN = """
+import sys, json
+from spacexexplorer.cache import StaticCache
+from spacexexplorer.cli import parse_args
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.main_manager import MainManager
+from spacexexplorer.textui_manager import TextUIManager
+info_manager = InfoManager(cache=StaticCache(sys.argv[1]), storage_format="jsonl")
+info_manager.fetch_static(concurrent=True, offline=True)
+MainManager(info_manager, TextUIManager())
+print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})))
+"""
+
+
+def test_cli_import_skips_network_stack():
+    times = import_times("spacexexplorer.cli")
+    assert times["spacexexplorer.cli"] > 0
+    assert not [name for name in times if name.split('.')[0] in NETWORK_MODULES]
+    assert not [name for name in times if name.split('.')[0] in DEFERRED_MODULES]
+
+
+def test_offline_start_skips_network_stack(tmpdir):
+    cache = StaticCache(str(tmpdir))
+    InfoManager(cache=cache, storage_format="jsonl",
+                spacex=SyntheticSpaceX(make_dataset(20))).fetch_static()
+    process = subprocess.run([sys.executable, "-c", OFFLINE_RUN, str(tmpdir)],
+                             capture_output=True, text=True, check=True)
+    modules = json.loads(process.stdout)
+    assert "spacexexplorer" in modules
+    assert not set(NETWORK_MODULES) & set(modules)
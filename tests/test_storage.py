@@ -0,0 +1,83 @@
+from spacexexplorer.dataset import Dataset
+from spacexexplorer.fetcher import AsyncFetcher
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.storage import RecordWriter, iter_json_array, load_data, write_data
+
+import json
+import pytest
+
+
+RECORDS = [{"name": "Ünïcode ✓", "details": "line\nbreak ] }", "cores": [{"core": 1}]},
+           {"name": "second", "flight_number": 12345, "success": None},
+           {}]
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_iter_json_array_chunks(size):
+    data = json.dumps(RECORDS, ensure_ascii=False).encode()
+    assert list(iter_json_array(chunked(data, size))) == RECORDS
+    assert list(iter_json_array(chunked(b" [ 1, 22 ,333 ] ", size))) == [1, 22, 333]
+
+
+def test_iter_json_array_errors():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'[{"a": 1}, {"b"']))
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"message": "error"}']))
+
+
+def test_writer_matches_indented_dump():
+    for records in (RECORDS, []):
+        with RecordWriter("launches.json") as writer:
+            for record in records:
+                writer.write(record)
+        with open("launches.json") as f:
+            assert f.read() == json.dumps(records, indent='    ')
+
+
+def test_jsonl_roundtrip_and_lazy_view():
+    write_data("launches.jsonl", RECORDS, "jsonl")
+    with open("launches.jsonl") as f:
+        assert len(f.readlines()) == len(RECORDS)
+    assert load_data("launches.jsonl", "jsonl") == RECORDS
+    lazy = Dataset(".", lazy=["launches"], formats={"launches": "jsonl"}).get("launches")
+    assert list(lazy) == RECORDS
+
+
+def test_failed_write_keeps_previous_file():
+    write_data("launches.json", RECORDS)
+    with pytest.raises(TypeError):
+        write_data("launches.json", [{"bad": object()}])
+    assert load_data("launches.json") == RECORDS
+
+
+def test_concurrent_writers_of_one_file(tmpdir):
+    path = tmpdir / "launches.jsonl"
+    first = RecordWriter(path, "jsonl")
+    second = RecordWriter(path, "jsonl")
+    first.write(RECORDS[0])
+    second.write(RECORDS[1])
+    first.commit()
+    second.commit()
+    assert load_data(path, "jsonl") == [RECORDS[1]]
+    assert tmpdir.listdir() == [path]
+
+
+def test_streamed_fetch_static(stub_server):
+    launches = [{"id": str(n), "success": n % 2 == 0, "rocket": "r1", "launchpad": "lp1",
+                 "date_utc": "2020-01-%02dT00:00:00.000Z" % (n + 1)} for n in range(20)]
+    server = stub_server({"/company": {}, "/landpads": [],
+                          "/launchpads": [{"id": "lp1", "full_name": "Pad 1"}],
+                          "/rockets": [{"id": "r1", "name": "Falcon 1"}],
+                          "/launches": launches})
+    info_manager = InfoManager(fetcher=AsyncFetcher(base_url=server.url),
+                               storage_format="jsonl", lazy=True)
+    info_manager.fetch_static(concurrent=True)
+    assert info_manager.rocket_info["r1"]["successful_launches"] == 10
+    assert info_manager.launch_stats["years"] == {2020: 20}
+    assert list(info_manager.get("launches")) == launches
+    assert len(info_manager.filter_launches(success=False)) == 10
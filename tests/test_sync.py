@@ -0,0 +1,101 @@
+from spacexexplorer.cache import StaticCache
+from spacexexplorer.fetcher import AsyncFetcher
+from spacexexplorer.info_manager import InfoManager
+from spacexexplorer.main_manager import MainManager
+from spacexexplorer.textui_manager import TextUIManager
+
+from aiohttp import web
+
+
+def launch(id, flight, date, success=True, upcoming=False):
+    return {"id": id, "flight_number": flight, "rocket": "r1", "launchpad": "lp1",
+            "success": success, "upcoming": upcoming, "date_utc": date, "date_local": date}
+
+
+LAUNCHES = [launch("a", 1, "2020-01-01T00:00:00.000Z"),
+            launch("b", 2, "2020-02-01T00:00:00.000Z", success=False),
+            launch("c", 3, "2020-03-01T00:00:00.000Z", success=None, upcoming=True)]
+CHANGES = [launch("b", 2, "2020-02-01T00:00:00.000Z", success=False),
+           launch("c", 3, "2020-03-01T00:00:00.000Z"),
+           launch("d", 4, "2021-04-01T00:00:00.000Z")]
+
+
+def make_server(stub_server, queries, changes=CHANGES):
+    async def query(request):
+        queries.append(await request.json())
+        return web.json_response({"docs": changes})
+    return stub_server({"/company": {}, "/landpads": [],
+                        "/launchpads": [{"id": "lp1", "full_name": "Pad 1"}],
+                        "/rockets": [{"id": "r1", "name": "Falcon 1"}],
+                        "/launches": LAUNCHES,
+                        "/launches/query": query})
+
+
+def test_sync_applies_deltas(stub_server):
+    queries = []
+    server = make_server(stub_server, queries)
+    info_manager = InfoManager(fetcher=AsyncFetcher(base_url=server.url),
+                               cache=StaticCache("cache"))
+    info_manager.fetch_static(concurrent=True)
+    assert info_manager.rocket_info["r1"]["successful_launches"] == 1
+    assert info_manager.sync_launches() == {"added": 1, "updated": 1}
+    events, _ = info_manager.changes.unseen()
+    assert [(event["event"], event["id"], event.get("set")) for event in events] == \
+        [("modified", "c", {"success": True, "upcoming": False}), ("added", "d", None)]
+    assert queries[0]["query"]["$or"][0] == {"date_utc": {"$gte": "2020-02-01T00:00:00.000Z"}}
+    assert queries[0]["query"]["$or"][1] == {"_id": {"$in": ["c"]}}
+    assert [l["id"] for l in info_manager.get("launches")] == ["a", "b", "c", "d"]
+    assert info_manager.rocket_info["r1"] == {"name": "Falcon 1", "successful_launches": 3,
+                                              "total_launches": 4}
+    assert info_manager.launch_stats["years"] == {2020: 3, 2021: 1}
+    assert len(info_manager.filter_launches(success=True)) == 3
+    assert info_manager.filter_launches(upcoming=True) == []
+    expected = InfoManager()
+    expected.ingest_static("rockets", [{"id": "r1", "name": "Falcon 1"}])
+    expected.ingest_static("launchpads", [{"id": "lp1", "full_name": "Pad 1"}])
+    expected.ingest_static("launches", info_manager.get("launches"))
+    assert expected.launch_table.columns() == info_manager.launch_table.columns()
+    assert info_manager.sync_launches() == {"added": 0, "updated": 0}
+
+
+def test_incremental_fetch_static(stub_server):
+    queries = []
+    server = make_server(stub_server, queries)
+    InfoManager(fetcher=AsyncFetcher(base_url=server.url),
+                cache=StaticCache("cache")).fetch_static(concurrent=True)
+    info_manager = InfoManager(fetcher=AsyncFetcher(base_url=server.url),
+                               cache=StaticCache("cache", ttls={"launches": 0}))
+    info_manager.fetch_static(concurrent=True, incremental=True)
+    assert server.requests.count("/launches") == 1
+    assert len(queries) == 1
+    assert len(info_manager.cache.load("launches")) == 4
+
+
+def test_sync_launch_on_unknown_launchpad(stub_server):
+    changes = CHANGES + [dict(launch("e", 5, "2021-05-01T00:00:00.000Z"), launchpad="lp2")]
+    server = make_server(stub_server, [], changes)
+    info_manager = InfoManager(fetcher=AsyncFetcher(base_url=server.url))
+    info_manager.fetch_static(concurrent=True)
+    # the new launchpad is only counted once the launchpads are fetched again
+    assert info_manager.sync_launches() == {"added": 2, "updated": 1}
+    assert "lp2" not in info_manager.launchpad_info
+    assert info_manager.launchpad_info["lp1"]["total_launches"] == 4
+    assert info_manager.rocket_info["r1"]["total_launches"] == 5
+    assert info_manager.launch_stats["years"] == {2020: 3, 2021: 2}
+    assert len(info_manager.filter_launches(launchpad="lp2")) == 1
+
+
+def test_menu_shows_launch_of_unknown_rocket(stub_server, monkeypatch, capsys):
+    changes = [dict(launch("e", 5, "2021-05-01T00:00:00.000Z"), rocket="unknown-rocket")]
+    server = make_server(stub_server, [], changes)
+    info_manager = InfoManager(fetcher=AsyncFetcher(base_url=server.url))
+    info_manager.fetch_static(concurrent=True)
+    info_manager.sync_launches()
+    info_manager.enricher.offline = True
+    main = MainManager(info_manager, TextUIManager())
+    # Browse launches -> All -> the synced launch
+    answers = iter(["0", "3"])
+    monkeypatch.setattr("builtins.input", lambda: next(answers))
+    main.show_launches_menu()
+    out = capsys.readouterr().out
+    assert "Launch information" in out and "Flight number: 5" in out
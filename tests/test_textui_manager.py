@@ -0,0 +1,94 @@
+import io
+import itertools
+
+import pytest
+
+from spacexexplorer.screen import CLEAR_SCREEN
+from spacexexplorer.textui_manager import SequenceView, TextUIManager
+
+
+def answer(monkeypatch, *answers):
+    answers = iter(answers)
+    monkeypatch.setattr("builtins.input", lambda: next(answers))
+
+
+def test_short_list_unchanged(monkeypatch, capsys):
+    answer(monkeypatch, "1")
+    assert TextUIManager().ask_user_choice("Choose:", ["a", "b", "c"]) == 1
+    assert capsys.readouterr().out == "Choose:\n0: a\n1: b\n2: c\n"
+
+
+def test_only_visible_page_is_formatted(monkeypatch, capsys):
+    formatted = []
+
+    def label(n):
+        formatted.append(n)
+        return f"launch {n}"
+    ui = TextUIManager()
+    answer(monkeypatch, "n", "g 1000", "p", "1000")
+    choice = ui.ask_user_choice("Choose:", SequenceView(range(100000), label))
+    assert choice == 1000
+    assert len(formatted) == 4 * ui.page_size
+    out = capsys.readouterr().out
+    assert "0: launch 0" in out
+    assert "99999" not in out
+    assert max(len(line) for line in out.splitlines()) < 200
+
+
+def test_iterator_is_consumed_lazily(monkeypatch):
+    consumed = []
+
+    def generate():
+        for n in itertools.count():
+            consumed.append(n)
+            yield n
+    ui = TextUIManager()
+    answer(monkeypatch, "n", f"{ui.page_size + 3}")
+    assert ui.ask_user_choice("Choose:", generate()) == ui.page_size + 3
+    assert len(consumed) <= 3 * ui.page_size + 1
+
+
+def test_navigation_limits(monkeypatch):
+    ui = TextUIManager()
+    answer(monkeypatch, "p", "g 99", "n")
+    assert ui.ask_user_choice("Choose:", list(range(10))) is None
+    assert ui.ask_user_choice("Choose:", list(range(10))) is None
+    assert ui.ask_user_choice("Choose:", list(range(10))) is None
+
+
+class Terminal(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def isatty(self):
+        return True
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_screens_are_written_at_once(monkeypatch):
+    ui = TextUIManager()
+    ui.stream = Terminal()
+    monkeypatch.setattr("os.system", lambda command: pytest.fail("no subprocess"))
+    ui.show_single_launch_info({"name": "Demo", "details": "two\nlines"}, rocket_name="F9")
+    assert ui.stream.writes == 1
+    assert "Rocket: F9\n" in ui.stream.getvalue()
+    ui.clear()
+    assert ui.stream.getvalue().endswith(CLEAR_SCREEN)
+
+
+def test_pages_are_redrawn_in_place(monkeypatch):
+    ui = TextUIManager()
+    ui.page_size = 3
+    ui.stream = Terminal()
+    answer(monkeypatch, "n", "4")
+    assert ui.ask_user_choice("Choose:", list(range(5))) == 4
+    first, second = ui.stream.getvalue().split("\x1b[", 1)
+    assert first.startswith("Choose:\n0: 0\n1: 1\n2: 2\nPage 1")
+    # the prompt is kept, the choices and page line are rewritten
+    assert "Choose:" not in second
+    assert "3: 3\n" in second and "4: 4\n" in second
+    assert ui.stream.writes == 2